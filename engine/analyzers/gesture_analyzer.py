@@ -9,15 +9,24 @@ Analyzes hand gestures and movements including:
 """
 
 import math
-import time
+import numpy as np
 from dataclasses import dataclass
-from typing import Optional, List, Tuple
+from typing import Optional, List, Tuple, Union
 from collections import deque
 
+from .landmarks import as_array
+
+
+# Hand landmarks as a list of Landmark objects or an (N, 4) array of x, y, z, visibility rows
+HandLandmarks = Optional[Union[List["Landmark"], np.ndarray]]
+
 
 @dataclass
 class Landmark:
     """Single landmark point with normalized coordinates."""
+    # Explicit __slots__ (dataclass(slots=True) needs Python 3.10+): no per-instance dict
+    __slots__ = ('x', 'y', 'z', 'visibility')
+    
     x: float  # Normalized 0.0-1.0
     y: float  # Normalized 0.0-1.0
     z: float  # Depth (relative scale)
@@ -98,8 +107,9 @@ class GestureAnalyzer:
         self.gesture_height_threshold = gesture_height_threshold
         self.gesture_velocity_threshold = gesture_velocity_threshold
         
-        # Session tracking
-        self.session_start_time = time.time()
+        # Session tracking (in the clock of the timestamps passed to analyze())
+        self.session_start_time: Optional[float] = None
+        self.last_timestamp: Optional[float] = None
         self.total_face_touches = 0
         self.total_gestures = 0
         
@@ -128,10 +138,27 @@ class GestureAnalyzer:
             (point1.y - point2.y) ** 2
         )
     
+    def _hand_point(self, hand: Optional[np.ndarray], index: int) -> Optional[Tuple[float, float]]:
+        """
+        Get (x, y) of a hand landmark if the hand has it and it is visible.
+        
+        Args:
+            hand: (N, 4) hand array, or None if not detected
+            index: Hand landmark index
+            
+        Returns:
+            (x, y) tuple, or None if missing or visibility <= 0.5
+        """
+        if hand is None or len(hand) <= index:
+            return None
+        x, y, _, visibility = hand[index].tolist()
+        return (x, y) if visibility > 0.5 else None
+    
     def _detect_face_touch(self, 
-                          left_hand_landmarks: Optional[List[Landmark]], 
-                          right_hand_landmarks: Optional[List[Landmark]],
-                          nose_landmark: Optional[Landmark]) -> bool:
+                          left_hand: Optional[np.ndarray], 
+                          right_hand: Optional[np.ndarray],
+                          nose_landmark: Optional[Landmark],
+                          timestamp: float) -> bool:
         """
         Detect if either hand is touching or near the face.
         
@@ -139,9 +166,10 @@ class GestureAnalyzer:
         commonly used for face-touching gestures.
         
         Args:
-            left_hand_landmarks: Left hand landmarks (21 points)
-            right_hand_landmarks: Right hand landmarks (21 points)
+            left_hand: Left hand array (21 rows of x, y, z, visibility)
+            right_hand: Right hand array (21 rows of x, y, z, visibility)
             nose_landmark: Nose landmark for face reference
+            timestamp: Current timestamp in seconds
             
         Returns:
             True if face-touch detected, False otherwise
@@ -151,27 +179,15 @@ class GestureAnalyzer:
         
         face_touch_detected = False
         
-        # Check left hand
-        if (left_hand_landmarks and 
-            len(left_hand_landmarks) > self.INDEX_TIP and
-            left_hand_landmarks[self.INDEX_TIP].visibility > 0.5):
-            
-            distance = self._calculate_distance(
-                left_hand_landmarks[self.INDEX_TIP], 
-                nose_landmark
-            )
-            
-            if distance < self.face_touch_threshold:
-                face_touch_detected = True
-        
-        # Check right hand
-        if (right_hand_landmarks and 
-            len(right_hand_landmarks) > self.INDEX_TIP and
-            right_hand_landmarks[self.INDEX_TIP].visibility > 0.5):
+        # Check both hands' index finger tips against the nose
+        for hand in (left_hand, right_hand):
+            tip = self._hand_point(hand, self.INDEX_TIP)
+            if tip is None:
+                continue
             
-            distance = self._calculate_distance(
-                right_hand_landmarks[self.INDEX_TIP], 
-                nose_landmark
+            distance = math.sqrt(
+                (tip[0] - nose_landmark.x) ** 2 + 
+                (tip[1] - nose_landmark.y) ** 2
             )
             
             if distance < self.face_touch_threshold:
@@ -179,16 +195,16 @@ class GestureAnalyzer:
         
         # Update counters if face-touch detected
         if face_touch_detected:
-            current_time = time.time()
-            self.face_touch_timestamps.append(current_time)
+            self.face_touch_timestamps.append(timestamp)
             self.total_face_touches += 1
         
         return face_touch_detected
     
     def _count_active_gestures(self, 
-                              left_hand_landmarks: Optional[List[Landmark]], 
-                              right_hand_landmarks: Optional[List[Landmark]],
-                              shoulder_y: float) -> Tuple[int, bool, bool]:
+                              left_hand: Optional[np.ndarray], 
+                              right_hand: Optional[np.ndarray],
+                              shoulder_y: float,
+                              timestamp: float) -> Tuple[int, bool, bool]:
         """
         Count expressive hand movements and elevated gestures.
         
@@ -196,84 +212,53 @@ class GestureAnalyzer:
         with sufficient velocity to indicate expressive communication.
         
         Args:
-            left_hand_landmarks: Left hand landmarks
-            right_hand_landmarks: Right hand landmarks
+            left_hand: Left hand array (21 rows of x, y, z, visibility)
+            right_hand: Right hand array (21 rows of x, y, z, visibility)
             shoulder_y: Average Y-coordinate of shoulders for reference
+            timestamp: Current timestamp in seconds
             
         Returns:
             Tuple of (active_gesture_count, left_above_shoulders, right_above_shoulders)
         """
-        current_time = time.time()
         active_gestures = 0
-        left_above_shoulders = False
-        right_above_shoulders = False
+        above_shoulders = [False, False]
         
-        # Analyze left hand
-        if (left_hand_landmarks and 
-            len(left_hand_landmarks) > self.WRIST and
-            left_hand_landmarks[self.WRIST].visibility > 0.5):
-            
-            wrist = left_hand_landmarks[self.WRIST]
+        for side, (hand, history) in enumerate((
+            (left_hand, self.left_hand_history),
+            (right_hand, self.right_hand_history)
+        )):
+            wrist = self._hand_point(hand, self.WRIST)
             
             # Check if hand is elevated above shoulders
-            if wrist.y < (shoulder_y - self.gesture_height_threshold):
-                left_above_shoulders = True
-                
-                # Track movement velocity
-                self.left_hand_history.append((wrist.x, wrist.y, current_time))
-                
-                # Calculate velocity if we have enough history
-                if len(self.left_hand_history) >= 3:
-                    recent_positions = list(self.left_hand_history)[-3:]
-                    
-                    # Calculate movement over last 3 frames
-                    total_movement = 0
-                    for i in range(1, len(recent_positions)):
-                        prev_x, prev_y, _ = recent_positions[i-1]
-                        curr_x, curr_y, _ = recent_positions[i]
-                        movement = math.sqrt((curr_x - prev_x)**2 + (curr_y - prev_y)**2)
-                        total_movement += movement
-                    
-                    # If significant movement detected, count as active gesture
-                    if total_movement > self.gesture_velocity_threshold:
-                        active_gestures += 1
-                        self.gesture_timestamps.append(current_time)
-        
-        # Analyze right hand (same logic)
-        if (right_hand_landmarks and 
-            len(right_hand_landmarks) > self.WRIST and
-            right_hand_landmarks[self.WRIST].visibility > 0.5):
+            if wrist is None or wrist[1] >= (shoulder_y - self.gesture_height_threshold):
+                continue
+            above_shoulders[side] = True
             
-            wrist = right_hand_landmarks[self.WRIST]
+            # Track movement velocity
+            history.append((wrist[0], wrist[1], timestamp))
             
-            # Check if hand is elevated above shoulders
-            if wrist.y < (shoulder_y - self.gesture_height_threshold):
-                right_above_shoulders = True
-                
-                # Track movement velocity
-                self.right_hand_history.append((wrist.x, wrist.y, current_time))
+            # Calculate velocity if we have enough history
+            if len(history) >= 3:
+                # Calculate movement over last 3 frames
+                (x0, y0, _), (x1, y1, _), (x2, y2, _) = (history[-3], history[-2], history[-1])
+                total_movement = (math.sqrt((x1 - x0)**2 + (y1 - y0)**2) +
+                                  math.sqrt((x2 - x1)**2 + (y2 - y1)**2))
                 
-                # Calculate velocity if we have enough history
-                if len(self.right_hand_history) >= 3:
-                    recent_positions = list(self.right_hand_history)[-3:]
-                    
-                    # Calculate movement over last 3 frames
-                    total_movement = 0
-                    for i in range(1, len(recent_positions)):
-                        prev_x, prev_y, _ = recent_positions[i-1]
-                        curr_x, curr_y, _ = recent_positions[i]
-                        movement = math.sqrt((curr_x - prev_x)**2 + (curr_y - prev_y)**2)
-                        total_movement += movement
-                    
-                    # If significant movement detected, count as active gesture
-                    if total_movement > self.gesture_velocity_threshold:
-                        active_gestures += 1
-                        self.gesture_timestamps.append(current_time)
+                # If significant movement detected, count as active gesture
+                if total_movement > self.gesture_velocity_threshold:
+                    active_gestures += 1
+                    self.gesture_timestamps.append(timestamp)
         
         # Update total gesture count
         self.total_gestures += active_gestures
         
-        return active_gestures, left_above_shoulders, right_above_shoulders
+        return active_gestures, above_shoulders[0], above_shoulders[1]
+    
+    def _session_duration_minutes(self) -> float:
+        """Time between the first and latest analyzed frames, in minutes."""
+        if self.session_start_time is None:
+            return 0.0
+        return (self.last_timestamp - self.session_start_time) / 60.0
     
     def _calculate_gesture_frequency(self) -> float:
         """
@@ -282,8 +267,7 @@ class GestureAnalyzer:
         Returns:
             Gestures per minute (float)
         """
-        current_time = time.time()
-        session_duration_minutes = (current_time - self.session_start_time) / 60.0
+        session_duration_minutes = self._session_duration_minutes()
         
         if session_duration_minutes < 0.1:  # Less than 6 seconds
             return 0.0
@@ -308,8 +292,8 @@ class GestureAnalyzer:
             return "dynamic"
     
     def analyze(self, 
-                left_hand_landmarks: Optional[List[Landmark]],
-                right_hand_landmarks: Optional[List[Landmark]],
+                left_hand_landmarks: HandLandmarks,
+                right_hand_landmarks: HandLandmarks,
                 nose_landmark: Optional[Landmark],
                 shoulder_y: float,
                 timestamp: float) -> GestureMetrics:
@@ -317,37 +301,43 @@ class GestureAnalyzer:
         Perform complete gesture analysis on hand and face landmarks.
         
         Args:
-            left_hand_landmarks: Left hand landmarks (21 points)
-            right_hand_landmarks: Right hand landmarks (21 points)
+            left_hand_landmarks: Left hand landmarks (21 points) or a (21, 4) array
+            right_hand_landmarks: Right hand landmarks (21 points) or a (21, 4) array
             nose_landmark: Nose landmark for face-touch detection
             shoulder_y: Average Y-coordinate of shoulders
-            timestamp: Current timestamp in seconds
+            timestamp: Current timestamp in seconds; all session timing
+                (frequency, durations) is measured in this clock
             
         Returns:
             GestureMetrics with all gesture indicators
         """
-        # Check hand visibility
-        left_hand_visible = (left_hand_landmarks is not None and 
-                           len(left_hand_landmarks) > 0 and
-                           left_hand_landmarks[0].visibility > 0.5)
+        if self.session_start_time is None:
+            self.session_start_time = timestamp
+        self.last_timestamp = timestamp
         
-        right_hand_visible = (right_hand_landmarks is not None and 
-                            len(right_hand_landmarks) > 0 and
-                            right_hand_landmarks[0].visibility > 0.5)
+        # Convert each hand once so the checks below index rows, not attributes
+        left_hand = as_array(left_hand_landmarks)
+        right_hand = as_array(right_hand_landmarks)
+        
+        # Check hand visibility
+        left_hand_visible = self._hand_point(left_hand, 0) is not None
+        right_hand_visible = self._hand_point(right_hand, 0) is not None
         
         # Detect face-touching
         face_touch_detected = self._detect_face_touch(
-            left_hand_landmarks, 
-            right_hand_landmarks, 
-            nose_landmark
+            left_hand, 
+            right_hand, 
+            nose_landmark,
+            timestamp
         )
         
         # Count active gestures
         active_gesture_count, left_above_shoulders, right_above_shoulders = \
             self._count_active_gestures(
-                left_hand_landmarks, 
-                right_hand_landmarks, 
-                shoulder_y
+                left_hand, 
+                right_hand, 
+                shoulder_y,
+                timestamp
             )
         
         # Calculate frequency and classify activity
@@ -367,6 +357,130 @@ class GestureAnalyzer:
             timestamp=timestamp
         )
     
+    def _batch_points(self, hands: Optional[np.ndarray], index: int,
+                      n_frames: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Per-frame (x, y) of one hand landmark plus its visibility mask.
+        
+        Args:
+            hands: (T, N, 4) hand arrays, or None if not detected
+            index: Hand landmark index
+            n_frames: Number of frames T
+            
+        Returns:
+            Tuple of ((T, 2) coordinates, (T,) bool mask of visibility > 0.5)
+        """
+        if hands is None or hands.shape[1] <= index:
+            return np.zeros((n_frames, 2)), np.zeros(n_frames, dtype=bool)
+        return hands[:, index, :2], hands[:, index, 3] > 0.5
+    
+    def _batch_gestures(self, hands: Optional[np.ndarray], history: deque,
+                        shoulder_ys: np.ndarray, timestamps: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Vectorized _count_active_gestures() for one hand over T frames.
+        
+        Appends every elevated wrist position to history, exactly as T
+        sequential calls would.
+        
+        Returns:
+            Tuple of ((T,) bool gesture mask, (T,) bool above-shoulders mask)
+        """
+        n_frames = len(timestamps)
+        wrist, visible = self._batch_points(hands, self.WRIST, n_frames)
+        elevated = visible & (wrist[:, 1] < shoulder_ys - self.gesture_height_threshold)
+        gestures = np.zeros(n_frames, dtype=bool)
+        
+        new_points = wrist[elevated]
+        if len(new_points) and (history.maxlen is None or history.maxlen >= 3):
+            # Movement over the last 3 positions, with up to 2 positions
+            # carried over from history: step lengths k-2 -> k-1 -> k
+            tail = np.array([(x, y) for x, y, _ in list(history)[-2:]]).reshape(-1, 2)
+            points = np.concatenate([tail, new_points])
+            deltas = np.diff(points, axis=0)
+            steps = np.sqrt(deltas[:, 0] ** 2 + deltas[:, 1] ** 2)
+            
+            k = np.arange(len(tail), len(points))
+            has_history = k >= 2
+            k = k[has_history]
+            total_movement = steps[k - 2] + steps[k - 1]
+            gestures[np.flatnonzero(elevated)[has_history]] = total_movement > self.gesture_velocity_threshold
+        
+        history.extend(zip(*new_points.T.tolist(), timestamps[elevated].tolist()))
+        return gestures, elevated
+    
+    def analyze_batch(self,
+                      left_hands: Optional[np.ndarray],
+                      right_hands: Optional[np.ndarray],
+                      nose_points: Optional[np.ndarray],
+                      shoulder_ys: np.ndarray,
+                      timestamps: np.ndarray) -> GestureMetrics:
+        """
+        Analyze T consecutive frames in one vectorized pass.
+        
+        Equivalent to calling analyze() on each frame in order and keeping
+        the last result: counters, histories and session timing end up the
+        same. A hand missing in some frames can be given zero visibility there.
+        
+        Args:
+            left_hands: (T, 21, 4) left hand arrays, or None if never detected
+            right_hands: (T, 21, 4) right hand arrays, or None if never detected
+            nose_points: (T, 2+) nose x, y rows, or None if not detected
+            shoulder_ys: (T,) average shoulder Y-coordinate per frame
+            timestamps: (T,) timestamps in seconds
+            
+        Returns:
+            GestureMetrics for the last frame
+        """
+        timestamps = np.asarray(timestamps, dtype=np.float64)
+        shoulder_ys = np.asarray(shoulder_ys, dtype=np.float64)
+        n_frames = len(timestamps)
+        if n_frames == 0:
+            raise ValueError("analyze_batch needs at least one frame")
+        
+        if self.session_start_time is None:
+            self.session_start_time = float(timestamps[0])
+        self.last_timestamp = float(timestamps[-1])
+        
+        # Face-touching: either visible index fingertip near the nose
+        face_touches = np.zeros(n_frames, dtype=bool)
+        if nose_points is not None:
+            nose_xy = np.asarray(nose_points, dtype=np.float64)[:, :2]
+            for hands in (left_hands, right_hands):
+                tip, visible = self._batch_points(hands, self.INDEX_TIP, n_frames)
+                delta = tip - nose_xy
+                distance = np.sqrt(delta[:, 0] ** 2 + delta[:, 1] ** 2)
+                face_touches |= visible & (distance < self.face_touch_threshold)
+        self.total_face_touches += int(face_touches.sum())
+        self.face_touch_timestamps.extend(timestamps[face_touches].tolist())
+        
+        # Active gestures per hand
+        left_gestures, left_above = self._batch_gestures(
+            left_hands, self.left_hand_history, shoulder_ys, timestamps
+        )
+        right_gestures, right_above = self._batch_gestures(
+            right_hands, self.right_hand_history, shoulder_ys, timestamps
+        )
+        active = left_gestures.astype(int) + right_gestures
+        self.total_gestures += int(active.sum())
+        self.gesture_timestamps.extend(np.repeat(timestamps, active).tolist())
+        
+        # Calculate frequency and classify activity
+        gesture_frequency = self._calculate_gesture_frequency()
+        hand_activity_level = self._classify_activity_level(gesture_frequency)
+        
+        return GestureMetrics(
+            left_hand_visible=bool(self._batch_points(left_hands, 0, n_frames)[1][-1]),
+            right_hand_visible=bool(self._batch_points(right_hands, 0, n_frames)[1][-1]),
+            face_touch_detected=bool(face_touches[-1]),
+            face_touch_count=self.total_face_touches,
+            active_gesture_count=int(active[-1]),
+            gesture_frequency=gesture_frequency,
+            hand_activity_level=hand_activity_level,
+            left_hand_above_shoulders=bool(left_above[-1]),
+            right_hand_above_shoulders=bool(right_above[-1]),
+            timestamp=float(timestamps[-1])
+        )
+    
     def get_session_summary(self) -> GestureSummary:
         """
         Get aggregate gesture statistics for the entire session.
@@ -374,8 +488,7 @@ class GestureAnalyzer:
         Returns:
             GestureSummary with session-wide statistics
         """
-        current_time = time.time()
-        session_duration_minutes = (current_time - self.session_start_time) / 60.0
+        session_duration_minutes = self._session_duration_minutes()
         
         # Calculate averages
         avg_gestures_per_minute = (self.total_gestures / session_duration_minutes 
@@ -402,7 +515,8 @@ class GestureAnalyzer:
     
     def reset(self):
         """Reset analyzer state for new session."""
-        self.session_start_time = time.time()
+        self.session_start_time = None
+        self.last_timestamp = None
         self.total_face_touches = 0
         self.total_gestures = 0
         self.left_hand_history.clear()
@@ -11,9 +11,28 @@ Requirements: 5.1, 5.2, 5.3, 5.4
 
 import time
 import math
-from dataclasses import dataclass
-from typing import Optional, List, Tuple, Dict
-from collections import deque
+from dataclasses import dataclass, replace
+from typing import Callable, Optional, List, Tuple, Dict
+
+import numpy as np
+
+
+# Face mesh rows for gaze estimation, in [left inner, left outer, right inner, right outer]
+# order for x (eye corners) and [left top, left bottom, right top, right bottom] for y
+GAZE_X_INDICES = np.array([133, 33, 362, 263], dtype=np.intp)
+GAZE_Y_INDICES = np.array([159, 145, 386, 374], dtype=np.intp)
+
+# (row, column) pairs for all eight gaze values, so one gather reads them all
+GAZE_ROWS = np.concatenate([GAZE_X_INDICES, GAZE_Y_INDICES])
+GAZE_COLS = np.repeat(np.array([0, 1], dtype=np.intp), 4)
+FACE_MESH_SIZE = 468
+
+# Gaze history length: last 10 seconds at 30fps
+GAZE_HISTORY_SIZE = 300
+
+# Fixed session report recommendations (the count-based ones are formatted per report)
+MANUAL_REVIEW_RECOMMENDATION = "Consider manual review of interview recording for potential integrity issues"
+NO_CONCERNS_RECOMMENDATION = "No significant integrity concerns detected"
 
 
 @dataclass
@@ -35,6 +54,11 @@ class IntegrityMetrics:
     suspicious_segments: List[Dict]  # List of suspicious time segments
     processing_time_ms: float
     timestamp: float
+    
+    def __str__(self) -> str:
+        """One-line summary for logs; repr() keeps the full dataclass fields."""
+        return (f"Gaze ({self.gaze_x:.2f}, {self.gaze_y:.2f}) - Flags: {self.cheat_flag_count}, "
+                f"Score: {self.integrity_score:.2f}, Warning: {self.integrity_warning}")
 
 
 @dataclass
@@ -61,7 +85,8 @@ class IntegrityChecker:
     def __init__(self,
                  gaze_cluster_threshold: float = 0.05,
                  cheat_flag_threshold: int = 5,
-                 min_cluster_frequency: int = 3):
+                 min_cluster_frequency: int = 3,
+                 clock: Callable[[], float] = time.time):
         """
         Initialize integrity checker with configurable thresholds.
         
@@ -69,19 +94,26 @@ class IntegrityChecker:
             gaze_cluster_threshold: Distance threshold for clustering gaze positions
             cheat_flag_threshold: Number of flags before raising integrity warning
             min_cluster_frequency: Minimum visits to cluster to be suspicious
+            clock: Returns the current time in seconds; tests pass a fake clock
         """
         # Thresholds
         self.gaze_cluster_threshold = gaze_cluster_threshold
         self.cheat_flag_threshold = cheat_flag_threshold
         self.min_cluster_frequency = min_cluster_frequency
+        self._clock = clock
         
         # Gaze tracking
-        self.gaze_history = deque(maxlen=300)  # Last 10 seconds at 30fps
+        # Ring buffer of (x, y, timestamp, speech_onset) rows; _gaze_head is the next row to write
+        self._gaze_ring = np.zeros((GAZE_HISTORY_SIZE, 4))
+        self._gaze_head = 0
+        self._gaze_count = 0
         self.speech_onset_gazes = []  # Gaze positions at speech onset
         
         # Cluster tracking
         self.gaze_clusters = []  # List of detected clusters with their centers
+        self._cluster_centers = np.empty((0, 2))  # Same centers as rows, for vectorized distances
         self.cluster_frequencies = {}  # How many times each cluster was visited
+        self.max_cluster_frequency = 0  # Largest value in cluster_frequencies
         
         # Integrity tracking
         self.cheat_flag_count = 0
@@ -89,53 +121,85 @@ class IntegrityChecker:
         self.total_speech_onsets = 0
         
         # Session tracking
-        self.session_start_time = time.time()
+        self.session_start_time = self._clock()
         self.frame_count = 0
+        
+        # Last session report; rebuilt only after analysis changes state
+        self._report_cache = None
+        self._dirty = True
     
     def reset(self):
         """Reset analyzer state for new session"""
-        self.gaze_history.clear()
+        self._gaze_head = 0
+        self._gaze_count = 0
         self.speech_onset_gazes.clear()
         self.gaze_clusters.clear()
+        self._cluster_centers = np.empty((0, 2))
         self.cluster_frequencies.clear()
+        self.max_cluster_frequency = 0
         self.cheat_flag_count = 0
         self.suspicious_segments.clear()
         self.total_speech_onsets = 0
-        self.session_start_time = time.time()
+        self.session_start_time = self._clock()
         self.frame_count = 0
+        self._dirty = True
+    
+    def recent_gazes(self) -> np.ndarray:
+        """
+        Recent gaze history, oldest first.
+        
+        Returns:
+            (n, 4) array of gaze_x, gaze_y, timestamp, speech_onset (0/1) rows,
+            n <= GAZE_HISTORY_SIZE
+        """
+        start = (self._gaze_head - self._gaze_count) % GAZE_HISTORY_SIZE
+        return np.roll(self._gaze_ring, -start, axis=0)[:self._gaze_count]
+    
+    @property
+    def gaze_history(self) -> List[Dict]:
+        """Recent gaze history as dicts, oldest first (see recent_gazes)."""
+        return [
+            {'position': (x, y), 'timestamp': t, 'speech_onset': bool(onset)}
+            for x, y, t, onset in self.recent_gazes().tolist()
+        ]
     
     def _calculate_gaze_position(self, face_landmarks) -> Tuple[float, float]:
         """
         Calculate gaze position using eye landmark centroids.
         
         Args:
-            face_landmarks: MediaPipe face landmarks (468 points)
+            face_landmarks: MediaPipe face landmarks (468 points), or an
+                            (N, >=2) array of x, y coordinates
             
         Returns:
             Tuple of (gaze_x, gaze_y) normalized coordinates
         """
-        if not face_landmarks or len(face_landmarks) < 468:
+        if face_landmarks is None or len(face_landmarks) < FACE_MESH_SIZE:
             return (0.5, 0.5)  # Default center gaze
         
-        # Left eye landmarks for gaze estimation
-        left_eye_inner = face_landmarks[133]  # Inner corner
-        left_eye_outer = face_landmarks[33]   # Outer corner
-        left_eye_top = face_landmarks[159]    # Top
-        left_eye_bottom = face_landmarks[145] # Bottom
-        
-        # Right eye landmarks for gaze estimation
-        right_eye_inner = face_landmarks[362]  # Inner corner
-        right_eye_outer = face_landmarks[263]  # Outer corner
-        right_eye_top = face_landmarks[386]    # Top
-        right_eye_bottom = face_landmarks[374] # Bottom
+        if isinstance(face_landmarks, np.ndarray):
+            # One gather for all eight values instead of eight landmark lookups
+            (left_inner_x, left_outer_x, right_inner_x, right_outer_x,
+             left_top_y, left_bottom_y, right_top_y, right_bottom_y) = \
+                face_landmarks[GAZE_ROWS, GAZE_COLS].tolist()
+        else:
+            # Landmark objects: eye corners for x, top/bottom lids for y
+            left_inner_x = face_landmarks[133].x
+            left_outer_x = face_landmarks[33].x
+            right_inner_x = face_landmarks[362].x
+            right_outer_x = face_landmarks[263].x
+            left_top_y = face_landmarks[159].y
+            left_bottom_y = face_landmarks[145].y
+            right_top_y = face_landmarks[386].y
+            right_bottom_y = face_landmarks[374].y
         
         # Calculate left eye centroid
-        left_eye_x = (left_eye_inner.x + left_eye_outer.x) / 2.0
-        left_eye_y = (left_eye_top.y + left_eye_bottom.y) / 2.0
+        left_eye_x = (left_inner_x + left_outer_x) / 2.0
+        left_eye_y = (left_top_y + left_bottom_y) / 2.0
         
         # Calculate right eye centroid
-        right_eye_x = (right_eye_inner.x + right_eye_outer.x) / 2.0
-        right_eye_y = (right_eye_top.y + right_eye_bottom.y) / 2.0
+        right_eye_x = (right_inner_x + right_outer_x) / 2.0
+        right_eye_y = (right_top_y + right_bottom_y) / 2.0
         
         # Average both eyes for gaze position
         gaze_x = (left_eye_x + right_eye_x) / 2.0
@@ -143,52 +207,77 @@ class IntegrityChecker:
         
         return (float(gaze_x), float(gaze_y))
     
-    def _find_or_create_cluster(self, gaze_x: float, gaze_y: float) -> int:
+    def _batch_gaze_positions(self, landmarks: np.ndarray) -> np.ndarray:
+        """
+        Calculate gaze positions for a stack of frames.
+        
+        Args:
+            landmarks: (F, N, >=2) array of face landmark x, y coordinates
+            
+        Returns:
+            (F, 2) array of gaze_x, gaze_y per frame
+        """
+        gaze = np.full((len(landmarks), 2), 0.5)
+        if landmarks.ndim != 3 or landmarks.shape[1] < FACE_MESH_SIZE:
+            return gaze  # Default center gaze
+        
+        # Same centroid arithmetic as _calculate_gaze_position, one column per eye point
+        points = landmarks[:, GAZE_ROWS, GAZE_COLS]
+        x, y = points[:, :4], points[:, 4:]
+        gaze[:, 0] = ((x[:, 0] + x[:, 1]) / 2.0 + (x[:, 2] + x[:, 3]) / 2.0) / 2.0
+        gaze[:, 1] = ((y[:, 0] + y[:, 1]) / 2.0 + (y[:, 2] + y[:, 3]) / 2.0) / 2.0
+        return gaze
+    
+    def _find_or_create_cluster(self, gaze_x: float, gaze_y: float,
+                                timestamp: Optional[float] = None) -> int:
         """
         Find existing cluster or create new one for gaze position.
         
         Args:
             gaze_x: X coordinate of gaze
             gaze_y: Y coordinate of gaze
+            timestamp: Visit time in seconds (defaults to now)
             
         Returns:
             Cluster ID
         """
-        # Check if gaze belongs to existing cluster
-        for i, cluster in enumerate(self.gaze_clusters):
+        now = self._clock() if timestamp is None else timestamp
+        
+        # Check if gaze belongs to existing cluster: the first one within
+        # threshold wins, as clusters are matched in creation order
+        within = np.flatnonzero(self._cluster_distances(gaze_x, gaze_y) < self.gaze_cluster_threshold)
+        if within.size:
+            i = int(within[0])
+            cluster = self.gaze_clusters[i]
             cluster_x, cluster_y = cluster['center']
             
-            # Calculate distance to cluster center
-            distance = math.sqrt(
-                (gaze_x - cluster_x)**2 + 
-                (gaze_y - cluster_y)**2
-            )
+            # Update cluster center (moving average)
+            visits = cluster['visits']
+            new_x = (cluster_x * visits + gaze_x) / (visits + 1)
+            new_y = (cluster_y * visits + gaze_y) / (visits + 1)
             
-            if distance < self.gaze_cluster_threshold:
-                # Update cluster center (moving average)
-                visits = cluster['visits']
-                new_x = (cluster_x * visits + gaze_x) / (visits + 1)
-                new_y = (cluster_y * visits + gaze_y) / (visits + 1)
-                
-                cluster['center'] = (new_x, new_y)
-                cluster['visits'] += 1
-                cluster['last_visit'] = time.time()
-                
-                return i
+            cluster['center'] = (new_x, new_y)
+            cluster['visits'] += 1
+            cluster['last_visit'] = now
+            self._cluster_centers[i] = (new_x, new_y)
+            
+            return i
         
         # Create new cluster
         cluster_id = len(self.gaze_clusters)
         self.gaze_clusters.append({
             'center': (gaze_x, gaze_y),
             'visits': 1,
-            'first_visit': time.time(),
-            'last_visit': time.time()
+            'first_visit': now,
+            'last_visit': now
         })
+        self._cluster_centers = np.vstack([self._cluster_centers, (gaze_x, gaze_y)])
         
         return cluster_id
     
     def _detect_repeated_pattern(self, gaze_x: float, gaze_y: float, 
-                                 speech_onset: bool) -> bool:
+                                 speech_onset: bool,
+                                 timestamp: Optional[float] = None) -> bool:
         """
         Detect if user repeatedly looks at same location at speech onset.
         
@@ -196,6 +285,7 @@ class IntegrityChecker:
             gaze_x: Current gaze X coordinate
             gaze_y: Current gaze Y coordinate
             speech_onset: Whether user just started speaking
+            timestamp: Frame time in seconds (defaults to now)
             
         Returns:
             True if suspicious pattern detected
@@ -204,16 +294,17 @@ class IntegrityChecker:
         if not speech_onset:
             return False
         
+        now = self._clock() if timestamp is None else timestamp
         self.total_speech_onsets += 1
         
         # Record gaze position at speech onset
         self.speech_onset_gazes.append({
             'position': (gaze_x, gaze_y),
-            'timestamp': time.time()
+            'timestamp': now
         })
         
         # Find or create cluster for this gaze
-        cluster_id = self._find_or_create_cluster(gaze_x, gaze_y)
+        cluster_id = self._find_or_create_cluster(gaze_x, gaze_y, now)
         
         # Track cluster frequency
         if cluster_id not in self.cluster_frequencies:
@@ -222,6 +313,8 @@ class IntegrityChecker:
         
         # Check if this cluster is visited suspiciously often
         cluster_frequency = self.cluster_frequencies[cluster_id]
+        if cluster_frequency > self.max_cluster_frequency:
+            self.max_cluster_frequency = cluster_frequency
         
         if cluster_frequency >= self.min_cluster_frequency:
             # Check if this is a new cheat flag
@@ -240,7 +333,7 @@ class IntegrityChecker:
                 
                 # Record suspicious segment
                 self.suspicious_segments.append({
-                    'timestamp': time.time(),
+                    'timestamp': now,
                     'cluster_id': cluster_id,
                     'cluster_center': cluster['center'],
                     'frequency': cluster_frequency,
@@ -254,6 +347,33 @@ class IntegrityChecker:
         
         return False
     
+    def _cluster_distances(self, gaze_x: float, gaze_y: float) -> np.ndarray:
+        """Euclidean distance from a gaze point to every cluster center."""
+        centers = self._cluster_centers
+        return np.sqrt((gaze_x - centers[:, 0])**2 + (gaze_y - centers[:, 1])**2)
+    
+    def _nearest_cluster(self, gaze_x: float, gaze_y: float) -> Optional[int]:
+        """
+        Find the closest cluster within the clustering threshold.
+        
+        Args:
+            gaze_x: Gaze X coordinate
+            gaze_y: Gaze Y coordinate
+            
+        Returns:
+            Cluster ID, or None if no cluster is close enough
+        """
+        if len(self.gaze_clusters) == 0:
+            return None
+        
+        distances = self._cluster_distances(gaze_x, gaze_y)
+        
+        # argmin keeps the first of equally close clusters
+        closest = int(distances.argmin())
+        if distances[closest] < self.gaze_cluster_threshold:
+            return closest
+        return None
+    
     def _calculate_integrity_score(self) -> float:
         """
         Calculate overall integrity score based on detected patterns.
@@ -275,7 +395,8 @@ class IntegrityChecker:
         # Penalize for high cluster concentration
         # If most speech onsets go to few clusters, it's suspicious
         if len(self.cluster_frequencies) > 0:
-            max_cluster_frequency = max(self.cluster_frequencies.values())
+            # Frequencies only grow, so the running max is always current
+            max_cluster_frequency = self.max_cluster_frequency
             concentration_ratio = max_cluster_frequency / self.total_speech_onsets
             
             if concentration_ratio > 0.5:  # More than 50% to one cluster
@@ -287,13 +408,17 @@ class IntegrityChecker:
         
         return float(score)
     
-    def analyze(self, face_landmarks, speech_onset: bool = False) -> IntegrityMetrics:
+    def analyze(self, face_landmarks, speech_onset: bool = False,
+                timestamp: Optional[float] = None) -> IntegrityMetrics:
         """
         Analyze gaze patterns for integrity checking.
         
         Args:
-            face_landmarks: MediaPipe face landmarks (468 points)
+            face_landmarks: MediaPipe face landmarks (468 points), or an
+                            (N, >=2) array of x, y coordinates
             speech_onset: Whether user just started speaking
+            timestamp: Frame time in seconds on the checker's clock
+                       (defaults to reading the clock)
             
         Returns:
             IntegrityMetrics with gaze analysis
@@ -301,33 +426,21 @@ class IntegrityChecker:
         start_time = time.time()
         self.frame_count += 1
         
+        now = self._clock() if timestamp is None else timestamp
+        
         # Calculate gaze position
         gaze_x, gaze_y = self._calculate_gaze_position(face_landmarks)
         
         # Track gaze history
-        self.gaze_history.append({
-            'position': (gaze_x, gaze_y),
-            'timestamp': time.time(),
-            'speech_onset': speech_onset
-        })
+        self._gaze_ring[self._gaze_head] = (gaze_x, gaze_y, now, speech_onset)
+        self._gaze_head = (self._gaze_head + 1) % GAZE_HISTORY_SIZE
+        self._gaze_count = min(self._gaze_count + 1, GAZE_HISTORY_SIZE)
         
         # Detect repeated patterns at speech onset
-        pattern_detected = self._detect_repeated_pattern(gaze_x, gaze_y, speech_onset)
+        pattern_detected = self._detect_repeated_pattern(gaze_x, gaze_y, speech_onset, now)
         
         # Determine cluster ID for current gaze
-        cluster_id = None
-        if len(self.gaze_clusters) > 0:
-            # Find closest cluster
-            min_distance = float('inf')
-            for i, cluster in enumerate(self.gaze_clusters):
-                cluster_x, cluster_y = cluster['center']
-                distance = math.sqrt(
-                    (gaze_x - cluster_x)**2 + 
-                    (gaze_y - cluster_y)**2
-                )
-                if distance < min_distance and distance < self.gaze_cluster_threshold:
-                    min_distance = distance
-                    cluster_id = i
+        cluster_id = self._nearest_cluster(gaze_x, gaze_y)
         
         # Calculate integrity score
         integrity_score = self._calculate_integrity_score()
@@ -337,6 +450,73 @@ class IntegrityChecker:
         
         # Calculate processing time
         processing_time_ms = (time.time() - start_time) * 1000
+        self._dirty = True
+        
+        return IntegrityMetrics(
+            gaze_x=gaze_x,
+            gaze_y=gaze_y,
+            gaze_cluster_id=cluster_id,
+            cheat_flag_count=self.cheat_flag_count,
+            integrity_warning=integrity_warning,
+            integrity_score=integrity_score,
+            suspicious_segments=self.suspicious_segments.copy(),
+            processing_time_ms=processing_time_ms,
+            timestamp=now
+        )
+    
+    def analyze_batch(self,
+                      landmarks_array: np.ndarray,
+                      speech_onset_mask: np.ndarray,
+                      timestamps: np.ndarray) -> IntegrityMetrics:
+        """
+        Analyze F consecutive frames in one pass.
+        
+        Equivalent to calling analyze() on each frame in order and keeping
+        the last result. Gaze is computed for all frames at once; only the
+        speech-onset frames go through clustering, which stays sequential
+        because every visit moves its cluster center.
+        
+        Args:
+            landmarks_array: (F, 468, >=2) face landmark x, y coordinates
+            speech_onset_mask: (F,) True where the user just started speaking
+            timestamps: (F,) timestamps in seconds
+            
+        Returns:
+            IntegrityMetrics for the last frame
+        """
+        start_time = time.time()
+        landmarks_array = np.asarray(landmarks_array, dtype=np.float64)
+        speech_onset_mask = np.asarray(speech_onset_mask, dtype=bool)
+        timestamps = np.asarray(timestamps, dtype=np.float64)
+        n_frames = len(timestamps)
+        if n_frames == 0:
+            raise ValueError("analyze_batch needs at least one frame")
+        
+        self.frame_count += n_frames
+        gaze = self._batch_gaze_positions(landmarks_array)
+        
+        # Only the newest GAZE_HISTORY_SIZE frames would survive in the ring anyway
+        recent = slice(-GAZE_HISTORY_SIZE, None)
+        n_recent = min(n_frames, GAZE_HISTORY_SIZE)
+        rows = (self._gaze_head + np.arange(n_recent)) % GAZE_HISTORY_SIZE
+        self._gaze_ring[rows, :2] = gaze[recent]
+        self._gaze_ring[rows, 2] = timestamps[recent]
+        self._gaze_ring[rows, 3] = speech_onset_mask[recent]
+        self._gaze_head = (self._gaze_head + n_recent) % GAZE_HISTORY_SIZE
+        self._gaze_count = min(self._gaze_count + n_recent, GAZE_HISTORY_SIZE)
+        
+        # Detect repeated patterns at each speech onset
+        for (gaze_x, gaze_y), t in zip(gaze[speech_onset_mask].tolist(),
+                                       timestamps[speech_onset_mask].tolist()):
+            self._detect_repeated_pattern(gaze_x, gaze_y, True, t)
+        
+        gaze_x, gaze_y = gaze[-1].tolist()
+        cluster_id = self._nearest_cluster(gaze_x, gaze_y)
+        integrity_score = self._calculate_integrity_score()
+        integrity_warning = self.cheat_flag_count >= self.cheat_flag_threshold
+        
+        processing_time_ms = (time.time() - start_time) * 1000
+        self._dirty = True
         
         return IntegrityMetrics(
             gaze_x=gaze_x,
@@ -347,17 +527,24 @@ class IntegrityChecker:
             integrity_score=integrity_score,
             suspicious_segments=self.suspicious_segments.copy(),
             processing_time_ms=processing_time_ms,
-            timestamp=time.time()
+            timestamp=float(timestamps[-1])
         )
     
     def get_session_report(self) -> IntegrityReport:
         """
         Generate comprehensive integrity report for entire session.
         
+        Repeat calls with no analysis in between reuse the cached report,
+        refreshing only the session duration. Every call returns its own
+        copy, so callers may modify the report freely.
+        
         Returns:
             IntegrityReport with session-wide analysis
         """
-        session_duration = time.time() - self.session_start_time
+        session_duration = self._clock() - self.session_start_time
+        if not self._dirty and self._report_cache is not None:
+            return self._copy_cached_report(session_duration)
+        
         integrity_score = self._calculate_integrity_score()
         
         # Determine assessment level
@@ -377,19 +564,17 @@ class IntegrityChecker:
             )
         
         if len(self.cluster_frequencies) > 0:
-            max_cluster_freq = max(self.cluster_frequencies.values())
+            max_cluster_freq = self.max_cluster_frequency
             if max_cluster_freq > self.total_speech_onsets * 0.5:
                 recommendations.append(
                     f"High concentration of gaze to single location ({max_cluster_freq}/{self.total_speech_onsets} speech onsets)"
                 )
         
         if integrity_score < 0.5:
-            recommendations.append(
-                "Consider manual review of interview recording for potential integrity issues"
-            )
+            recommendations.append(MANUAL_REVIEW_RECOMMENDATION)
         
         if len(recommendations) == 0:
-            recommendations.append("No significant integrity concerns detected")
+            recommendations.append(NO_CONCERNS_RECOMMENDATION)
         
         # Format cluster information
         cluster_info = []
@@ -401,7 +586,7 @@ class IntegrityChecker:
                 'frequency': self.cluster_frequencies.get(i, 0)
             })
         
-        return IntegrityReport(
+        self._report_cache = IntegrityReport(
             session_duration_minutes=session_duration / 60.0,
             total_speech_onsets=self.total_speech_onsets,
             cheat_flag_count=self.cheat_flag_count,
@@ -410,4 +595,17 @@ class IntegrityChecker:
             suspicious_segments=self.suspicious_segments.copy(),
             gaze_clusters=cluster_info,
             recommendations=recommendations
+        )
+        self._dirty = False
+        return self._copy_cached_report(session_duration)
+    
+    def _copy_cached_report(self, session_duration: float) -> IntegrityReport:
+        """Copy the cached report (and its lists) with a fresh session duration."""
+        cached = self._report_cache
+        return replace(
+            cached,
+            session_duration_minutes=session_duration / 60.0,
+            suspicious_segments=[dict(segment) for segment in cached.suspicious_segments],
+            gaze_clusters=[dict(cluster) for cluster in cached.gaze_clusters],
+            recommendations=list(cached.recommendations)
         )
\ No newline at end of file
@@ -0,0 +1,24 @@
+"""
+Landmark conversion shared by the behavioral analyzers.
+"""
+
+from typing import Optional
+
+import numpy as np
+
+
+def as_array(landmarks) -> Optional[np.ndarray]:
+    """
+    Convert landmarks to a float64 array of shape (N, 4): x, y, z, visibility.
+    
+    Arrays are passed through without copying; lists of Landmark-like objects
+    are converted once so analysis can index rows instead of attributes.
+    """
+    if landmarks is None:
+        return None
+    if isinstance(landmarks, np.ndarray):
+        return landmarks
+    return np.array(
+        [(lm.x, lm.y, lm.z, lm.visibility) for lm in landmarks],
+        dtype=np.float64
+    ).reshape(-1, 4)
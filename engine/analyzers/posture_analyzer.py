@@ -10,8 +10,13 @@ Analyzes body posture including:
 
 import math
 from dataclasses import dataclass
-from typing import Optional, Tuple, List
+from typing import Optional, Tuple, List, Union
 from collections import deque
+from itertools import repeat
+
+import numpy as np
+
+from .landmarks import as_array
 
 
 @dataclass
@@ -62,6 +67,15 @@ class PostureAnalyzer:
     LEFT_HIP = 23
     RIGHT_HIP = 24
     
+    # Rows gathered from the pose array once per frame, ordered so the
+    # arms-crossed rows (wrists, shoulders, hips) form one contiguous slice
+    KEY_INDICES = np.array([NOSE, LEFT_WRIST, RIGHT_WRIST, LEFT_SHOULDER, RIGHT_SHOULDER, LEFT_HIP, RIGHT_HIP])
+    ARMS_ROWS = slice(1, 7)
+    
+    # Arms-crossed thresholds (squared where compared to squared distances)
+    ARMS_VISIBILITY_THRESHOLD = 0.5
+    ARMS_CHEST_RADIUS_SQ = 0.25 * 0.25
+    
     def __init__(self, 
                  shoulder_angle_threshold: float = 15.0,
                  slouch_threshold: float = 0.05,  # More sensitive (was 0.1)
@@ -83,6 +97,9 @@ class PostureAnalyzer:
         self.rock_threshold = rock_threshold
         self.arms_crossed_frames = arms_crossed_frames
         
+        # Derived thresholds, computed once instead of per frame
+        self._arms_crossed_min_count = arms_crossed_frames * 0.7  # 70% of window
+        
         # History buffers for temporal analysis
         self.shoulder_history = deque(maxlen=history_size)
         self.baseline_nose_shoulder_dist: Optional[float] = None
@@ -173,69 +190,63 @@ class PostureAnalyzer:
         return is_slouching, float(slouch_score)
 
     
-    def _detect_arms_crossed(
-        self,
-        left_wrist: Landmark,
-        right_wrist: Landmark,
-        left_elbow: Landmark,
-        right_elbow: Landmark,
-        left_shoulder: Landmark,
-        right_shoulder: Landmark,
-        left_hip: Landmark,
-        right_hip: Landmark
-    ) -> bool:
+    def _arms_crossed_frame(self, pts: np.ndarray) -> Tuple[bool, bool]:
         """
-        Robust arms-crossed detection using spatial relationships.
+        Single-frame arms-crossed check (no temporal smoothing).
         
         Logic:
         1. Check if wrists are closer to OPPOSITE shoulders than same-side shoulders
         2. Verify wrists are near chest center (not extended outward)
         3. Ensure wrists are above hips (prevents false positives from relaxed hands)
         
-        Uses temporal smoothing to prevent flickering.
+        Args:
+            pts: Arms rows (lw, rw, ls, rs, lh, rh) of shape (6, 4)
+            
+        Returns:
+            Tuple of (arms_visible, crossed)
         """
+        # Visibility check (wrists and shoulders), folded into the condition below
+        vis_ok = (pts[:4, 3] >= self.ARMS_VISIBILITY_THRESHOLD).all()
+        
+        wrists = pts[0:2, :2]
+        shoulders = pts[2:4, :2]
+        
+        # Shoulder center and hip Y coordinate (for vertical validation)
+        shoulder_center = shoulders.mean(axis=0)
+        hip_y = (pts[4, 1] + pts[5, 1]) / 2.0
+        
+        # Key signal: squared distances to same-side [lw-ls, rw-rs] and
+        # opposite [lw-rs, rw-ls] shoulders, plus wrist distances to chest
+        # center. Only compared against each other or a threshold, so no sqrt.
+        deltas = np.concatenate([
+            wrists - shoulders,
+            wrists - shoulders[::-1],
+            wrists - shoulder_center
+        ])
+        dists_sq = (deltas * deltas).sum(axis=1)
+        
+        # Core crossed-arm condition, as one straight-line expression:
+        # Each wrist is closer to the OPPOSITE shoulder than its own shoulder,
+        # wrists are near the chest (within 0.25) and elevated above the hips
+        crossed = bool(
+            vis_ok &
+            (dists_sq[2:4] < dists_sq[0:2]).all() &
+            (dists_sq[4:6] < self.ARMS_CHEST_RADIUS_SQ).all() &
+            (wrists[:, 1] < hip_y).all()
+        )
         
-        # Visibility check
-        if (left_wrist.visibility < 0.5 or 
-            right_wrist.visibility < 0.5 or
-            left_shoulder.visibility < 0.5 or
-            right_shoulder.visibility < 0.5):
-            self.arms_crossed_history.append(False)
-            return False
+        return bool(vis_ok), crossed
+    
+    def _detect_arms_crossed(self, pts: np.ndarray) -> bool:
+        """
+        Robust arms-crossed detection using spatial relationships.
         
-        # Calculate shoulder center
-        shoulder_cx = (left_shoulder.x + right_shoulder.x) / 2.0
-        shoulder_cy = (left_shoulder.y + right_shoulder.y) / 2.0
-        
-        # Hip Y coordinate (for vertical validation)
-        hip_y = (left_hip.y + right_hip.y) / 2.0
-        
-        # Distance helper function
-        def dist(a: Landmark, b: Landmark) -> float:
-            return math.hypot(a.x - b.x, a.y - b.y)
-        
-        # Key signal: distances to opposite shoulders vs same-side shoulders
-        lw_to_rs = dist(left_wrist, right_shoulder)  # Left wrist to RIGHT shoulder
-        rw_to_ls = dist(right_wrist, left_shoulder)  # Right wrist to LEFT shoulder
-        lw_to_ls = dist(left_wrist, left_shoulder)   # Left wrist to LEFT shoulder
-        rw_to_rs = dist(right_wrist, right_shoulder) # Right wrist to RIGHT shoulder
-        
-        # Wrists close to chest center (not extended outward)
-        lw_center_dist = math.hypot(left_wrist.x - shoulder_cx, left_wrist.y - shoulder_cy)
-        rw_center_dist = math.hypot(right_wrist.x - shoulder_cx, right_wrist.y - shoulder_cy)
-        wrists_inward = (lw_center_dist < 0.25 and rw_center_dist < 0.25)
-        
-        # Wrists above hips (prevents relaxed hand false positives)
-        wrists_up = (left_wrist.y < hip_y and right_wrist.y < hip_y)
-        
-        # Core crossed-arm condition:
-        # Each wrist is closer to the OPPOSITE shoulder than its own shoulder
-        crossed = (
-            lw_to_rs < lw_to_ls and  # Left wrist closer to right shoulder
-            rw_to_ls < rw_to_rs and  # Right wrist closer to left shoulder
-            wrists_inward and        # Wrists near chest
-            wrists_up                # Wrists elevated
-        )
+        Uses temporal smoothing to prevent flickering.
+        
+        Args:
+            pts: Arms rows (lw, rw, ls, rs, lh, rh) of shape (6, 4)
+        """
+        vis_ok, crossed = self._arms_crossed_frame(pts)
         
         # Add to history for temporal smoothing
         self.arms_crossed_history.append(crossed)
@@ -245,8 +256,9 @@ class PostureAnalyzer:
             return False
         
         # Return True if majority of recent frames show crossed
+        # (never while the arms are not visible in the current frame)
         crossed_count = sum(self.arms_crossed_history)
-        return crossed_count >= (self.arms_crossed_frames * 0.7)  # 70% threshold
+        return bool(vis_ok & (crossed_count >= self._arms_crossed_min_count))
 
     
     def _detect_rocking(self, shoulders: Tuple[Landmark, Landmark]) -> Tuple[float, float]:
@@ -289,14 +301,29 @@ class PostureAnalyzer:
         
         return float(rocking_score), float(shoulder_stability)
     
+    def _key_points(self, pose_landmarks) -> Tuple[np.ndarray, Landmark, Landmark, Landmark]:
+        """
+        Gather the rows analysis needs from the pose in one indexing pass.
+        
+        Args:
+            pose_landmarks: List of 33 pose landmarks or a (33, 4) array
+            
+        Returns:
+            Tuple of (key rows array, nose, left_shoulder, right_shoulder)
+        """
+        key = as_array(pose_landmarks)[self.KEY_INDICES]
+        rows = key.tolist()
+        return key, Landmark(*rows[0]), Landmark(*rows[3]), Landmark(*rows[4])
+    
     def analyze(self, 
-                pose_landmarks: Optional[List[Landmark]],
+                pose_landmarks: Optional[Union[List[Landmark], np.ndarray]],
                 timestamp: float) -> PostureMetrics:
         """
         Perform complete posture analysis on pose landmarks.
         
         Args:
-            pose_landmarks: List of 33 pose landmarks (or None if not detected)
+            pose_landmarks: List of 33 pose landmarks or a (33, 4) array of
+                x, y, z, visibility rows (or None if not detected)
             timestamp: Current timestamp in seconds
             
         Returns:
@@ -315,14 +342,7 @@ class PostureAnalyzer:
                 timestamp=timestamp
             )
         
-        # Extract key landmarks
-        nose = pose_landmarks[self.NOSE]
-        left_shoulder = pose_landmarks[self.LEFT_SHOULDER]
-        right_shoulder = pose_landmarks[self.RIGHT_SHOULDER]
-        left_elbow = pose_landmarks[self.LEFT_ELBOW]
-        right_elbow = pose_landmarks[self.RIGHT_ELBOW]
-        left_wrist = pose_landmarks[self.LEFT_WRIST]
-        right_wrist = pose_landmarks[self.RIGHT_WRIST]
+        key, nose, left_shoulder, right_shoulder = self._key_points(pose_landmarks)
         
         # 1. Calculate shoulder angle
         shoulder_angle = self._calculate_shoulder_angle(left_shoulder, right_shoulder)
@@ -332,19 +352,7 @@ class PostureAnalyzer:
         is_slouching, slouch_score = self._detect_slouch(nose, (left_shoulder, right_shoulder))
         
         # 3. Detect arms crossed
-        left_hip = pose_landmarks[self.LEFT_HIP]
-        right_hip = pose_landmarks[self.RIGHT_HIP]
-
-        arms_crossed = self._detect_arms_crossed(
-            left_wrist,
-            right_wrist,
-            left_elbow,
-            right_elbow,
-            left_shoulder,
-            right_shoulder,
-            left_hip,
-            right_hip
-        )
+        arms_crossed = self._detect_arms_crossed(key[self.ARMS_ROWS])
 
         
         # 4. Detect rocking/stability
@@ -361,6 +369,34 @@ class PostureAnalyzer:
             timestamp=timestamp
         )
     
+    def prefill(self, 
+                pose_landmarks: Optional[Union[List[Landmark], np.ndarray]],
+                n_frames: int):
+        """
+        Fill the temporal buffers as if analyze() had seen the same pose n_frames times.
+        
+        Per-frame metrics are computed once and repeated into the history
+        buffers, so a following analyze() call returns the same result as
+        the last of n_frames + 1 identical analyze() calls.
+        
+        Args:
+            pose_landmarks: List of 33 pose landmarks or a (33, 4) array
+            n_frames: Number of identical frames to push
+        """
+        if pose_landmarks is None or len(pose_landmarks) < 25 or n_frames <= 0:
+            return
+        
+        key, nose, left_shoulder, right_shoulder = self._key_points(pose_landmarks)
+        
+        # Slouch baseline only depends on the first frame
+        self._detect_slouch(nose, (left_shoulder, right_shoulder))
+        
+        _, crossed = self._arms_crossed_frame(key[self.ARMS_ROWS])
+        self.arms_crossed_history.extend(repeat(crossed, n_frames))
+        
+        shoulder_mid_x = (left_shoulder.x + right_shoulder.x) / 2.0
+        self.shoulder_history.extend(repeat(shoulder_mid_x, n_frames))
+    
     def reset(self):
         """Reset analyzer state (history buffers and baselines)."""
         self.shoulder_history.clear()
@@ -12,9 +12,29 @@ Requirements: 4.1, 4.2, 4.3, 4.4, 4.5
 import time
 import math
 from dataclasses import dataclass
-from typing import Optional, List, Tuple
+from typing import Optional, Tuple
 from collections import deque
 
+import numpy as np
+
+
+# Face mesh rows used by the analyzer, as index tables for fancy indexing.
+# Eye order is [p1, p2, p3, p4, p5, p6]: p1-p4 horizontal, p2-p6 and p3-p5 vertical.
+LEFT_EYE_INDICES = np.array([33, 160, 158, 133, 153, 144])
+RIGHT_EYE_INDICES = np.array([362, 387, 385, 263, 380, 373])
+# Face size: left/right temple (width) and forehead/chin (height)
+FACE_SIZE_INDICES = np.array([234, 454, 10, 152])
+# Lip opening pairs: inner lip, weighted center (13/14), left and right corners
+LIP_UPPER_INDICES = np.array([13, 82, 81, 80, 78, 13, 61, 291])
+LIP_LOWER_INDICES = np.array([14, 87, 178, 88, 95, 14, 84, 314])
+LIP_WEIGHTS = np.array([1.0, 1.0, 1.0, 1.0, 1.0, 2.0, 1.0, 1.0])
+# Every row read by analyze(); list input only needs these converted
+FACE_ROWS = np.unique(np.concatenate([
+    LEFT_EYE_INDICES, RIGHT_EYE_INDICES, FACE_SIZE_INDICES,
+    LIP_UPPER_INDICES, LIP_LOWER_INDICES
+]))
+FACE_MESH_SIZE = 468
+
 
 @dataclass
 class StressMetrics:
@@ -115,29 +135,21 @@ class StressAnalyzer:
         self.lip_calibration_sum = 0.0
         self.frame_count = 0
     
-    def _calculate_face_size(self, face_landmarks) -> float:
+    def _calculate_face_size(self, face_coords: np.ndarray) -> float:
         """
         Calculate face size to estimate distance from camera.
         
         Args:
-            face_landmarks: MediaPipe face landmarks
+            face_coords: (468, 2) array of face landmark x, y coordinates
             
         Returns:
             Face size metric (larger = closer to camera)
         """
-        if not face_landmarks or len(face_landmarks) < 468:
-            return 0.1  # Default small face size
+        left_temple, right_temple, forehead, chin = face_coords[FACE_SIZE_INDICES].tolist()
         
-        # Use face outline landmarks for size calculation
-        # Face width: left temple to right temple
-        left_temple = face_landmarks[234]   # Left temple
-        right_temple = face_landmarks[454]  # Right temple
-        face_width = abs(left_temple.x - right_temple.x)
-        
-        # Face height: forehead to chin
-        forehead = face_landmarks[10]   # Forehead center
-        chin = face_landmarks[152]      # Chin center  
-        face_height = abs(forehead.y - chin.y)
+        # Face width: left temple to right temple; height: forehead to chin
+        face_width = abs(left_temple[0] - right_temple[0])
+        face_height = abs(forehead[1] - chin[1])
         
         # Face size is the average of width and height
         face_size = (face_width + face_height) / 2.0
@@ -180,52 +192,53 @@ class StressAnalyzer:
         
         return adjusted_threshold
     
-    def _calculate_ear(self, eye_landmarks: List[Tuple[float, float]]) -> float:
+    def _calculate_ear(self, eye_points) -> float:
         """
         Calculate Eye Aspect Ratio using the standard formula.
         
         Args:
-            eye_landmarks: List of (x, y) coordinates for eye landmarks
-                          Expected order: [p1, p2, p3, p4, p5, p6]
-                          where p1-p4 are horizontal, p2-p6 and p3-p5 are vertical
+            eye_points: (6, 2) array (or list) of (x, y) coordinates for eye landmarks
+                        Expected order: [p1, p2, p3, p4, p5, p6]
+                        where p1-p4 are horizontal, p2-p6 and p3-p5 are vertical
         
         Returns:
             Eye Aspect Ratio value
         """
-        if len(eye_landmarks) < 6:
+        if len(eye_points) < 6:
             return 0.5  # Default EAR when landmarks unavailable
         
-        # Extract landmark coordinates
-        p1, p2, p3, p4, p5, p6 = eye_landmarks[:6]
-        
-        # Calculate distances
-        # Vertical distances
-        dist_p2_p6 = math.sqrt((p2[0] - p6[0])**2 + (p2[1] - p6[1])**2)
-        dist_p3_p5 = math.sqrt((p3[0] - p5[0])**2 + (p3[1] - p5[1])**2)
-        
-        # Horizontal distance
-        dist_p1_p4 = math.sqrt((p1[0] - p4[0])**2 + (p1[1] - p4[1])**2)
+        # Six points are too few for vectorized math to pay off: unpack them
+        # once into Python floats and use scalar arithmetic
+        if isinstance(eye_points, np.ndarray):
+            eye_points = eye_points.tolist()
+        (x1, y1), (x2, y2), (x3, y3), (x4, y4), (x5, y5), (x6, y6) = (
+            p[:2] for p in eye_points[:6]
+        )
         
-        # Avoid division by zero
-        if dist_p1_p4 == 0:
+        # Horizontal distance ||p1-p4||; avoid division by zero
+        horizontal = math.sqrt((x1 - x4)**2 + (y1 - y4)**2)
+        if horizontal == 0:
             return 0.5
         
+        # Vertical distances ||p2-p6|| and ||p3-p5||
+        vertical_a = math.sqrt((x2 - x6)**2 + (y2 - y6)**2)
+        vertical_b = math.sqrt((x3 - x5)**2 + (y3 - y5)**2)
+        
         # EAR formula
-        ear = (dist_p2_p6 + dist_p3_p5) / (2.0 * dist_p1_p4)
-        return ear
+        return (vertical_a + vertical_b) / (2.0 * horizontal)
     
-    def _detect_blink_adaptive(self, average_ear: float, face_size: float) -> bool:
+    def _detect_blink_adaptive(self, average_ear: float, face_size: float, current_time: float) -> bool:
         """
         Detect blink using adaptive threshold based on face distance.
         
         Args:
             average_ear: Current frame's average EAR value
             face_size: Current face size for distance estimation
+            current_time: Frame time in seconds
             
         Returns:
             True if new blink detected
         """
-        current_time = time.time()
         blink_detected = False
         
         # Establish baseline EAR during first 60 frames
@@ -325,14 +338,18 @@ class StressAnalyzer:
         
         return blink_detected
     
-    def _calculate_blink_rate(self) -> float:
+    def _calculate_blink_rate(self, current_time: Optional[float] = None) -> float:
         """
         Calculate current blink rate in blinks per minute.
         
+        Args:
+            current_time: Time in seconds to measure up to (defaults to now)
+            
         Returns:
             Blinks per minute based on recent history
         """
-        current_time = time.time()
+        if current_time is None:
+            current_time = time.time()
         session_duration = current_time - self.session_start_time
         
         if session_duration < 1.0:
@@ -342,90 +359,43 @@ class StressAnalyzer:
         blinks_per_minute = (self.blink_count / session_duration) * 60.0
         return blinks_per_minute
     
-    def _calculate_lip_distance(self, face_landmarks) -> float:
+    def _calculate_lip_distance(self, face_coords: np.ndarray) -> float:
         """
         Calculate lip opening using multiple landmarks for better accuracy.
         
-        Uses the lip contour area instead of just two points for more reliable detection.
+        Uses inner lip, center (weighted double) and corner vertical distances
+        instead of just two points for more reliable detection.
         
         Args:
-            face_landmarks: MediaPipe face landmarks (468 points)
+            face_coords: (468, 2) array of face landmark x, y coordinates
             
         Returns:
             Lip opening ratio (0.0 = completely closed, higher = more open)
         """
-        if not face_landmarks or len(face_landmarks) < 468:
-            return 0.05  # Default moderate opening
-        
-        # Key lip landmarks for accurate measurement
-        # Upper lip outline (left to right)
-        upper_lip_points = [61, 84, 17, 314, 405, 320, 307, 375, 321, 308, 324, 318]
-        # Lower lip outline (left to right) 
-        lower_lip_points = [78, 95, 88, 178, 87, 14, 317, 402, 318, 324, 308, 324]
-        
-        # Inner lip landmarks for opening measurement
-        upper_inner = [13, 82, 81, 80, 78]  # Upper inner lip
-        lower_inner = [14, 87, 178, 88, 95]  # Lower inner lip
-        
-        # Calculate vertical distances at multiple points
-        vertical_distances = []
-        
-        # Method 1: Inner lip vertical distances
-        for i in range(min(len(upper_inner), len(lower_inner))):
-            upper_point = face_landmarks[upper_inner[i]]
-            lower_point = face_landmarks[lower_inner[i]]
-            
-            distance = abs(upper_point.y - lower_point.y)
-            vertical_distances.append(distance)
-        
-        # Method 2: Center lip measurement (most reliable)
-        # Upper lip center
-        upper_center = face_landmarks[13]  # Cupid's bow center
-        # Lower lip center  
-        lower_center = face_landmarks[14]  # Lower lip center
-        
-        center_distance = abs(upper_center.y - lower_center.y)
-        vertical_distances.append(center_distance * 2)  # Weight center more
-        
-        # Method 3: Lip corner measurements
-        # Left corner
-        left_upper = face_landmarks[61]   # Left upper corner
-        left_lower = face_landmarks[84]   # Left lower corner
-        left_distance = abs(left_upper.y - left_lower.y)
-        
-        # Right corner
-        right_upper = face_landmarks[291]  # Right upper corner
-        right_lower = face_landmarks[314]  # Right lower corner  
-        right_distance = abs(right_upper.y - right_lower.y)
-        
-        vertical_distances.extend([left_distance, right_distance])
-        
-        # Calculate average opening with outlier removal
-        if len(vertical_distances) > 2:
-            # Remove extreme values
-            vertical_distances.sort()
-            # Remove top and bottom 20% to reduce noise
-            trim_count = max(1, len(vertical_distances) // 5)
-            trimmed_distances = vertical_distances[trim_count:-trim_count] if trim_count > 0 else vertical_distances
-            
-            average_opening = sum(trimmed_distances) / len(trimmed_distances)
-        else:
-            average_opening = sum(vertical_distances) / len(vertical_distances) if vertical_distances else 0.05
+        y = face_coords[:, 1]
+        vertical_distances = np.sort(
+            np.abs(y[LIP_UPPER_INDICES] - y[LIP_LOWER_INDICES]) * LIP_WEIGHTS
+        )
+        
+        # Remove top and bottom 20% to reduce noise
+        trim_count = max(1, len(vertical_distances) // 5)
+        trimmed_distances = vertical_distances[trim_count:-trim_count]
         
-        return float(average_opening)
+        return float(trimmed_distances.sum() / len(trimmed_distances))
     
-    def _detect_lip_pursing(self, lip_distance: float, is_speaking: bool) -> Tuple[bool, float]:
+    def _detect_lip_pursing(self, lip_distance: float, is_speaking: bool,
+                            current_time: float) -> Tuple[bool, float]:
         """
         Detect sustained lip compression indicating anxiety using adaptive baseline.
         
         Args:
             lip_distance: Current frame's lip distance
             is_speaking: Whether user is currently speaking
+            current_time: Frame time in seconds
             
         Returns:
             Tuple of (lip_pursing_detected, purse_duration)
         """
-        current_time = time.time()
         self.lip_distance_history.append(lip_distance)
         
         # Don't detect lip pursing while speaking
@@ -504,18 +474,51 @@ class StressAnalyzer:
         else:
             return "low"
     
-    def analyze(self, face_landmarks, is_speaking: bool = False) -> StressMetrics:
+    def analyze(self, face_landmarks, is_speaking: bool = False,
+                timestamp: Optional[float] = None) -> StressMetrics:
         """
         Analyze stress signals from facial landmarks.
         
         Args:
-            face_landmarks: MediaPipe face landmarks (468 points)
+            face_landmarks: MediaPipe face landmarks (468 points), or an
+                            (N, >=2) array of x, y coordinates
+            is_speaking: Whether user is currently speaking
+            timestamp: Frame time in seconds on the time.time() clock
+                       (defaults to the current time)
+            
+        Returns:
+            StressMetrics with comprehensive stress analysis
+        """
+        if isinstance(face_landmarks, np.ndarray):
+            return self.analyze_array(face_landmarks, is_speaking, timestamp)
+        
+        face_coords = None
+        if face_landmarks and len(face_landmarks) >= FACE_MESH_SIZE:
+            # Only convert the rows the analyzer reads
+            face_coords = np.zeros((len(face_landmarks), 2))
+            face_coords[FACE_ROWS] = [
+                (face_landmarks[i].x, face_landmarks[i].y) for i in FACE_ROWS.tolist()
+            ]
+        return self.analyze_array(face_coords, is_speaking, timestamp)
+    
+    def analyze_array(self, face_coords: Optional[np.ndarray], is_speaking: bool = False,
+                      timestamp: Optional[float] = None) -> StressMetrics:
+        """
+        Analyze stress signals from face landmark coordinates.
+        
+        Args:
+            face_coords: (N, >=2) array of face landmark x, y (extra columns
+                         ignored), or None when no face is detected
             is_speaking: Whether user is currently speaking
+            timestamp: Frame time in seconds on the time.time() clock
+                       (defaults to the current time)
             
         Returns:
             StressMetrics with comprehensive stress analysis
         """
         start_time = time.time()
+        if timestamp is None:
+            timestamp = start_time
         self.frame_count += 1
         
         # Default values for missing landmarks
@@ -525,45 +528,24 @@ class StressAnalyzer:
         lip_pursing = False
         lip_purse_duration = 0.0
         
-        if face_landmarks and len(face_landmarks) >= 468:
-            # Extract eye landmarks for EAR calculation
-            # Left eye landmarks (user's left eye)
-            left_eye = [
-                (face_landmarks[33].x, face_landmarks[33].y),  # p1 - left corner
-                (face_landmarks[160].x, face_landmarks[160].y),  # p2 - top
-                (face_landmarks[158].x, face_landmarks[158].y),  # p3 - top
-                (face_landmarks[133].x, face_landmarks[133].y),  # p4 - right corner
-                (face_landmarks[153].x, face_landmarks[153].y),  # p5 - bottom
-                (face_landmarks[144].x, face_landmarks[144].y),  # p6 - bottom
-            ]
-            
-            # Right eye landmarks (user's right eye)
-            right_eye = [
-                (face_landmarks[362].x, face_landmarks[362].y),  # p1 - right corner
-                (face_landmarks[387].x, face_landmarks[387].y),  # p2 - top
-                (face_landmarks[385].x, face_landmarks[385].y),  # p3 - top
-                (face_landmarks[263].x, face_landmarks[263].y),  # p4 - left corner
-                (face_landmarks[380].x, face_landmarks[380].y),  # p5 - bottom
-                (face_landmarks[373].x, face_landmarks[373].y),  # p6 - bottom
-            ]
-            
-            # Calculate EAR for both eyes
-            left_ear = self._calculate_ear(left_eye)
-            right_ear = self._calculate_ear(right_eye)
+        if face_coords is not None and len(face_coords) >= FACE_MESH_SIZE:
+            # Calculate EAR for both eyes (user's left and right eye)
+            left_ear = self._calculate_ear(face_coords[LEFT_EYE_INDICES])
+            right_ear = self._calculate_ear(face_coords[RIGHT_EYE_INDICES])
             average_ear = (left_ear + right_ear) / 2.0
             
             # Calculate face size for distance adaptation
-            face_size = self._calculate_face_size(face_landmarks)
+            face_size = self._calculate_face_size(face_coords)
             
             # Detect blinks using adaptive threshold
-            blink_detected = self._detect_blink_adaptive(average_ear, face_size)
+            blink_detected = self._detect_blink_adaptive(average_ear, face_size, timestamp)
             
             # Calculate lip opening using improved multi-point method
-            lip_distance = self._calculate_lip_distance(face_landmarks)
-            lip_pursing, lip_purse_duration = self._detect_lip_pursing(lip_distance, is_speaking)
+            lip_distance = self._calculate_lip_distance(face_coords)
+            lip_pursing, lip_purse_duration = self._detect_lip_pursing(lip_distance, is_speaking, timestamp)
         
         # Calculate blink rate
-        blink_rate = self._calculate_blink_rate()
+        blink_rate = self._calculate_blink_rate(timestamp)
         
         # Determine cognitive load
         high_cognitive_load = blink_rate > self.blink_rate_threshold
@@ -587,7 +569,7 @@ class StressAnalyzer:
             lip_purse_duration=lip_purse_duration,
             stress_level=stress_level,
             processing_time_ms=processing_time_ms,
-            timestamp=time.time()
+            timestamp=timestamp
         )
     
     def get_session_summary(self) -> dict:
@@ -0,0 +1,51 @@
+"""
+Webcam capture helpers shared by the live demo and debug scripts.
+
+A capture thread reads frames into a LatestFrameSlot so the next read
+overlaps landmark inference, and the main loop always gets the newest frame.
+"""
+
+import threading
+import time
+
+
+class LatestFrameSlot:
+    """
+    Single-slot frame handoff between the capture thread and the main loop.
+
+    Each put() overwrites whatever hasn't been taken yet, so the main loop
+    always processes the newest frame and stale frames are dropped.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._item = None
+
+    def put(self, item):
+        """Store item, replacing any frame not yet taken."""
+        with self._cond:
+            self._item = item
+            self._cond.notify()
+
+    def take(self, timeout=None):
+        """Remove and return the newest item, or None if none arrives in time."""
+        with self._cond:
+            if self._item is None:
+                self._cond.wait(timeout)
+            item, self._item = self._item, None
+            return item
+
+
+def capture_frames(cap, frame_slot, stop_event):
+    """
+    Capture thread: keep reading webcam frames into frame_slot.
+
+    Puts (ret, frame, captured_at) tuples, where captured_at is a
+    time.perf_counter() reading, and stops after a failed read or once
+    stop_event is set.
+    """
+    while not stop_event.is_set():
+        ret, frame = cap.read()
+        frame_slot.put((ret, frame, time.perf_counter()))
+        if not ret:
+            return
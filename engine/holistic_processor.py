@@ -29,6 +29,7 @@ class HolisticResults:
     right_hand_landmarks: Optional[List[Landmark]]  # 21 points
     timestamp: float
     frame_number: int
+    pose_array: Optional[np.ndarray] = None  # (33, 4) x, y, z, visibility rows
 
 
 class HolisticProcessor:
@@ -41,7 +42,8 @@ class HolisticProcessor:
                  min_detection_confidence: float = 0.5,
                  min_tracking_confidence: float = 0.5,
                  enable_frame_skip: bool = True,
-                 target_fps: float = 15.0):
+                 target_fps: float = 15.0,
+                 model_complexity: int = 1):
         """
         Initialize MediaPipe Holistic model.
         
@@ -50,18 +52,20 @@ class HolisticProcessor:
             min_tracking_confidence: Minimum confidence for tracking (0.0-1.0)
             enable_frame_skip: Whether to skip frames under load
             target_fps: Target processing rate (frames per second)
+            model_complexity: Pose model size: 0=Lite (fastest), 1=Full, 2=Heavy
         """
         self.min_detection_confidence = min_detection_confidence
         self.min_tracking_confidence = min_tracking_confidence
         self.enable_frame_skip = enable_frame_skip
         self.target_fps = target_fps
+        self.model_complexity = model_complexity
         
         # Initialize MediaPipe Holistic
         self.mp_holistic = mp.solutions.holistic
         self.holistic = self.mp_holistic.Holistic(
             min_detection_confidence=min_detection_confidence,
             min_tracking_confidence=min_tracking_confidence,
-            model_complexity=1,  # 0=Lite, 1=Full, 2=Heavy
+            model_complexity=model_complexity,  # 0=Lite, 1=Full, 2=Heavy
             smooth_landmarks=True,  # Enable built-in smoothing
             enable_segmentation=False,  # Disable to save CPU
             refine_face_landmarks=True  # Enable for better eye/lip tracking
@@ -73,7 +77,8 @@ class HolisticProcessor:
         self.processing_times = []
         self.skip_counter = 0
         
-        print(f"✅ HolisticProcessor initialized (confidence: {min_detection_confidence})")
+        print(f"✅ HolisticProcessor initialized (confidence: {min_detection_confidence}, "
+              f"model_complexity: {model_complexity})")
     
     def _convert_landmarks(self, mp_landmarks) -> Optional[List[Landmark]]:
         """
@@ -98,6 +103,24 @@ class HolisticProcessor:
             ))
         return landmarks
     
+    def _convert_landmarks_array(self, mp_landmarks) -> Optional[np.ndarray]:
+        """
+        Convert MediaPipe landmarks to an (N, 4) array of x, y, z, visibility.
+        
+        Args:
+            mp_landmarks: MediaPipe landmark list
+            
+        Returns:
+            float64 array or None if no landmarks
+        """
+        if not mp_landmarks:
+            return None
+        
+        return np.array(
+            [(lm.x, lm.y, lm.z, getattr(lm, 'visibility', 1.0)) for lm in mp_landmarks.landmark],
+            dtype=np.float64
+        )
+    
     def should_skip_frame(self) -> bool:
         """
         Determine if current frame should be skipped based on performance.
@@ -158,8 +181,13 @@ class HolisticProcessor:
         # Process frame with MediaPipe Holistic
         results = self.holistic.process(rgb_frame)
         
-        # Convert landmarks to our format
-        pose_landmarks = self._convert_landmarks(results.pose_landmarks)
+        # Convert landmarks to our format (pose once as an array, with
+        # Landmark views for callers that use attribute access)
+        pose_array = self._convert_landmarks_array(results.pose_landmarks)
+        pose_landmarks = (
+            [Landmark(*row) for row in pose_array.tolist()]
+            if pose_array is not None else None
+        )
         face_landmarks = self._convert_landmarks(results.face_landmarks)
         left_hand_landmarks = self._convert_landmarks(results.left_hand_landmarks)
         right_hand_landmarks = self._convert_landmarks(results.right_hand_landmarks)
@@ -178,7 +206,8 @@ class HolisticProcessor:
             left_hand_landmarks=left_hand_landmarks,
             right_hand_landmarks=right_hand_landmarks,
             timestamp=start_time,
-            frame_number=self.frame_count
+            frame_number=self.frame_count,
+            pose_array=pose_array
         )
     
     def get_performance_stats(self) -> dict:
@@ -13,6 +13,8 @@ from typing import List, Dict, Optional
 from dataclasses import dataclass
 import math
 
+import numpy as np
+
 
 @dataclass
 class Landmark:
@@ -23,6 +25,31 @@ class Landmark:
     visibility: float  # Confidence 0.0-1.0
 
 
+def _one_euro_step(x, t_e, x_prev, dx_prev, min_cutoff, beta, d_cutoff):
+    """
+    One step of the One Euro recurrence.
+    
+    Works unchanged on Python floats (OneEuroFilter) and on NumPy arrays
+    (OneEuroFilterBank), so both filters share a single implementation.
+    
+    Returns:
+        Tuple of (x_hat, dx_hat)
+    """
+    # Calculate derivative (velocity) and smooth it
+    dx = (x - x_prev) / t_e
+    r_d = 2 * math.pi * d_cutoff * t_e
+    alpha_d = r_d / (r_d + 1)
+    dx_hat = alpha_d * dx + (1 - alpha_d) * dx_prev
+    
+    # Smooth the value with the adaptive cutoff frequency
+    cutoff = min_cutoff + beta * abs(dx_hat)
+    r = 2 * math.pi * cutoff * t_e
+    alpha = r / (r + 1)
+    x_hat = alpha * x + (1 - alpha) * x_prev
+    
+    return x_hat, dx_hat
+
+
 class OneEuroFilter:
     """
     One Euro Filter for a single scalar value.
@@ -98,19 +125,10 @@ class OneEuroFilter:
         if t_e <= 0:
             return self.x_prev
         
-        # Calculate derivative (velocity)
-        dx = (x - self.x_prev) / t_e
-        
-        # Smooth the derivative
-        alpha_d = self._smoothing_factor(t_e, self.d_cutoff)
-        dx_hat = alpha_d * dx + (1 - alpha_d) * self.dx_prev
-        
-        # Calculate adaptive cutoff frequency
-        cutoff = self.min_cutoff + self.beta * abs(dx_hat)
-        
-        # Smooth the value
-        alpha = self._smoothing_factor(t_e, cutoff)
-        x_hat = alpha * x + (1 - alpha) * self.x_prev
+        x_hat, dx_hat = _one_euro_step(
+            x, t_e, self.x_prev, self.dx_prev,
+            self.min_cutoff, self.beta, self.d_cutoff
+        )
         
         # Update state
         self.x_prev = x_hat
@@ -126,14 +144,110 @@ class OneEuroFilter:
         self.t_prev = None
 
 
+class OneEuroFilterBank:
+    """
+    One Euro Filter applied elementwise to an array of independent signals.
+    
+    Equivalent to one OneEuroFilter per element, but the recurrence runs as a
+    handful of NumPy operations over the whole array. State is float64 because
+    timestamps (seconds since epoch) do not fit float32 precision.
+    """
+    
+    def __init__(self, 
+                 freq: float,
+                 min_cutoff: float = 1.0,
+                 beta: float = 0.0,
+                 d_cutoff: float = 1.0):
+        self.freq = freq
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        
+        # Internal state, one entry per signal (grown lazily)
+        self.x_prev = np.zeros(0)
+        self.dx_prev = np.zeros(0)
+        self.t_prev = np.zeros(0)
+        self.initialized = np.zeros(0, dtype=bool)
+    
+    def __len__(self) -> int:
+        return self.x_prev.size
+    
+    def _ensure_size(self, n: int):
+        """Grow state arrays to hold at least n signals."""
+        extra = n - self.x_prev.size
+        if extra <= 0:
+            return
+        self.x_prev = np.concatenate([self.x_prev, np.zeros(extra)])
+        self.dx_prev = np.concatenate([self.dx_prev, np.zeros(extra)])
+        self.t_prev = np.concatenate([self.t_prev, np.zeros(extra)])
+        self.initialized = np.concatenate([self.initialized, np.zeros(extra, dtype=bool)])
+    
+    def copy_state(self, src: int, dst: int, n: int):
+        """Copy the state of signals [src, src + n) to [dst, dst + n)."""
+        self._ensure_size(dst + n)
+        for state in (self.x_prev, self.dx_prev, self.t_prev, self.initialized):
+            state[dst:dst + n] = state[src:src + n]
+    
+    def __call__(self, x: np.ndarray, t: float, index=None) -> np.ndarray:
+        """
+        Filter new values for a set of signals.
+        
+        Args:
+            x: 1-D array of new input values
+            t: Timestamp shared by all values
+            index: Signals to update (slice or integer array); defaults to
+                the first len(x) signals
+            
+        Returns:
+            Array of filtered values
+        """
+        if index is None:
+            index = slice(0, x.size)
+            self._ensure_size(x.size)
+        x_prev = self.x_prev[index]
+        dx_prev = self.dx_prev[index]
+        t_prev = self.t_prev[index]
+        initialized = self.initialized[index]
+        
+        # Signals seen before with time moving forward get the full update;
+        # first-seen signals pass through, stale timestamps hold x_prev
+        t_e = t - t_prev
+        active = initialized & (t_e > 0)
+        t_e = np.where(active, t_e, 1.0)
+        
+        x_hat, dx_hat = _one_euro_step(
+            x, t_e, x_prev, dx_prev,
+            self.min_cutoff, self.beta, self.d_cutoff
+        )
+        
+        out = np.where(active, x_hat, np.where(initialized, x_prev, x))
+        
+        # Update state
+        self.dx_prev[index] = np.where(active, dx_hat, np.where(initialized, dx_prev, 0.0))
+        self.t_prev[index] = np.where(active | ~initialized, t, t_prev)
+        self.x_prev[index] = out
+        self.initialized[index] = True
+        
+        return out
+    
+    def reset(self):
+        """Reset filter state (signal count is kept)."""
+        self.initialized[:] = False
+
+
 class SignalSmoother:
     """
     Applies One Euro Filter to landmark coordinates to reduce jitter.
     
-    Maintains separate filter instances for each landmark's x, y, z coordinates.
-    Uses lazy initialization to create filters only for detected landmarks.
+    All landmark types share one OneEuroFilterBank. Each type owns a region
+    of it starting at a fixed base offset, with landmark i's x, y, z at
+    base + 3*i + (0, 1, 2), so every type present in a frame is filtered in
+    a single vectorized pass. Regions grow lazily to fit detected landmarks.
     """
     
+    # Initial region sizes in landmarks (MediaPipe Holistic with refined face)
+    DEFAULT_CAPACITY = {'pose': 33, 'face': 478, 'left_hand': 21, 'right_hand': 21}
+    
     def __init__(self, 
                  freq: float = 30.0,
                  min_cutoff: float = 1.0,
@@ -153,77 +267,109 @@ class SignalSmoother:
         self.beta = beta
         self.d_cutoff = d_cutoff
         
-        # Dictionary to store filters: {(landmark_type, index, coord): OneEuroFilter}
+        # Shared filter state for every landmark coordinate
+        self.filter_bank = OneEuroFilterBank(
+            freq=freq,
+            min_cutoff=min_cutoff,
+            beta=beta,
+            d_cutoff=d_cutoff
+        )
+        
+        # Bank regions: {landmark_type: (base_offset, capacity)} in coordinates
         # landmark_type: 'pose', 'face', 'left_hand', 'right_hand'
-        # index: landmark index (0-32 for pose, 0-467 for face, etc.)
-        # coord: 'x', 'y', or 'z'
-        self.filters: Dict[tuple, OneEuroFilter] = {}
+        self._regions: Dict[str, tuple] = {}
+        # Coordinates seen so far per landmark type (one filter each)
+        self._filter_counts: Dict[str, int] = {}
+        # Bank indices for each combination of (landmark_type, n_coords)
+        self._index_cache: Dict[tuple, np.ndarray] = {}
         
         print(f"✅ SignalSmoother initialized (freq={freq}Hz, min_cutoff={min_cutoff}, beta={beta})")
     
-    def _get_filter(self, landmark_type: str, index: int, coord: str) -> OneEuroFilter:
+    def _get_region(self, landmark_type: str, n_coords: int) -> int:
         """
-        Get or create a filter for a specific landmark coordinate.
+        Get the base offset of a landmark type's bank region, growing it if needed.
         
         Args:
             landmark_type: Type of landmark ('pose', 'face', 'left_hand', 'right_hand')
-            index: Landmark index
-            coord: Coordinate ('x', 'y', 'z')
+            n_coords: Number of coordinates to filter (3 per landmark)
             
         Returns:
-            OneEuroFilter instance
+            Base offset into the filter bank
         """
-        key = (landmark_type, index, coord)
+        region = self._regions.get(landmark_type)
+        
+        if region is None or n_coords > region[1]:
+            # New regions go at the end of the bank; a grown region keeps
+            # the filter state of the coordinates it already had
+            base = len(self.filter_bank)
+            capacity = max(n_coords, self.DEFAULT_CAPACITY.get(landmark_type, 0) * 3)
+            self.filter_bank._ensure_size(base + capacity)
+            if region is not None:
+                self.filter_bank.copy_state(region[0], base, region[1])
+                self._index_cache.clear()
+            self._regions[landmark_type] = (base, capacity)
+            region = self._regions[landmark_type]
         
-        if key not in self.filters:
-            self.filters[key] = OneEuroFilter(
-                freq=self.freq,
-                min_cutoff=self.min_cutoff,
-                beta=self.beta,
-                d_cutoff=self.d_cutoff
-            )
+        if n_coords > self._filter_counts.get(landmark_type, 0):
+            self._filter_counts[landmark_type] = n_coords
         
-        return self.filters[key]
+        return region[0]
     
-    def _smooth_landmark_list(self, 
-                              landmarks: Optional[List[Landmark]], 
-                              landmark_type: str,
-                              timestamp: float) -> Optional[List[Landmark]]:
+    def _smooth_arrays(self, arrays: List[tuple], timestamp: float) -> List[np.ndarray]:
         """
-        Smooth a list of landmarks.
+        Smooth several (N, 4) landmark arrays in one filter bank pass.
         
         Args:
-            landmarks: List of landmarks to smooth
-            landmark_type: Type of landmark for filter key
+            arrays: List of (landmark_type, array) pairs
             timestamp: Current timestamp
             
         Returns:
-            List of smoothed landmarks or None if input is None
+            New (N, 4) arrays with smoothed x, y, z (visibility is not smoothed)
+        """
+        if not arrays:
+            return []
+        
+        key = tuple((landmark_type, array.shape[0] * 3) for landmark_type, array in arrays)
+        index = self._index_cache.get(key)
+        if index is None:
+            bases = [self._get_region(landmark_type, n) for landmark_type, n in key]
+            index = np.concatenate([np.arange(base, base + n) for base, (_, n) in zip(bases, key)])
+            self._index_cache[key] = index
+        
+        # Filter [x0, y0, z0, x1, y1, z1, ...] of every array in one pass
+        coords = np.concatenate([array[:, :3].ravel() for _, array in arrays])
+        smoothed_coords = self.filter_bank(coords, timestamp, index)
+        
+        results = []
+        start = 0
+        for _, array in arrays:
+            smoothed = array.copy()
+            end = start + array.shape[0] * 3
+            smoothed[:, :3] = smoothed_coords[start:end].reshape(-1, 3)
+            results.append(smoothed)
+            start = end
+        return results
+    
+    def smooth_array(self, 
+                     landmarks: Optional[np.ndarray], 
+                     landmark_type: str,
+                     timestamp: float) -> Optional[np.ndarray]:
+        """
+        Smooth landmarks held as an (N, 4) array of x, y, z, visibility rows.
+        
+        Args:
+            landmarks: Landmark array to smooth
+            landmark_type: Type of landmark for bank region lookup
+            timestamp: Current timestamp
+            
+        Returns:
+            New (N, 4) array with smoothed x, y, z (visibility is not smoothed),
+            or None if input is None
         """
         if landmarks is None:
             return None
         
-        smoothed = []
-        for i, lm in enumerate(landmarks):
-            # Get filters for this landmark's coordinates
-            filter_x = self._get_filter(landmark_type, i, 'x')
-            filter_y = self._get_filter(landmark_type, i, 'y')
-            filter_z = self._get_filter(landmark_type, i, 'z')
-            
-            # Apply filtering
-            smoothed_x = filter_x(lm.x, timestamp)
-            smoothed_y = filter_y(lm.y, timestamp)
-            smoothed_z = filter_z(lm.z, timestamp)
-            
-            # Create smoothed landmark
-            smoothed.append(Landmark(
-                x=smoothed_x,
-                y=smoothed_y,
-                z=smoothed_z,
-                visibility=lm.visibility  # Don't smooth visibility
-            ))
-        
-        return smoothed
+        return self._smooth_arrays([(landmark_type, landmarks)], timestamp)[0]
     
     def smooth_landmarks(self, 
                         pose_landmarks: Optional[List[Landmark]],
@@ -244,17 +390,29 @@ class SignalSmoother:
         Returns:
             Tuple of (smoothed_pose, smoothed_face, smoothed_left_hand, smoothed_right_hand)
         """
-        smoothed_pose = self._smooth_landmark_list(pose_landmarks, 'pose', timestamp)
-        smoothed_face = self._smooth_landmark_list(face_landmarks, 'face', timestamp)
-        smoothed_left_hand = self._smooth_landmark_list(left_hand_landmarks, 'left_hand', timestamp)
-        smoothed_right_hand = self._smooth_landmark_list(right_hand_landmarks, 'right_hand', timestamp)
+        inputs = (
+            ('pose', pose_landmarks),
+            ('face', face_landmarks),
+            ('left_hand', left_hand_landmarks),
+            ('right_hand', right_hand_landmarks),
+        )
+        present = [
+            (landmark_type, np.array(
+                [(lm.x, lm.y, lm.z, lm.visibility) for lm in landmarks], dtype=np.float64
+            ).reshape(-1, 4))
+            for landmark_type, landmarks in inputs if landmarks is not None
+        ]
+        smoothed = iter(self._smooth_arrays(present, timestamp))
         
-        return smoothed_pose, smoothed_face, smoothed_left_hand, smoothed_right_hand
+        return tuple(
+            [Landmark(x=x, y=y, z=z, visibility=v) for x, y, z, v in next(smoothed).tolist()]
+            if landmarks is not None else None
+            for _, landmarks in inputs
+        )
     
     def reset(self):
         """Reset all filter states."""
-        for filter_obj in self.filters.values():
-            filter_obj.reset()
+        self.filter_bank.reset()
         print("✅ SignalSmoother filters reset")
     
     def get_filter_count(self) -> int:
@@ -262,9 +420,9 @@ class SignalSmoother:
         Get the number of active filters.
         
         Returns:
-            Number of filter instances created
+            Number of filtered coordinates (one per landmark x, y, z)
         """
-        return len(self.filters)
+        return sum(self._filter_counts.values())
     
     def get_stats(self) -> dict:
         """
@@ -274,7 +432,7 @@ class SignalSmoother:
             Dictionary with filter statistics
         """
         return {
-            "total_filters": len(self.filters),
+            "total_filters": self.get_filter_count(),
             "freq": self.freq,
             "min_cutoff": self.min_cutoff,
             "beta": self.beta,
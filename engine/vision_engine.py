@@ -1,14 +1,21 @@
 import numpy as np
 from collections import deque
+import operator
 import time
 
 # Import our advanced vision components (Task 1-6)
 from engine.holistic_processor import HolisticProcessor
 from engine.signal_smoother import SignalSmoother
 from engine.analyzers.posture_analyzer import PostureAnalyzer
+from engine.analyzers.landmarks import as_array
 from engine.analyzers.stress_analyzer import StressAnalyzer
 from engine.analyzers.integrity_checker import IntegrityChecker
 
+# (x, y) accessors for the two landmark shapes the legacy path accepts
+_ATTR_XY = operator.attrgetter('x', 'y')
+_ITEM_XY = operator.itemgetter('x', 'y')
+_ROW_XY = operator.itemgetter(0, 1)
+
 class VisionEngine:
     def __init__(self):
         # Legacy tracking for backward compatibility
@@ -30,14 +37,55 @@ class VisionEngine:
         self.integrity_checker = IntegrityChecker()  # Task 6: Integrity checking
         self.frame_count = 0
         self.last_valid_metrics = None  # Cache last valid result
+        # Two reused (metrics, drawing landmarks) buffers: each frame fills the one
+        # that is not last_valid_metrics, so a failed update never touches it
+        self._metric_buffers = [(self._new_metrics_template(), []),
+                                (self._new_metrics_template(), [])]
+        self._write_buffer = 0
+        self._analyze_impls = {}  # (input type, ndim) -> bound analysis method
         print("✅ Advanced Vision System Ready!") 
 
-    def get_distance(self, p1, p2):
-        """Euclidean distance between two landmarks."""
-        def get_c(p, axis):
-            return p[axis] if isinstance(p, dict) else getattr(p, axis)
-        return float(np.sqrt((get_c(p1, 'x') - get_c(p2, 'x'))**2 + 
-                       (get_c(p1, 'y') - get_c(p2, 'y'))**2))
+    def _new_metrics_template(self):
+        """
+        Build the nested holistic metrics dict that is reused across frames.
+        
+        _analyze_holistic alternates between two of these and overwrites the
+        values in place, so a returned result is reused two frames later;
+        callers that keep it longer must copy it.
+        """
+        metrics = self._get_default_metrics(0.0)
+        metrics["pose_landmarks_for_drawing"] = None
+        metrics["mode"] = "holistic"
+        return metrics
+
+    def _update_drawing_landmarks(self, pose, drawing):
+        """Refresh the reused per-landmark dicts sent to the frontend."""
+        if pose is None or len(pose) == 0:
+            return None
+        
+        if len(drawing) != len(pose):
+            drawing[:] = [{} for _ in range(len(pose))]
+        
+        for d, (x, y, z, visibility) in zip(drawing, pose.tolist()):
+            d["x"] = x
+            d["y"] = y
+            d["z"] = z
+            d["visibility"] = visibility
+        return drawing
+
+    def get_distance(self, p1, p2, xy=None):
+        """
+        Euclidean distance between two landmarks.
+        
+        Args:
+            p1, p2: Landmarks as dicts or objects with x/y attributes
+            xy: Optional (x, y) accessor; picked from p1's type when omitted
+        """
+        if xy is None:
+            xy = _ITEM_XY if isinstance(p1, dict) else _ATTR_XY
+        x1, y1 = xy(p1)
+        x2, y2 = xy(p2)
+        return float(np.sqrt((x1 - x2)**2 + (y1 - y2)**2))
 
     def detect_head_gesture(self):
         """
@@ -47,26 +95,20 @@ class VisionEngine:
         if len(self.gesture_history) < 10:
             return "neutral"
 
-        # Extract X and Y movements
-        x_movements = [p[0] for p in self.gesture_history]
-        y_movements = [p[1] for p in self.gesture_history]
-
-        # Calculate the range of motion (Max - Min)
-        x_range = max(x_movements) - min(x_movements)
-        y_range = max(y_movements) - min(y_movements)
+        # Range of motion (Max - Min) per axis: [x_range, y_range]
+        ranges = np.ptp(np.asarray(self.gesture_history), axis=0)
 
         # Thresholds (tuned for normalized coordinates 0.0-1.0)
         # You might need to tweak these based on camera sensitivity
         MOVEMENT_THRESHOLD = 0.03 
         DOMINANCE_RATIO = 1.5 # One axis must move much more than the other
 
-        # Detect Nodding (Vertical movement dominates)
-        if y_range > MOVEMENT_THRESHOLD and y_range > (x_range * DOMINANCE_RATIO):
-            return "nodding"
-        
-        # Detect Shaking (Horizontal movement dominates)
-        if x_range > MOVEMENT_THRESHOLD and x_range > (y_range * DOMINANCE_RATIO):
-            return "shaking"
+        # Only the axis that moved most can dominate the other:
+        # horizontal dominance is shaking (No), vertical is nodding (Yes)
+        axis = int(np.argmax(ranges))
+        dominant = ranges[axis]
+        if dominant > MOVEMENT_THRESHOLD and dominant > ranges[1 - axis] * DOMINANCE_RATIO:
+            return ("shaking", "nodding")[axis]
 
         return "neutral"
 
@@ -76,27 +118,53 @@ class VisionEngine:
         
         Can accept either:
         - landmarks dict (legacy mode - face only)
-        - raw frame (new mode - full body holistic analysis)
+        - (N, 2) or (N, 3) landmark array of x, y[, z] rows (legacy mode - face only)
+        - (H, W, 3) BGR frame (new mode - full body holistic analysis)
+        
+        Other array shapes (e.g. a grayscale (H, W) frame) raise ValueError.
+        
+        The input is only read, never modified, so callers may pass the same
+        read-only frame on every call.
         
         Args:
             landmarks_or_frame: Either MediaPipe landmarks or raw video frame
             is_speaking: Whether user is currently speaking (for stress analysis)
             speech_onset: Whether user just started speaking (for integrity checking)
         """
-        # Detect if we're getting a raw frame or landmarks
-        is_raw_frame = isinstance(landmarks_or_frame, np.ndarray)
+        # Single wall-clock timestamp per frame, shared by every analyzer and
+        # reported as the payload's epoch-seconds "timestamp"
+        timestamp = time.time()
         
-        if is_raw_frame:
-            # NEW MODE: Full holistic analysis with posture, stress, and integrity
-            return self._analyze_holistic(landmarks_or_frame, is_speaking, speech_onset)
-        else:
-            # LEGACY MODE: Face-only analysis
-            return self._analyze_legacy(landmarks_or_frame)
+        # Input kind -> analysis method, resolved once per kind of input
+        shape = getattr(landmarks_or_frame, 'shape', None)
+        key = (type(landmarks_or_frame), shape and (len(shape), shape[-1]))
+        impl = self._analyze_impls.get(key)
+        if impl is None:
+            impl = self._analyze_impls[key] = self._select_analyzer(landmarks_or_frame)
+        return impl(landmarks_or_frame, is_speaking, speech_onset, timestamp)
     
-    def _analyze_holistic(self, frame, is_speaking=False, speech_onset=False):
+    def _select_analyzer(self, landmarks_or_frame):
+        """Pick the analysis method for an input: holistic for raw frames, legacy otherwise."""
+        if isinstance(landmarks_or_frame, np.ndarray):
+            shape = landmarks_or_frame.shape
+            if len(shape) == 3 and shape[-1] == 3:
+                # NEW MODE: Full holistic analysis with posture, stress, and integrity
+                return self._analyze_holistic
+            if len(shape) == 2 and shape[-1] in (2, 3):
+                # LEGACY MODE: landmark rows of x, y[, z]
+                return self._analyze_legacy
+            raise ValueError(
+                f"Unsupported array shape {shape}: expected an (H, W, 3) BGR frame "
+                f"or (N, 2|3) landmark rows"
+            )
+        # LEGACY MODE: Face-only analysis
+        return self._analyze_legacy
+    
+    def _analyze_holistic(self, frame, is_speaking=False, speech_onset=False, timestamp=None):
         """NEW: Full-body holistic analysis with posture, stress, and integrity detection."""
         self.frame_count += 1
-        timestamp = time.time()
+        if timestamp is None:
+            timestamp = time.time()
         
         try:
             # Process frame with MediaPipe Holistic
@@ -106,12 +174,16 @@ class VisionEngine:
                 # No pose detected - return last valid metrics if available
                 if self.last_valid_metrics:
                     return self.last_valid_metrics
-                return self._get_default_metrics()
+                return self._get_default_metrics(timestamp)
             
-            # Smooth ALL landmarks (pose, face, hands)
-            smoothed_pose, smoothed_face, smoothed_left_hand, smoothed_right_hand = \
+            # Smooth pose as an (N, 4) array; face and hands as landmark lists
+            pose_array = holistic_results.pose_array
+            if pose_array is None:
+                pose_array = as_array(holistic_results.pose_landmarks)
+            smoothed_pose = self.signal_smoother.smooth_array(pose_array, 'pose', timestamp)
+            _, smoothed_face, smoothed_left_hand, smoothed_right_hand = \
                 self.signal_smoother.smooth_landmarks(
-                    holistic_results.pose_landmarks,
+                    None,
                     holistic_results.face_landmarks,
                     holistic_results.left_hand_landmarks,
                     holistic_results.right_hand_landmarks,
@@ -124,126 +196,130 @@ class VisionEngine:
             # Analyze stress signals (Task 5) - needs face landmarks
             stress_metrics = None
             if smoothed_face:
-                stress_metrics = self.stress_analyzer.analyze(smoothed_face, is_speaking)
+                stress_metrics = self.stress_analyzer.analyze(smoothed_face, is_speaking, timestamp)
             elif holistic_results.face_landmarks:
                 # Fallback to unsmoothed if smoothing failed
-                stress_metrics = self.stress_analyzer.analyze(holistic_results.face_landmarks, is_speaking)
+                stress_metrics = self.stress_analyzer.analyze(holistic_results.face_landmarks, is_speaking, timestamp)
             else:
                 # No face landmarks - use default stress metrics
-                stress_metrics = self.stress_analyzer.analyze(None, is_speaking)
+                stress_metrics = self.stress_analyzer.analyze(None, is_speaking, timestamp)
             
             # Analyze integrity (Task 6) - needs face landmarks
             integrity_metrics = None
             if smoothed_face:
-                integrity_metrics = self.integrity_checker.analyze(smoothed_face, speech_onset)
+                integrity_metrics = self.integrity_checker.analyze(smoothed_face, speech_onset, timestamp)
             elif holistic_results.face_landmarks:
                 # Fallback to unsmoothed if smoothing failed
-                integrity_metrics = self.integrity_checker.analyze(holistic_results.face_landmarks, speech_onset)
+                integrity_metrics = self.integrity_checker.analyze(holistic_results.face_landmarks, speech_onset, timestamp)
             else:
                 # No face landmarks - use default integrity metrics
-                integrity_metrics = self.integrity_checker.analyze(None, speech_onset)
+                integrity_metrics = self.integrity_checker.analyze(None, speech_onset, timestamp)
             
             # Legacy face analysis (if face landmarks available)
             legacy_metrics = {}
             if smoothed_face:
-                # Convert smoothed landmarks to dict format for legacy code
-                face_landmarks_dict = [
-                    {'x': lm.x, 'y': lm.y, 'z': lm.z} 
-                    for lm in smoothed_face
-                ]
-                legacy_metrics = self._analyze_legacy(face_landmarks_dict)
+                # Legacy code reads attribute-style landmarks directly
+                legacy_metrics = self._analyze_legacy(smoothed_face)
             elif holistic_results.face_landmarks:
                 # Fallback to unsmoothed if smoothing failed
                 legacy_metrics = self._analyze_legacy(holistic_results.face_landmarks)
             
-            # Combine all metrics
-            combined_metrics = {
-                # Legacy metrics (backward compatible)
-                "eye_contact_score": legacy_metrics.get("eye_contact_score", 0.5),
-                "fidget_score": legacy_metrics.get("fidget_score", 0.0),
-                "head_gesture": legacy_metrics.get("head_gesture", "neutral"),
-                "is_smiling": legacy_metrics.get("is_smiling", False),
-                "is_stressed": stress_metrics.stress_level in ["moderate", "high"] if stress_metrics else False,
-                "stress_detected": stress_metrics.high_cognitive_load if stress_metrics else False,
-                
-                # NEW: Posture metrics (Task 3)
-                "posture": {
-                    "shoulder_angle": posture_metrics.shoulder_angle,
-                    "is_leaning": posture_metrics.is_leaning,
-                    "is_slouching": posture_metrics.is_slouching,
-                    "slouch_score": posture_metrics.slouch_score,
-                    "arms_crossed": posture_metrics.arms_crossed,
-                    "rocking_score": posture_metrics.rocking_score,
-                    "shoulder_stability": posture_metrics.shoulder_stability,
-                },
-                
-                # NEW: Stress metrics (Task 5)
-                "stress": {
-                    "blink_rate": stress_metrics.blink_rate if stress_metrics else 0.0,
-                    "blink_count": stress_metrics.blink_count if stress_metrics else 0,
-                    "high_cognitive_load": stress_metrics.high_cognitive_load if stress_metrics else False,
-                    "lip_pursing": stress_metrics.lip_pursing if stress_metrics else False,
-                    "lip_purse_duration": stress_metrics.lip_purse_duration if stress_metrics else 0.0,
-                    "stress_level": stress_metrics.stress_level if stress_metrics else "low",
-                    "left_ear": stress_metrics.left_ear if stress_metrics else 0.5,
-                    "right_ear": stress_metrics.right_ear if stress_metrics else 0.5,
-                    "average_ear": stress_metrics.average_ear if stress_metrics else 0.5,
-                } if stress_metrics else self._get_default_stress_metrics(),
-                
-                # NEW: Integrity metrics (Task 6)
-                "integrity": {
-                    "gaze_x": integrity_metrics.gaze_x if integrity_metrics else 0.5,
-                    "gaze_y": integrity_metrics.gaze_y if integrity_metrics else 0.5,
-                    "gaze_cluster_id": integrity_metrics.gaze_cluster_id if integrity_metrics else None,
-                    "cheat_flag_count": integrity_metrics.cheat_flag_count if integrity_metrics else 0,
-                    "integrity_warning": integrity_metrics.integrity_warning if integrity_metrics else False,
-                    "integrity_score": integrity_metrics.integrity_score if integrity_metrics else 1.0,
-                    "suspicious_segments": integrity_metrics.suspicious_segments if integrity_metrics else [],
-                } if integrity_metrics else self._get_default_integrity_metrics(),
-                
-                # NEW: Pose landmarks for frontend visualization
-                "pose_landmarks_for_drawing": [
-                    {"x": lm.x, "y": lm.y, "z": lm.z, "visibility": lm.visibility}
-                    for lm in smoothed_pose
-                ] if smoothed_pose else None,
-                
-                # Meta
-                "frame_number": self.frame_count,
-                "timestamp": timestamp,
-                "mode": "holistic"
-            }
+            # Fill the spare metrics buffer in place (see _new_metrics_template)
+            m, drawing = self._metric_buffers[self._write_buffer]
+            
+            # Legacy metrics (backward compatible)
+            m["eye_contact_score"] = legacy_metrics.get("eye_contact_score", 0.5)
+            m["fidget_score"] = legacy_metrics.get("fidget_score", 0.0)
+            m["head_gesture"] = legacy_metrics.get("head_gesture", "neutral")
+            m["is_smiling"] = legacy_metrics.get("is_smiling", False)
+            m["is_stressed"] = stress_metrics.stress_level in ["moderate", "high"] if stress_metrics else False
+            m["stress_detected"] = stress_metrics.high_cognitive_load if stress_metrics else False
+            
+            # NEW: Posture metrics (Task 3)
+            posture = m["posture"]
+            posture["shoulder_angle"] = posture_metrics.shoulder_angle
+            posture["is_leaning"] = posture_metrics.is_leaning
+            posture["is_slouching"] = posture_metrics.is_slouching
+            posture["slouch_score"] = posture_metrics.slouch_score
+            posture["arms_crossed"] = posture_metrics.arms_crossed
+            posture["rocking_score"] = posture_metrics.rocking_score
+            posture["shoulder_stability"] = posture_metrics.shoulder_stability
+            
+            # NEW: Stress metrics (Task 5)
+            stress = m["stress"]
+            if stress_metrics:
+                stress["blink_rate"] = stress_metrics.blink_rate
+                stress["blink_count"] = stress_metrics.blink_count
+                stress["high_cognitive_load"] = stress_metrics.high_cognitive_load
+                stress["lip_pursing"] = stress_metrics.lip_pursing
+                stress["lip_purse_duration"] = stress_metrics.lip_purse_duration
+                stress["stress_level"] = stress_metrics.stress_level
+                stress["left_ear"] = stress_metrics.left_ear
+                stress["right_ear"] = stress_metrics.right_ear
+                stress["average_ear"] = stress_metrics.average_ear
+            else:
+                stress.update(self._get_default_stress_metrics())
+            
+            # NEW: Integrity metrics (Task 6)
+            integrity = m["integrity"]
+            if integrity_metrics:
+                integrity["gaze_x"] = integrity_metrics.gaze_x
+                integrity["gaze_y"] = integrity_metrics.gaze_y
+                integrity["gaze_cluster_id"] = integrity_metrics.gaze_cluster_id
+                integrity["cheat_flag_count"] = integrity_metrics.cheat_flag_count
+                integrity["integrity_warning"] = integrity_metrics.integrity_warning
+                integrity["integrity_score"] = integrity_metrics.integrity_score
+                integrity["suspicious_segments"] = integrity_metrics.suspicious_segments
+            else:
+                integrity.update(self._get_default_integrity_metrics())
             
-            # Cache this as last valid result
-            self.last_valid_metrics = combined_metrics
-            return combined_metrics
+            # NEW: Pose landmarks for frontend visualization
+            m["pose_landmarks_for_drawing"] = self._update_drawing_landmarks(smoothed_pose, drawing)
+            
+            # Meta
+            m["frame_number"] = self.frame_count
+            m["timestamp"] = timestamp
+            
+            # Cache this as last valid result; the next frame fills the other buffer
+            self.last_valid_metrics = m
+            self._write_buffer ^= 1
+            return m
             
         except Exception as e:
             print(f"⚠️ Holistic analysis error: {e}")
             # Return last valid metrics if available, otherwise defaults
             if self.last_valid_metrics:
                 return self.last_valid_metrics
-            return self._get_default_metrics()
+            return self._get_default_metrics(timestamp)
     
-    def _analyze_legacy(self, landmarks):
-        """LEGACY: Original face-only analysis for backward compatibility."""
-        def get_coord(lm, axis):
-            if isinstance(lm, dict): return lm[axis]
-            return getattr(lm, axis)
-
+    def _analyze_legacy(self, landmarks, is_speaking=False, speech_onset=False, timestamp=None):
+        """
+        LEGACY: Original face-only analysis for backward compatibility.
+        
+        Takes the same arguments as _analyze_holistic so analyze_frame can
+        dispatch to either; the speech flags and timestamp are unused.
+        """
         try:
+            # Landmarks within one call share a type, so pick the accessor once
+            if isinstance(landmarks, np.ndarray):
+                xy = _ROW_XY
+            elif isinstance(landmarks[0], dict):
+                xy = _ITEM_XY
+            else:
+                xy = _ATTR_XY
+
             # --- 1. Eye Contact Analysis (Existing) ---
-            left_inner_x = get_coord(landmarks[33], 'x')
-            left_outer_x = get_coord(landmarks[133], 'x')
+            left_inner_x = xy(landmarks[33])[0]
+            left_outer_x = xy(landmarks[133])[0]
             eye_width = abs(left_inner_x - left_outer_x)
             if eye_width < 0.001: eye_width = 0.1 
 
-            left_iris_x = get_coord(landmarks[468], 'x')
+            left_iris_x = xy(landmarks[468])[0]
             eye_center_dist = abs(left_iris_x - ((left_inner_x + left_outer_x) / 2))
             eye_contact_score = float(round(max(0, 1.0 - (eye_center_dist / eye_width)), 2))
 
             # --- 2. Fidget Score & Gesture Tracking ---
-            nose = landmarks[1]
-            nose_x, nose_y = get_coord(nose, 'x'), get_coord(nose, 'y')
+            nose_x, nose_y = xy(landmarks[1])
             
             self.nose_history.append((nose_x, nose_y))
             self.gesture_history.append((nose_x, nose_y))
@@ -257,14 +333,14 @@ class VisionEngine:
             head_gesture = self.detect_head_gesture()
 
             # --- 3. Stress Proxy (Brow Distance) (Existing) ---
-            brow_dist = self.get_distance(landmarks[55], landmarks[285])
+            brow_dist = self.get_distance(landmarks[55], landmarks[285], xy)
             is_stressed = bool(brow_dist < 0.05) # Furrowed brows
 
             # --- 4. Emotion Detection (Smile) ---
             # Mouth corners: 61 (left), 291 (right)
             # Reference: Eye corners 33 and 263 to normalize for face distance
-            mouth_width = self.get_distance(landmarks[61], landmarks[291])
-            face_width = self.get_distance(landmarks[33], landmarks[263])
+            mouth_width = self.get_distance(landmarks[61], landmarks[291], xy)
+            face_width = self.get_distance(landmarks[33], landmarks[263], xy)
             
             # Ratio of mouth width to face width
             # Normal resting ratio is usually around 0.35 - 0.45
@@ -319,7 +395,7 @@ class VisionEngine:
             "suspicious_segments": [],
         }
     
-    def _get_default_metrics(self):
+    def _get_default_metrics(self, timestamp=None):
         """Return default metrics when no detection is possible."""
         return {
             "eye_contact_score": 0.5,
@@ -340,7 +416,7 @@ class VisionEngine:
             "stress": self._get_default_stress_metrics(),
             "integrity": self._get_default_integrity_metrics(),
             "frame_number": self.frame_count,
-            "timestamp": time.time(),
+            "timestamp": timestamp if timestamp is not None else time.time(),
             "mode": "default"
         }
     
@@ -364,7 +440,7 @@ class VisionEngine:
         if hasattr(self, 'stress_analyzer'):
             summary["stress"] = self.stress_analyzer.get_session_summary()
         
-        # Add integrity report
+        # Add integrity report (IntegrityChecker caches it between analyses)
         if hasattr(self, 'integrity_checker'):
             integrity_report = self.integrity_checker.get_session_report()
             summary["integrity"] = {
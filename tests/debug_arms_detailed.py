@@ -6,11 +6,42 @@ Shows exact landmark positions and detection logic step-by-step.
 import cv2
 import time
 import math
+import threading
+from functools import lru_cache
+import numpy as np
 from engine.holistic_processor import HolisticProcessor
 from engine.signal_smoother import SignalSmoother
+from engine.frame_capture import LatestFrameSlot, capture_frames
 from engine.analyzers.posture_analyzer import PostureAnalyzer, Landmark
 
 
+@lru_cache(maxsize=1024)
+def _render_text_mask(text, scale, thickness):
+    """Rasterize text once into an alpha mask (cached across frames)."""
+    (tw, th), baseline = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, scale, thickness)
+    canvas = np.zeros((th + baseline + thickness, tw + thickness), dtype=np.uint8)
+    cv2.putText(canvas, text, (0, th), cv2.FONT_HERSHEY_SIMPLEX, scale, 255, thickness)
+    ys, xs = np.nonzero(canvas)
+    alpha = (canvas[ys, xs].astype(np.float32) / 255.0)[:, None]
+    return ys, xs, alpha, th
+
+
+def put_text_cached(frame, text, org, scale, color, thickness):
+    """Blend a cached text mask at org (bottom-left of the text, like cv2.putText)."""
+    ys, xs, alpha, th = _render_text_mask(text, scale, thickness)
+    ys = ys + (org[1] - th)
+    xs = xs + org[0]
+    
+    # Clip to frame bounds
+    h, w = frame.shape[:2]
+    inside = (ys >= 0) & (ys < h) & (xs >= 0) & (xs < w)
+    if not inside.all():
+        ys, xs, alpha = ys[inside], xs[inside], alpha[inside]
+    
+    pixels = frame[ys, xs].astype(np.float32)
+    frame[ys, xs] = (pixels + (np.asarray(color, np.float32) - pixels) * alpha + 0.5).astype(np.uint8)
+
+
 def draw_debug_info(frame, pose_landmarks, arms_crossed, debug_data):
     """Draw detailed debug information on frame."""
     h, w = frame.shape[:2]
@@ -33,39 +64,40 @@ def draw_debug_info(frame, pose_landmarks, arms_crossed, debug_data):
     lh = pose_landmarks[LEFT_HIP]
     rh = pose_landmarks[RIGHT_HIP]
     
-    # Draw shoulder line
-    cv2.line(frame, 
-             (int(ls.x * w), int(ls.y * h)),
-             (int(rs.x * w), int(rs.y * h)),
-             (0, 255, 0), 2)
-    
-    # Draw wrists
-    cv2.circle(frame, (int(lw.x * w), int(lw.y * h)), 10, (255, 0, 0), -1)
-    cv2.circle(frame, (int(rw.x * w), int(rw.y * h)), 10, (0, 0, 255), -1)
-    
-    # Draw shoulder center
+    # Shoulder center and torso box bounds (normalized)
     cx = (ls.x + rs.x) / 2.0
     cy = (ls.y + rs.y) / 2.0
-    cv2.circle(frame, (int(cx * w), int(cy * h)), 8, (255, 255, 0), -1)
-    
-    # Draw torso box
     min_sx = min(ls.x, rs.x)
     max_sx = max(ls.x, rs.x)
-    shoulder_y = cy
     hip_y = (lh.y + rh.y) / 2.0
     
-    cv2.rectangle(frame,
-                  (int(min_sx * w), int(shoulder_y * h)),
-                  (int(max_sx * w), int(hip_y * h)),
-                  (255, 255, 255), 1)
+    # All pixel coordinates in one conversion:
+    # shoulders, wrists, shoulder center, torso box corners
+    pts = (np.array([
+        [ls.x, ls.y], [rs.x, rs.y],
+        [lw.x, lw.y], [rw.x, rw.y],
+        [cx, cy],
+        [min_sx, cy], [max_sx, cy], [max_sx, hip_y], [min_sx, hip_y],
+    ]) * (w, h)).astype(np.int32)
+    
+    # Draw shoulder line
+    cv2.polylines(frame, [pts[0:2]], False, (0, 255, 0), 2)
+    
+    # Draw wrists and shoulder center
+    cv2.circle(frame, tuple(pts[2].tolist()), 10, (255, 0, 0), -1)
+    cv2.circle(frame, tuple(pts[3].tolist()), 10, (0, 0, 255), -1)
+    cv2.circle(frame, tuple(pts[4].tolist()), 8, (255, 255, 0), -1)
     
-    # Display debug data
+    # Draw torso box
+    cv2.polylines(frame, [pts[5:9]], True, (255, 255, 255), 1)
+    
+    # Display debug data (text masks are rendered once and reused)
     y_offset = 30
     line_height = 25
     
-    cv2.putText(frame, f"Arms: {'CROSSED' if arms_crossed else 'OPEN'}", 
-                (10, y_offset), cv2.FONT_HERSHEY_SIMPLEX, 0.8, 
-                (0, 0, 255) if arms_crossed else (0, 255, 0), 2)
+    put_text_cached(frame, f"Arms: {'CROSSED' if arms_crossed else 'OPEN'}", 
+                    (10, y_offset), 0.8, 
+                    (0, 0, 255) if arms_crossed else (0, 255, 0), 2)
     y_offset += line_height
     
     for key, value in debug_data.items():
@@ -76,11 +108,16 @@ def draw_debug_info(frame, pose_landmarks, arms_crossed, debug_data):
         else:
             text = f"{key}: {value}"
         
-        cv2.putText(frame, text, (10, y_offset), 
-                    cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 1)
+        put_text_cached(frame, text, (10, y_offset), 0.5, color, 1)
         y_offset += line_height
 
 
+# How long the UI loop waits for a frame before re-checking the capture
+# thread and the keyboard, and how long it tolerates no frames at all.
+FRAME_TIMEOUT = 0.1
+STALL_TIMEOUT = 5.0
+
+
 def detect_arms_with_debug(left_wrist, right_wrist, left_shoulder, right_shoulder, 
                            left_hip, right_hip):
     """Arms detection with detailed debug output."""
@@ -91,13 +128,10 @@ def detect_arms_with_debug(left_wrist, right_wrist, left_shoulder, right_shoulde
     debug_data['LW_vis'] = left_wrist.visibility
     debug_data['RW_vis'] = right_wrist.visibility
     
-    if (left_wrist.visibility < 0.5 or right_wrist.visibility < 0.5):
-        debug_data['CHECK_vis'] = False
-        return False, debug_data
+    vis_ok = (left_wrist.visibility >= 0.5) & (right_wrist.visibility >= 0.5)
+    debug_data['CHECK_vis'] = vis_ok
     
-    debug_data['CHECK_vis'] = True
-    
-    # Calculate body midline and dimensions
+    # Calculate body midline and dimensions (once, shared by all checks)
     shoulder_cx = (left_shoulder.x + right_shoulder.x) / 2.0
     shoulder_cy = (left_shoulder.y + right_shoulder.y) / 2.0
     shoulder_width = abs(right_shoulder.x - left_shoulder.x)
@@ -105,38 +139,42 @@ def detect_arms_with_debug(left_wrist, right_wrist, left_shoulder, right_shoulde
     # Torso vertical bounds
     hip_y = (left_hip.y + right_hip.y) / 2.0
     
+    # Squared distances between all key points in one broadcast:
+    # 0 lw, 1 rw, 2 ls, 3 rs, 4 lh, 5 rh, 6 shoulder center
+    pts = np.array([
+        [left_wrist.x, left_wrist.y], [right_wrist.x, right_wrist.y],
+        [left_shoulder.x, left_shoulder.y], [right_shoulder.x, right_shoulder.y],
+        [left_hip.x, left_hip.y], [right_hip.x, right_hip.y],
+        [shoulder_cx, shoulder_cy],
+    ])
+    diff = pts[:, None, :] - pts[None, :, :]
+    dist_sq = (diff * diff).sum(axis=-1)
+    
+    # Every check is evaluated and reported; none of them returns early
+    
     # Check 1: Wrists cross midline
     midline_tolerance = shoulder_width * 0.1
     lw_crosses = left_wrist.x > (shoulder_cx - midline_tolerance)
     rw_crosses = right_wrist.x < (shoulder_cx + midline_tolerance)
-    check1 = lw_crosses and rw_crosses
+    check1 = lw_crosses & rw_crosses
     
     debug_data['LW_x'] = left_wrist.x
     debug_data['RW_x'] = right_wrist.x
     debug_data['midline'] = shoulder_cx
     debug_data['CHECK_1_cross'] = check1
     
-    if not check1:
-        return False, debug_data
+    # Check 2: Wrists close together (squared distances, no sqrt)
+    wrist_dist_sq = float(dist_sq[0, 1])
+    max_dist = shoulder_width * 0.5
+    check2 = wrist_dist_sq < max_dist * max_dist
     
-    # Check 2: Wrists close together
-    wrist_distance = math.hypot(
-        left_wrist.x - right_wrist.x,
-        left_wrist.y - right_wrist.y
-    )
-    check2 = wrist_distance < (shoulder_width * 0.5)
-    
-    debug_data['wrist_dist'] = wrist_distance
-    debug_data['max_dist'] = shoulder_width * 0.5
+    debug_data['max_dist'] = max_dist
     debug_data['CHECK_2_close'] = check2
     
-    if not check2:
-        return False, debug_data
-    
     # Check 3: Wrists at torso height
     lw_at_torso = shoulder_cy < left_wrist.y < hip_y
     rw_at_torso = shoulder_cy < right_wrist.y < hip_y
-    check3 = lw_at_torso and rw_at_torso
+    check3 = lw_at_torso & rw_at_torso
     
     debug_data['LW_y'] = left_wrist.y
     debug_data['RW_y'] = right_wrist.y
@@ -144,21 +182,23 @@ def detect_arms_with_debug(left_wrist, right_wrist, left_shoulder, right_shoulde
     debug_data['hip_y'] = hip_y
     debug_data['CHECK_3_height'] = check3
     
-    if not check3:
-        return False, debug_data
-    
     # Check 4: Wrists in front
-    lw_dist_to_center = math.hypot(left_wrist.x - shoulder_cx, left_wrist.y - shoulder_cy)
-    rw_dist_to_center = math.hypot(right_wrist.x - shoulder_cx, right_wrist.y - shoulder_cy)
+    lw_center_dist_sq = float(dist_sq[0, 6])
+    rw_center_dist_sq = float(dist_sq[1, 6])
     max_distance = shoulder_width * 2.0
-    check4 = (lw_dist_to_center < max_distance and rw_dist_to_center < max_distance)
+    max_distance_sq = max_distance * max_distance
+    check4 = (lw_center_dist_sq < max_distance_sq) & (rw_center_dist_sq < max_distance_sq)
     
-    debug_data['LW_center_dist'] = lw_dist_to_center
-    debug_data['RW_center_dist'] = rw_dist_to_center
     debug_data['max_center_dist'] = max_distance
     debug_data['CHECK_4_front'] = check4
     
-    return check4, debug_data
+    # Actual distances are only needed for display
+    debug_data['wrist_dist'] = math.sqrt(wrist_dist_sq)
+    debug_data['LW_center_dist'] = math.sqrt(lw_center_dist_sq)
+    debug_data['RW_center_dist'] = math.sqrt(rw_center_dist_sq)
+    
+    arms_crossed = vis_ok & check1 & check2 & check3 & check4
+    return arms_crossed, debug_data
 
 
 def main():
@@ -187,10 +227,35 @@ def main():
     
     frame_count = 0
     
+    # Capture runs on its own thread; the slot keeps only the newest frame
+    frame_slot = LatestFrameSlot()
+    stop_event = threading.Event()
+    capture_thread = threading.Thread(
+        target=capture_frames, args=(cap, frame_slot, stop_event), daemon=True
+    )
+    # Monotonic, high-resolution timestamps relative to the session start
+    t0 = time.perf_counter()
+    capture_thread.start()
+    
     try:
+        last_frame_at = time.perf_counter()
         while True:
-            ret, frame = cap.read()
+            item = frame_slot.take(timeout=FRAME_TIMEOUT)
+            if item is None:
+                if not capture_thread.is_alive():
+                    print("\n❌ Capture thread stopped (camera disconnected?)")
+                    break
+                if time.perf_counter() - last_frame_at > STALL_TIMEOUT:
+                    print(f"\n❌ No frames from webcam for {STALL_TIMEOUT:.0f}s, exiting")
+                    break
+                # Keep the window responsive so 'q' still quits while waiting
+                if cv2.waitKey(1) & 0xFF == ord('q'):
+                    break
+                continue
+            ret, frame, captured_at = item
+            last_frame_at = captured_at
             if not ret:
+                print("\n❌ Webcam read failed (camera disconnected?)")
                 break
             
             frame_count += 1
@@ -205,7 +270,7 @@ def main():
                     results.face_landmarks,
                     results.left_hand_landmarks,
                     results.right_hand_landmarks,
-                    time.time()
+                    captured_at - t0
                 )
                 
                 pose = smoothed_pose
@@ -243,6 +308,8 @@ def main():
         print("\n⚠️ Interrupted by user")
     
     finally:
+        stop_event.set()
+        capture_thread.join(timeout=1.0)
         cap.release()
         cv2.destroyAllWindows()
         print("\n✅ Debug session completed")
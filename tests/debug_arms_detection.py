@@ -11,14 +11,13 @@ def _detect_arms_crossed(
     Robust arms-crossed detection using spatial relationships.
     """
 
-    # Visibility check
-    if (
-        left_wrist.visibility < 0.5 or
-        right_wrist.visibility < 0.5 or
-        left_shoulder.visibility < 0.5 or
-        right_shoulder.visibility < 0.5
-    ):
-        return False
+    # Visibility check (folded into the final condition, no early return)
+    vis_ok = (
+        (left_wrist.visibility >= 0.5) &
+        (right_wrist.visibility >= 0.5) &
+        (left_shoulder.visibility >= 0.5) &
+        (right_shoulder.visibility >= 0.5)
+    )
 
     # Shoulder center
     shoulder_cx = (left_shoulder.x + right_shoulder.x) / 2.0
@@ -27,35 +26,37 @@ def _detect_arms_crossed(
     # Hip Y (for vertical validation)
     hip_y = (left_hip.y + right_hip.y) / 2.0
 
-    # Distance helpers
-    def dist(a: Landmark, b: Landmark) -> float:
-        return math.hypot(a.x - b.x, a.y - b.y)
+    # Squared distance helper (only compared, so no sqrt needed)
+    def dist_sq(a: Landmark, b: Landmark) -> float:
+        dx = a.x - b.x
+        dy = a.y - b.y
+        return dx * dx + dy * dy
 
     # Distances to opposite shoulders (key signal)
-    lw_to_rs = dist(left_wrist, right_shoulder)
-    rw_to_ls = dist(right_wrist, left_shoulder)
+    lw_to_rs = dist_sq(left_wrist, right_shoulder)
+    rw_to_ls = dist_sq(right_wrist, left_shoulder)
 
     # Distances to same-side shoulders
-    lw_to_ls = dist(left_wrist, left_shoulder)
-    rw_to_rs = dist(right_wrist, right_shoulder)
+    lw_to_ls = dist_sq(left_wrist, left_shoulder)
+    rw_to_rs = dist_sq(right_wrist, right_shoulder)
 
-    # Wrists close to chest
-    lw_center_dist = math.hypot(left_wrist.x - shoulder_cx, left_wrist.y - shoulder_cy)
-    rw_center_dist = math.hypot(right_wrist.x - shoulder_cx, right_wrist.y - shoulder_cy)
+    # Wrists close to chest (within 0.25)
+    lw_cx, lw_cy = left_wrist.x - shoulder_cx, left_wrist.y - shoulder_cy
+    rw_cx, rw_cy = right_wrist.x - shoulder_cx, right_wrist.y - shoulder_cy
+    lw_center_dist_sq = lw_cx * lw_cx + lw_cy * lw_cy
+    rw_center_dist_sq = rw_cx * rw_cx + rw_cy * rw_cy
 
-    wrists_inward = (lw_center_dist < 0.25 and rw_center_dist < 0.25)
+    wrists_inward = (lw_center_dist_sq < 0.0625) & (rw_center_dist_sq < 0.0625)
 
     # Wrists above hips (prevents relaxed hand false positives)
-    wrists_up = (
-        left_wrist.y < hip_y and
-        right_wrist.y < hip_y
-    )
+    wrists_up = (left_wrist.y < hip_y) & (right_wrist.y < hip_y)
 
     # Core crossed-arm condition
     crossed = (
-        lw_to_rs < lw_to_ls and
-        rw_to_ls < rw_to_rs and
-        wrists_inward and
+        vis_ok &
+        (lw_to_rs < lw_to_ls) &
+        (rw_to_ls < rw_to_rs) &
+        wrists_inward &
         wrists_up
     )
 
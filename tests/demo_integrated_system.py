@@ -3,82 +3,96 @@ Demo: Show the integrated vision system with your Task 1-3 work.
 This demonstrates that your posture analyzer is now part of the main app.
 """
 
+import sys
 import numpy as np
 from engine.vision_engine import VisionEngine
 
-print("="*70)
-print("INTEGRATED VISION SYSTEM DEMO")
-print("="*70)
-print("\nThis demonstrates your Task 1-3 work integrated into the main app!")
-print()
+
+def emit(*lines):
+    """Write a block of lines to stdout in one buffered write."""
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
+
+
+def section(title):
+    """Section header lines (blank line, rule, title, rule)."""
+    return ("\n" + "="*70, title, "="*70)
+
+
+emit(
+    "="*70,
+    "INTEGRATED VISION SYSTEM DEMO",
+    "="*70,
+    "\nThis demonstrates your Task 1-3 work integrated into the main app!",
+    ""
+)
 
 # Initialize the vision engine (this loads YOUR components)
 print("Initializing Vision Engine...")
 vision = VisionEngine()
 
-print("\n" + "="*70)
-print("SYSTEM COMPONENTS LOADED:")
-print("="*70)
-print(f"✅ HolisticProcessor: {type(vision.holistic_processor).__name__}")
-print(f"✅ SignalSmoother: {type(vision.signal_smoother).__name__}")
-print(f"✅ PostureAnalyzer: {type(vision.posture_analyzer).__name__}")
-
-print("\n" + "="*70)
-print("POSTURE ANALYZER CONFIGURATION:")
-print("="*70)
-print(f"  Shoulder angle threshold: {vision.posture_analyzer.shoulder_angle_threshold}°")
-print(f"  Slouch threshold: {vision.posture_analyzer.slouch_threshold}")
-print(f"  Rock threshold: {vision.posture_analyzer.rock_threshold}")
-print(f"  Arms crossed frames: {vision.posture_analyzer.arms_crossed_frames}")
-
-print("\n" + "="*70)
-print("TESTING DUAL-MODE CAPABILITY:")
-print("="*70)
+emit(
+    *section("SYSTEM COMPONENTS LOADED:"),
+    f"✅ HolisticProcessor: {type(vision.holistic_processor).__name__}",
+    f"✅ SignalSmoother: {type(vision.signal_smoother).__name__}",
+    f"✅ PostureAnalyzer: {type(vision.posture_analyzer).__name__}",
+    *section("POSTURE ANALYZER CONFIGURATION:"),
+    f"  Shoulder angle threshold: {vision.posture_analyzer.shoulder_angle_threshold}°",
+    f"  Slouch threshold: {vision.posture_analyzer.slouch_threshold}",
+    f"  Rock threshold: {vision.posture_analyzer.rock_threshold}",
+    f"  Arms crossed frames: {vision.posture_analyzer.arms_crossed_frames}",
+    *section("TESTING DUAL-MODE CAPABILITY:")
+)
 
 # Test 1: Legacy mode (face landmarks)
-print("\n1️⃣  LEGACY MODE (Face-only):")
-print("   Input: Face landmarks dict")
-fake_landmarks = {i: {'x': 0.5, 'y': 0.5, 'z': 0} for i in range(500)}
+fake_landmarks = np.full((500, 3), 0.5, dtype=np.float32)
+fake_landmarks[:, 2] = 0.0
 result_legacy = vision.analyze_frame(fake_landmarks)
-print(f"   Mode: {result_legacy.get('mode', 'unknown')}")
-print(f"   Eye contact: {result_legacy.get('eye_contact_score', 0):.2f}")
-print(f"   Fidget score: {result_legacy.get('fidget_score', 0):.2f}")
+emit(
+    "\n1️⃣  LEGACY MODE (Face-only):",
+    "   Input: Face landmarks array (x, y, z rows)",
+    f"   Mode: {result_legacy.get('mode', 'unknown')}",
+    f"   Eye contact: {result_legacy.get('eye_contact_score', 0):.2f}",
+    f"   Fidget score: {result_legacy.get('fidget_score', 0):.2f}"
+)
 
 # Test 2: Holistic mode (raw frame)
 print("\n2️⃣  HOLISTIC MODE (Full-body with posture):")
 print("   Input: Raw video frame (numpy array)")
 fake_frame = np.zeros((480, 640, 3), dtype=np.uint8)
 result_holistic = vision.analyze_frame(fake_frame)
-print(f"   Mode: {result_holistic.get('mode', 'unknown')}")
-print(f"   Eye contact: {result_holistic.get('eye_contact_score', 0):.2f}")
+lines = [
+    f"   Mode: {result_holistic.get('mode', 'unknown')}",
+    f"   Eye contact: {result_holistic.get('eye_contact_score', 0):.2f}"
+]
 
 if 'posture' in result_holistic:
     posture = result_holistic['posture']
-    print(f"\n   📊 POSTURE METRICS (Your Task 3 work!):")
-    print(f"      Shoulder angle: {posture['shoulder_angle']:.2f}°")
-    print(f"      Is leaning: {posture['is_leaning']}")
-    print(f"      Is slouching: {posture['is_slouching']}")
-    print(f"      Slouch score: {posture['slouch_score']:.2f}")
-    print(f"      Arms crossed: {posture['arms_crossed']}")
-    print(f"      Rocking score: {posture['rocking_score']:.2f}")
-    print(f"      Shoulder stability: {posture['shoulder_stability']:.2f}")
-
-print("\n" + "="*70)
-print("INTEGRATION STATUS:")
-print("="*70)
-print("✅ Task 1: HolisticProcessor - INTEGRATED")
-print("✅ Task 2: SignalSmoother - INTEGRATED")
-print("✅ Task 3: PostureAnalyzer - INTEGRATED")
-print()
-print("📝 Note: The main app (app.py) currently uses legacy mode.")
-print("   To enable full posture analysis, the frontend needs to send")
-print("   raw video frames instead of face landmarks.")
-print()
-print("🎯 Your work is ready and waiting for frontend integration!")
+    lines += [
+        f"\n   📊 POSTURE METRICS (Your Task 3 work!):",
+        f"      Shoulder angle: {posture['shoulder_angle']:.2f}°",
+        f"      Is leaning: {posture['is_leaning']}",
+        f"      Is slouching: {posture['is_slouching']}",
+        f"      Slouch score: {posture['slouch_score']:.2f}",
+        f"      Arms crossed: {posture['arms_crossed']}",
+        f"      Rocking score: {posture['rocking_score']:.2f}",
+        f"      Shoulder stability: {posture['shoulder_stability']:.2f}"
+    ]
+emit(*lines)
 
-print("\n" + "="*70)
-print("CLEANUP:")
-print("="*70)
+emit(
+    *section("INTEGRATION STATUS:"),
+    "✅ Task 1: HolisticProcessor - INTEGRATED",
+    "✅ Task 2: SignalSmoother - INTEGRATED",
+    "✅ Task 3: PostureAnalyzer - INTEGRATED",
+    "",
+    "📝 Note: The main app (app.py) currently uses legacy mode.",
+    "   To enable full posture analysis, the frontend needs to send",
+    "   raw video frames instead of face landmarks.",
+    "",
+    "🎯 Your work is ready and waiting for frontend integration!",
+    *section("CLEANUP:")
+)
 vision.release()
 
 print("\n✅ Demo complete!")
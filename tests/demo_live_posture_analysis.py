@@ -3,12 +3,30 @@ Live Demo: Posture Analysis with Webcam
 Shows HolisticProcessor + SignalSmoother + PostureAnalyzer working together in real-time
 """
 
+import argparse
 import cv2
 import numpy as np
 import time
+import queue
+import threading
+import multiprocessing
+from multiprocessing import shared_memory
+from collections import namedtuple
+from functools import lru_cache
 from engine.holistic_processor import HolisticProcessor
 from engine.signal_smoother import SignalSmoother
+from engine.frame_capture import LatestFrameSlot, capture_frames
 from engine.analyzers.posture_analyzer import PostureAnalyzer
+from engine.analyzers.landmarks import as_array
+
+# Draw the overlay on a cv2.UMat (OpenCV T-API) when an OpenCL device is available
+USE_OPENCL = cv2.ocl.haveOpenCL()
+
+
+@lru_cache(maxsize=256)
+def _text_size(text, font_scale, thickness):
+    """Cached cv2.getTextSize; overlay strings repeat almost every frame."""
+    return cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, font_scale, thickness)
 
 
 def draw_text_with_background(frame, text, position, font_scale=0.6, thickness=2, 
@@ -17,7 +35,7 @@ def draw_text_with_background(frame, text, position, font_scale=0.6, thickness=2
     font = cv2.FONT_HERSHEY_SIMPLEX
     
     # Get text size
-    (text_width, text_height), baseline = cv2.getTextSize(text, font, font_scale, thickness)
+    (text_width, text_height), baseline = _text_size(text, font_scale, thickness)
     
     x, y = position
     # Draw background rectangle
@@ -30,128 +48,372 @@ def draw_text_with_background(frame, text, position, font_scale=0.6, thickness=2
     cv2.putText(frame, text, (x, y), font, font_scale, text_color, thickness)
 
 
-def draw_posture_overlay(frame, metrics, fps):
-    """Draw posture metrics overlay on the frame."""
-    h, w = frame.shape[:2]
+# Overlay colors (BGR)
+OK_COLOR = (0, 255, 0)
+ALERT_COLOR = (0, 0, 255)
+CAUTION_COLOR = (255, 165, 0)
+STATUS_WARN_COLOR = (0, 165, 255)
+
+# Overlay text colors, labels and layout per posture state
+OverlayStatus = namedtuple('OverlayStatus', [
+    'angle_color', 'warnings',
+    'slouch_y', 'slouch_color',
+    'arms_y', 'arms_text', 'arms_color',
+    'stability_y', 'stability_color',
+    'posture_text', 'posture_color', 'body_text'
+])
+
+
+def _overlay_status(flags):
+    """Build the OverlayStatus for a status_flags() value."""
+    is_leaning = bool(flags & 1)
+    is_slouching = bool(flags & 2)
+    is_stable = bool(flags & 4)
+    arms_crossed = bool(flags & 8)
+    
+    # Left column layout: each warning line pushes the rows below it down by 30px
+    warnings = []
+    y_offset = 70
+    if is_leaning:
+        warnings.append(("WARNING: Leaning!", y_offset + 30))
+        y_offset += 30
+    y_offset += 40
+    slouch_y = y_offset
+    if is_slouching:
+        warnings.append(("WARNING: Slouching!", y_offset + 30))
+        y_offset += 30
+    arms_y = y_offset + 40
+    stability_y = y_offset + 80
+    
+    good_posture = not is_leaning and not is_slouching
+    return OverlayStatus(
+        angle_color=ALERT_COLOR if is_leaning else OK_COLOR,
+        warnings=tuple(warnings),
+        slouch_y=slouch_y,
+        slouch_color=ALERT_COLOR if is_slouching else OK_COLOR,
+        arms_y=arms_y,
+        arms_text="Arms: CROSSED" if arms_crossed else "Arms: Open",
+        arms_color=CAUTION_COLOR if arms_crossed else OK_COLOR,
+        stability_y=stability_y,
+        stability_color=OK_COLOR if is_stable else CAUTION_COLOR,
+        posture_text="Posture: GOOD" if good_posture else "Posture: NEEDS IMPROVEMENT",
+        posture_color=OK_COLOR if good_posture else STATUS_WARN_COLOR,
+        body_text="Body: STABLE" if is_stable else "Body: FIDGETING"
+    )
+
+
+def status_flags(metrics):
+    """Pack the posture booleans the overlay depends on into a 4-bit index."""
+    return (int(metrics.is_leaning)
+            | int(metrics.is_slouching) << 1
+            | int(metrics.shoulder_stability > 0.7) << 2
+            | int(metrics.arms_crossed) << 3)
+
+
+# Every overlay state, precomputed and indexed by status_flags()
+_STATUS_LUT = [_overlay_status(flags) for flags in range(16)]
+
+
+def draw_posture_overlay(frame, metrics, fps, frame_shape=None):
+    """
+    Draw posture metrics overlay on the frame.
     
-    # Title
-    draw_text_with_background(frame, "LIVE POSTURE ANALYSIS", (10, 30), 
-                             font_scale=0.8, thickness=2, 
-                             text_color=(0, 255, 255), bg_color=(0, 0, 0))
+    frame may be a cv2.UMat, in which case frame_shape must be given.
+    """
+    h, w = (frame_shape or frame.shape)[:2]
+    status = _STATUS_LUT[status_flags(metrics)]
+    
+    # Title, STATUS: label and footer are static; see build_static_overlay()
     
     # FPS
     draw_text_with_background(frame, f"FPS: {fps:.1f}", (w - 120, 30), 
-                             font_scale=0.6, text_color=(0, 255, 0))
+                             font_scale=0.6, text_color=OK_COLOR)
     
     # Shoulder Angle
-    y_offset = 70
-    angle_color = (0, 0, 255) if metrics.is_leaning else (0, 255, 0)
     draw_text_with_background(frame, f"Shoulder Angle: {metrics.shoulder_angle:.1f}deg", 
-                             (10, y_offset), text_color=angle_color)
+                             (10, 70), text_color=status.angle_color)
     
-    if metrics.is_leaning:
-        draw_text_with_background(frame, "WARNING: Leaning!", 
-                                 (10, y_offset + 30), text_color=(0, 0, 255))
-        y_offset += 30
+    # Leaning / slouching warnings
+    for text, y in status.warnings:
+        draw_text_with_background(frame, text, (10, y), text_color=ALERT_COLOR)
     
     # Slouch Detection
-    y_offset += 40
-    slouch_color = (0, 0, 255) if metrics.is_slouching else (0, 255, 0)
     draw_text_with_background(frame, f"Slouch Score: {metrics.slouch_score:.2f}", 
-                             (10, y_offset), text_color=slouch_color)
-    
-    if metrics.is_slouching:
-        draw_text_with_background(frame, "WARNING: Slouching!", 
-                                 (10, y_offset + 30), text_color=(0, 0, 255))
-        y_offset += 30
+                             (10, status.slouch_y), text_color=status.slouch_color)
     
     # Arms Crossed
-    y_offset += 40
-    arms_color = (255, 165, 0) if metrics.arms_crossed else (0, 255, 0)
-    arms_text = "Arms: CROSSED" if metrics.arms_crossed else "Arms: Open"
-    draw_text_with_background(frame, arms_text, (10, y_offset), text_color=arms_color)
+    draw_text_with_background(frame, status.arms_text, (10, status.arms_y),
+                             text_color=status.arms_color)
     
     # Stability
-    y_offset += 40
-    stability_color = (0, 255, 0) if metrics.shoulder_stability > 0.7 else (255, 165, 0)
     draw_text_with_background(frame, f"Stability: {metrics.shoulder_stability:.2f}", 
-                             (10, y_offset), text_color=stability_color)
+                             (10, status.stability_y), text_color=status.stability_color)
     
     draw_text_with_background(frame, f"Rocking: {metrics.rocking_score:.2f}", 
-                             (10, y_offset + 30), text_color=stability_color)
+                             (10, status.stability_y + 30), text_color=status.stability_color)
     
-    # Status indicators (bottom right)
-    status_y = h - 100
-    draw_text_with_background(frame, "STATUS:", (w - 200, status_y), 
-                             font_scale=0.5, text_color=(200, 200, 200))
+    # Status indicators (bottom right, below the static "STATUS:" header at h - 100)
+    draw_text_with_background(frame, status.posture_text, 
+                             (w - 200, h - 75), font_scale=0.5, text_color=status.posture_color)
     
-    status_y += 25
-    posture_status = "GOOD" if not metrics.is_leaning and not metrics.is_slouching else "NEEDS IMPROVEMENT"
-    status_color = (0, 255, 0) if posture_status == "GOOD" else (0, 165, 255)
-    draw_text_with_background(frame, f"Posture: {posture_status}", 
-                             (w - 200, status_y), font_scale=0.5, text_color=status_color)
+    draw_text_with_background(frame, status.body_text, 
+                             (w - 200, h - 50), font_scale=0.5, text_color=status.stability_color)
+
+
+def render_text_patch(text, position, font_scale=0.6, thickness=2,
+                      text_color=(255, 255, 255), bg_color=(0, 0, 0)):
+    """
+    Pre-render draw_text_with_background() output into a standalone patch.
+    
+    Returns (y0, x0, patch) so the patch can be pasted back at the same spot.
+    """
+    (text_width, text_height), baseline = _text_size(text, font_scale, thickness)
     
-    status_y += 25
-    stability_status = "STABLE" if metrics.shoulder_stability > 0.7 else "FIDGETING"
-    stability_color = (0, 255, 0) if stability_status == "STABLE" else (255, 165, 0)
-    draw_text_with_background(frame, f"Body: {stability_status}", 
-                             (w - 200, status_y), font_scale=0.5, text_color=stability_color)
+    x, y = position
+    x0, y0 = x - 5, y - text_height - 5
+    patch = np.zeros((text_height + baseline + 11, text_width + 11, 3), dtype=np.uint8)
+    draw_text_with_background(patch, text, (x - x0, y - y0), font_scale, thickness,
+                              text_color, bg_color)
+    return y0, x0, patch
 
 
-def draw_landmarks(frame, pose_landmarks):
-    """Draw key pose landmarks on the frame."""
-    if not pose_landmarks or len(pose_landmarks) < 25:
-        return
+def build_static_overlay(frame_shape):
+    """Pre-render the overlay text that never changes for a given frame size."""
+    h, w = frame_shape[:2]
+    return [
+        # Title
+        render_text_patch("LIVE POSTURE ANALYSIS", (10, 30),
+                          font_scale=0.8, thickness=2,
+                          text_color=(0, 255, 255), bg_color=(0, 0, 0)),
+        # Status header (bottom right)
+        render_text_patch("STATUS:", (w - 200, h - 100),
+                          font_scale=0.5, text_color=(200, 200, 200)),
+        # Instructions at bottom
+        render_text_patch("Press 'q' to quit | Press 'r' to reset",
+                          (10, h - 20), font_scale=0.5,
+                          text_color=(200, 200, 200), bg_color=(0, 0, 0)),
+    ]
+
+
+def blit_static_overlay(frame, static_overlay):
+    """Paste pre-rendered overlay patches onto the frame (ndarray or cv2.UMat)."""
+    for y0, x0, patch in static_overlay:
+        ph, pw = patch.shape[:2]
+        if isinstance(frame, cv2.UMat):
+            cv2.copyTo(patch, None, cv2.UMat(frame, (y0, y0 + ph), (x0, x0 + pw)))
+        else:
+            frame[y0:y0 + ph, x0:x0 + pw] = patch
+
+
+# Max per-coordinate change (normalized units) for a pose to count as unchanged
+POSE_UNCHANGED_TOL = 1e-4
+
+# Pose landmarks drawn by draw_landmarks(): nose, shoulders, wrists
+KEY_LANDMARKS = [0, 11, 12, 15, 16]
+
+
+def draw_landmarks(frame, pose_array, frame_shape=None):
+    """
+    Draw key pose landmarks from a (33, 4) pose array on the frame.
     
-    h, w = frame.shape[:2]
+    frame may be a cv2.UMat, in which case frame_shape must be given.
+    """
+    if pose_array is None or len(pose_array) < 25:
+        return
     
-    # Draw shoulders
-    left_shoulder = pose_landmarks[11]
-    right_shoulder = pose_landmarks[12]
+    h, w = (frame_shape or frame.shape)[:2]
     
-    ls_x, ls_y = int(left_shoulder.x * w), int(left_shoulder.y * h)
-    rs_x, rs_y = int(right_shoulder.x * w), int(right_shoulder.y * h)
+    # Pixel coordinates of all key landmarks in one shot
+    coords = (pose_array[KEY_LANDMARKS, :2] * (w, h)).astype(np.int32).tolist()
+    nose, left_shoulder, right_shoulder, left_wrist, right_wrist = map(tuple, coords)
     
     # Draw shoulder line
-    cv2.line(frame, (ls_x, ls_y), (rs_x, rs_y), (0, 255, 0), 3)
-    cv2.circle(frame, (ls_x, ls_y), 8, (0, 255, 0), -1)
-    cv2.circle(frame, (rs_x, rs_y), 8, (0, 255, 0), -1)
+    cv2.line(frame, left_shoulder, right_shoulder, (0, 255, 0), 3)
+    cv2.circle(frame, left_shoulder, 8, (0, 255, 0), -1)
+    cv2.circle(frame, right_shoulder, 8, (0, 255, 0), -1)
     
     # Draw nose
-    nose = pose_landmarks[0]
-    nose_x, nose_y = int(nose.x * w), int(nose.y * h)
-    cv2.circle(frame, (nose_x, nose_y), 8, (255, 0, 0), -1)
+    cv2.circle(frame, nose, 8, (255, 0, 0), -1)
     
     # Draw line from nose to shoulder midpoint
-    mid_x = (ls_x + rs_x) // 2
-    mid_y = (ls_y + rs_y) // 2
-    cv2.line(frame, (nose_x, nose_y), (mid_x, mid_y), (255, 255, 0), 2)
+    mid = ((left_shoulder[0] + right_shoulder[0]) // 2,
+           (left_shoulder[1] + right_shoulder[1]) // 2)
+    cv2.line(frame, nose, mid, (255, 255, 0), 2)
     
     # Draw wrists
-    left_wrist = pose_landmarks[15]
-    right_wrist = pose_landmarks[16]
-    
-    lw_x, lw_y = int(left_wrist.x * w), int(left_wrist.y * h)
-    rw_x, rw_y = int(right_wrist.x * w), int(right_wrist.y * h)
+    cv2.circle(frame, left_wrist, 8, (255, 0, 255), -1)
+    cv2.circle(frame, right_wrist, 8, (255, 0, 255), -1)
+
+
+# Landmark rows reserved per type in the shared result buffer (face allows iris refinement)
+RESULT_LAYOUT = (('pose', 33), ('face', 478), ('left_hand', 21), ('right_hand', 21))
+
+# Result header: timestamp, then the row count of each type (0 = not detected)
+RESULT_HEADER = 1 + len(RESULT_LAYOUT)
+
+
+def _result_views(buffer):
+    """Split the shared result buffer into (header, {type: (max_rows, 4) view})."""
+    flat = np.ndarray((RESULT_HEADER + 4 * sum(n for _, n in RESULT_LAYOUT),),
+                      dtype=np.float64, buffer=buffer)
+    views = {}
+    offset = RESULT_HEADER
+    for landmark_type, n_rows in RESULT_LAYOUT:
+        views[landmark_type] = flat[offset:offset + 4 * n_rows].reshape(n_rows, 4)
+        offset += 4 * n_rows
+    return flat[:RESULT_HEADER], views
+
+
+def run_holistic_worker(frame_shm_name, result_shm_name, frame_shape,
+                    frame_ready, result_ready, stop_event, stats_queue, processor_kwargs):
+    """
+    Worker process: run HolisticProcessor on frames placed in shared memory.
+    
+    Waits for frame_ready, processes the shared BGR frame, writes landmark
+    arrays into the shared result buffer and sets result_ready. Puts the
+    processor's performance stats on stats_queue when stopped.
+    """
+    frame_shm = shared_memory.SharedMemory(name=frame_shm_name)
+    result_shm = shared_memory.SharedMemory(name=result_shm_name)
+    frame = np.ndarray(frame_shape, dtype=np.uint8, buffer=frame_shm.buf)
+    header, views = _result_views(result_shm.buf)
+    holistic_processor = HolisticProcessor(**processor_kwargs)
     
-    cv2.circle(frame, (lw_x, lw_y), 8, (255, 0, 255), -1)
-    cv2.circle(frame, (rw_x, rw_y), 8, (255, 0, 255), -1)
+    try:
+        while not stop_event.is_set():
+            if not frame_ready.wait(timeout=0.1):
+                continue
+            frame_ready.clear()
+            
+            results = holistic_processor.process_frame(frame)
+            pose_array = results.pose_array
+            if pose_array is None:
+                pose_array = as_array(results.pose_landmarks)
+            arrays = (pose_array,
+                      as_array(results.face_landmarks),
+                      as_array(results.left_hand_landmarks),
+                      as_array(results.right_hand_landmarks))
+            
+            header[0] = results.timestamp
+            for i, ((landmark_type, n_rows), array) in enumerate(zip(RESULT_LAYOUT, arrays)):
+                n = 0 if array is None else min(len(array), n_rows)
+                header[1 + i] = n
+                if n:
+                    views[landmark_type][:n] = array[:n]
+            result_ready.set()
+    finally:
+        stats_queue.put(holistic_processor.get_performance_stats())
+        holistic_processor.release()
+        del frame, header, views
+        frame_shm.close()
+        result_shm.close()
+
+
+class HolisticWorker:
+    """
+    Runs MediaPipe Holistic in a separate process so inference overlaps with
+    smoothing, analysis and drawing in the main loop.
+    
+    Frames and landmark arrays cross the process boundary through
+    shared_memory buffers, so nothing is pickled per frame. One frame is in
+    flight at a time: submit() starts inference, collect() waits for it.
+    """
+    
+    def __init__(self, frame_shape, **processor_kwargs):
+        self.frame_shape = tuple(frame_shape)
+        ctx = multiprocessing.get_context('spawn')
+        
+        self._frame_shm = shared_memory.SharedMemory(create=True, size=int(np.prod(frame_shape)))
+        self._result_shm = shared_memory.SharedMemory(
+            create=True, size=8 * (RESULT_HEADER + 4 * sum(n for _, n in RESULT_LAYOUT))
+        )
+        self._frame = np.ndarray(self.frame_shape, dtype=np.uint8, buffer=self._frame_shm.buf)
+        self._header, self._views = _result_views(self._result_shm.buf)
+        
+        self._frame_ready = ctx.Event()
+        self._result_ready = ctx.Event()
+        self._stop_event = ctx.Event()
+        self._stats_queue = ctx.Queue()
+        self._process = ctx.Process(
+            target=run_holistic_worker,
+            args=(self._frame_shm.name, self._result_shm.name, self.frame_shape,
+                  self._frame_ready, self._result_ready, self._stop_event,
+                  self._stats_queue, processor_kwargs),
+            daemon=True
+        )
+        self._process.start()
+        self.in_flight = False
+    
+    def submit(self, frame):
+        """Copy frame into shared memory and start processing it."""
+        np.copyto(self._frame, frame)
+        self._result_ready.clear()
+        self._frame_ready.set()
+        self.in_flight = True
+    
+    def collect(self):
+        """
+        Wait for the submitted frame's results.
+        
+        Returns:
+            Tuple of (timestamp, {landmark_type: (N, 4) array or None})
+        """
+        while not self._result_ready.wait(timeout=0.1):
+            if not self._process.is_alive():
+                raise RuntimeError("Holistic worker process exited")
+        self.in_flight = False
+        
+        counts = self._header[1:].astype(int).tolist()
+        arrays = {
+            landmark_type: self._views[landmark_type][:n].copy() if n else None
+            for (landmark_type, _), n in zip(RESULT_LAYOUT, counts)
+        }
+        return float(self._header[0]), arrays
+    
+    def close(self):
+        """Stop the worker and free shared memory; returns its performance stats."""
+        self._stop_event.set()
+        try:
+            stats = self._stats_queue.get(timeout=5.0)
+        except queue.Empty:
+            stats = {"fps": 0.0, "avg_process_time_ms": 0.0}
+        self._process.join(timeout=1.0)
+        del self._frame, self._header, self._views
+        for shm in (self._frame_shm, self._result_shm):
+            shm.close()
+            shm.unlink()
+        return stats
+
+
+def parse_args():
+    """Parse demo command-line options."""
+    parser = argparse.ArgumentParser(description="Live posture analysis demo")
+    parser.add_argument("--hd", action="store_true",
+                        help="Capture at 1280x720 instead of 640x480 (high-fidelity demos)")
+    parser.add_argument("--model-complexity", type=int, choices=(0, 1, 2), default=0,
+                        help="Holistic pose model: 0=Lite (default), 1=Full, 2=Heavy")
+    return parser.parse_args()
 
 
 def main():
     """Main demo function."""
+    args = parse_args()
+    
     print("=" * 70)
     print("LIVE POSTURE ANALYSIS DEMO")
     print("=" * 70)
     print("\nInitializing components...")
     
-    # Initialize all components
-    holistic_processor = HolisticProcessor(
+    # Initialize all components (HolisticProcessor itself starts in a worker
+    # process once the first frame's size is known)
+    holistic_kwargs = dict(
         min_detection_confidence=0.5,
         min_tracking_confidence=0.5,
         enable_frame_skip=True,
-        target_fps=15.0
+        target_fps=15.0,
+        model_complexity=args.model_complexity
     )
+    holistic_worker = None
     
     signal_smoother = SignalSmoother(
         freq=30.0,
@@ -190,64 +452,107 @@ def main():
         print("❌ Error: Could not open webcam")
         return
     
-    # Set camera resolution
-    cap.set(cv2.CAP_PROP_FRAME_WIDTH, 1280)
-    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 720)
+    # Set camera resolution (Holistic downscales internally, so 640x480 is
+    # enough for analysis; --hd keeps 1280x720 for high-fidelity demos)
+    width, height = (1280, 720) if args.hd else (640, 480)
+    cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+    cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)  # Don't let the driver queue stale frames
     
     print("\n🎥 Webcam opened! Starting analysis...\n")
     
+    # Capture runs on its own thread; the main loop only ever sees the newest frame
+    frame_slot = LatestFrameSlot()
+    stop_event = threading.Event()
+    capture_thread = threading.Thread(
+        target=capture_frames, args=(cap, frame_slot, stop_event), daemon=True
+    )
+    capture_thread.start()
+    
     frame_count = 0
-    start_time = time.time()
+    start_ns = time.monotonic_ns()
+    fps_window_start_ns = start_ns
     fps = 0.0
     
+    # Static overlay text, rendered once per frame size
+    static_shape = None
+    static_overlay = None
+    
+    # Last analyzed pose and its metrics (reused while the pose holds still)
+    last_pose = None
+    posture_metrics = None
+    
+    # Frame currently being processed by the Holistic worker
+    pending_frame = None
+    
     try:
         while True:
-            ret, frame = cap.read()
+            item = frame_slot.take(timeout=0.1)
+            if item is None:
+                continue
+            ret, frame, _ = item
             if not ret:
                 print("❌ Error: Could not read frame")
                 break
             
-            frame_start = time.time()
+            # Flip frame horizontally for mirror effect, in place: the capture
+            # thread hands over a fresh buffer, and OpenCV can't draw on a
+            # negative-stride frame[:, ::-1] view
+            cv2.flip(frame, 1, dst=frame)
             
-            # Flip frame horizontally for mirror effect
-            frame = cv2.flip(frame, 1)
+            if holistic_worker is None:
+                print("🧠 Starting Holistic worker process...")
+                holistic_worker = HolisticWorker(frame.shape, **holistic_kwargs)
+            elif frame.shape != holistic_worker.frame_shape:
+                print("❌ Error: Frame size changed mid-session")
+                break
             
-            # 1. Process with HolisticProcessor
-            holistic_results = holistic_processor.process_frame(frame)
+            # 1. Process with HolisticProcessor in the worker: collect the
+            #    previous frame's results, then start on this frame so the
+            #    rest of this iteration overlaps with inference
+            if holistic_worker.in_flight:
+                timestamp, landmark_arrays = holistic_worker.collect()
+            holistic_worker.submit(frame)
+            frame, pending_frame = pending_frame, frame
+            if frame is None:
+                continue
             
-            # 2. Smooth landmarks with SignalSmoother
-            smoothed_pose, smoothed_face, smoothed_left_hand, smoothed_right_hand = signal_smoother.smooth_landmarks(
-                pose_landmarks=holistic_results.pose_landmarks,
-                face_landmarks=holistic_results.face_landmarks,
-                left_hand_landmarks=holistic_results.left_hand_landmarks,
-                right_hand_landmarks=holistic_results.right_hand_landmarks,
-                timestamp=holistic_results.timestamp
-            )
+            # 2. Smooth landmarks with SignalSmoother ((N, 4) arrays throughout)
+            smoothed = {
+                landmark_type: signal_smoother.smooth_array(array, landmark_type, timestamp)
+                for landmark_type, array in landmark_arrays.items()
+            }
+            smoothed_pose = smoothed['pose']
             
-            # 3. Analyze posture with PostureAnalyzer
-            posture_metrics = posture_analyzer.analyze(
-                pose_landmarks=smoothed_pose,
-                timestamp=holistic_results.timestamp
-            )
+            # 3. Analyze posture with PostureAnalyzer, reusing the last metrics
+            #    while the smoothed pose hasn't moved since they were computed
+            if (smoothed_pose is None or last_pose is None
+                    or not np.allclose(smoothed_pose, last_pose, rtol=0.0, atol=POSE_UNCHANGED_TOL)):
+                posture_metrics = posture_analyzer.analyze(
+                    pose_landmarks=smoothed_pose,
+                    timestamp=timestamp
+                )
+                last_pose = smoothed_pose
             
-            # Calculate FPS
+            # Calculate FPS over the last 10 frames (integer ns deltas)
             frame_count += 1
             if frame_count % 10 == 0:
-                elapsed = time.time() - start_time
-                fps = frame_count / elapsed
+                now_ns = time.monotonic_ns()
+                fps = 10 * 1e9 / (now_ns - fps_window_start_ns)
+                fps_window_start_ns = now_ns
             
-            # Draw visualizations
-            draw_landmarks(frame, smoothed_pose)
-            draw_posture_overlay(frame, posture_metrics, fps)
-            
-            # Add instructions at bottom
-            h, w = frame.shape[:2]
-            draw_text_with_background(frame, "Press 'q' to quit | Press 'r' to reset", 
-                                     (10, h - 20), font_scale=0.5, 
-                                     text_color=(200, 200, 200), bg_color=(0, 0, 0))
+            # Draw visualizations (on the GPU when OpenCL is available;
+            # the Holistic worker still needs ndarray frames)
+            canvas = cv2.UMat(frame) if USE_OPENCL else frame
+            draw_landmarks(canvas, smoothed_pose, frame.shape)
+            if frame.shape != static_shape:
+                static_overlay = build_static_overlay(frame.shape)
+                static_shape = frame.shape
+            blit_static_overlay(canvas, static_overlay)
+            draw_posture_overlay(canvas, posture_metrics, fps, frame.shape)
             
             # Show frame
-            cv2.imshow('Live Posture Analysis - Interview Mirror', frame)
+            cv2.imshow('Live Posture Analysis - Interview Mirror', canvas)
             
             # Handle key presses
             key = cv2.waitKey(1) & 0xFF
@@ -258,8 +563,10 @@ def main():
                 print("\n🔄 Resetting analyzer...")
                 posture_analyzer.reset()
                 signal_smoother.reset()
+                last_pose = None
                 frame_count = 0
-                start_time = time.time()
+                start_ns = time.monotonic_ns()
+                fps_window_start_ns = start_ns
                 print("✅ Reset complete!")
             
             # Print status every 30 frames
@@ -277,7 +584,7 @@ def main():
     
     finally:
         # Cleanup
-        elapsed = time.time() - start_time
+        elapsed = (time.monotonic_ns() - start_ns) * 1e-9
         avg_fps = frame_count / elapsed if elapsed > 0 else 0
         
         print("\n" + "=" * 70)
@@ -288,7 +595,9 @@ def main():
         print(f"Average FPS: {avg_fps:.2f}")
         
         # Get component stats
-        holistic_stats = holistic_processor.get_performance_stats()
+        stop_event.set()
+        holistic_stats = (holistic_worker.close() if holistic_worker is not None
+                          else {"fps": 0.0, "avg_process_time_ms": 0.0})
         smoother_stats = signal_smoother.get_stats()
         
         print(f"\nHolistic Processor:")
@@ -301,9 +610,9 @@ def main():
         print("\n✅ Demo completed successfully!")
         print("=" * 70)
         
+        capture_thread.join(timeout=1.0)
         cap.release()
         cv2.destroyAllWindows()
-        holistic_processor.release()
 
 
 if __name__ == "__main__":
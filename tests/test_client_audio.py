@@ -3,8 +3,7 @@ import websockets
 import json
 import base64
 import pyaudio
-import wave
-import io
+import struct
 
 # Audio Configuration
 CHUNK = 1024
@@ -14,6 +13,25 @@ RATE = 44100
 RECORD_SECONDS = 5  # Duration of each answer
 INPUT_DEVICE_INDEX = 1
 
+# Canonical 44-byte PCM WAV header: RIFF chunk, "fmt " subchunk, "data" subchunk header
+WAV_HEADER = struct.Struct('<4sI4s4sIHHIIHH4sI')
+
+# Dummy landmarks sent with every answer so the Vision Engine doesn't crash;
+# constant, so serialized once (compact separators) instead of per payload
+DUMMY_LANDMARKS_JSON = json.dumps([{"x": 0.5, "y": 0.5, "z": 0.0}] * 478, separators=(',', ':'))
+
+
+def write_wav_header(buffer, n_data_bytes, sample_width):
+    """Write a PCM WAV header for the configured format into the start of buffer."""
+    WAV_HEADER.pack_into(
+        buffer, 0,
+        b'RIFF', WAV_HEADER.size - 8 + n_data_bytes, b'WAVE',
+        b'fmt ', 16, 1, CHANNELS, RATE,
+        RATE * CHANNELS * sample_width, CHANNELS * sample_width, sample_width * 8,
+        b'data', n_data_bytes
+    )
+
+
 async def record_and_send(websocket):
     p = pyaudio.PyAudio()
     
@@ -28,41 +46,34 @@ async def record_and_send(websocket):
                     input_device_index=INPUT_DEVICE_INDEX,
                     frames_per_buffer=CHUNK)
 
-    frames = []
-
-    for _ in range(0, int(RATE / CHUNK * RECORD_SECONDS)):
-        data = stream.read(CHUNK)
-        frames.append(data)
+    # Record straight into one preallocated WAV buffer: header first, then PCM
+    # (Google Speech Recognition needs the WAV headers to know the format)
+    n_chunks = int(RATE / CHUNK * RECORD_SECONDS)
+    sample_width = p.get_sample_size(FORMAT)
+    chunk_bytes = CHUNK * CHANNELS * sample_width
+    wav_bytes = bytearray(WAV_HEADER.size + n_chunks * chunk_bytes)
+    write_wav_header(wav_bytes, n_chunks * chunk_bytes, sample_width)
+    
+    view = memoryview(wav_bytes)
+    pos = WAV_HEADER.size
+    for _ in range(n_chunks):
+        view[pos:pos + chunk_bytes] = stream.read(CHUNK)
+        pos += chunk_bytes
+    view.release()
 
     print("✅ Recording stopped.")
 
     stream.stop_stream()
     stream.close()
     p.terminate()
-
-    # Convert raw PCM audio to a generic WAV container in memory
-    # (Google Speech Recognition needs the WAV headers to know the format)
-    wav_buffer = io.BytesIO()
-    with wave.open(wav_buffer, 'wb') as wf:
-        wf.setnchannels(CHANNELS)
-        wf.setsampwidth(p.get_sample_size(FORMAT))
-        wf.setframerate(RATE)
-        wf.writeframes(b''.join(frames))
-    
-    wav_bytes = wav_buffer.getvalue()
     
-    # Encode to Base64 string for JSON transmission
-    audio_b64 = base64.b64encode(wav_bytes).decode('utf-8')
-
-    # Send payload
-    payload = {
-        "audio_data": audio_b64,
-        # Sending dummy landmarks so the Vision Engine doesn't crash
-        "landmarks": [{"x": 0.5, "y": 0.5, "z": 0.0}] * 478 
-    }
+    # Encode to Base64 for JSON transmission. Base64 needs no JSON escaping,
+    # so the message is spliced together rather than re-scanned by json.dumps
+    audio_b64 = base64.b64encode(wav_bytes).decode('ascii')
+    message = f'{{"audio_data":"{audio_b64}","landmarks":{DUMMY_LANDMARKS_JSON}}}'
     
     print("-> Sending audio to AI Recruiter...")
-    await websocket.send(json.dumps(payload))
+    await websocket.send(message)
 
 async def start_interview():
     uri = "ws://localhost:8000/ws/interview"
@@ -3,60 +3,111 @@ Test script for GestureAnalyzer - hand gesture and face-touching detection.
 """
 
 import sys
-import time
+import itertools
+import numpy as np
 from engine.analyzers.gesture_analyzer import GestureAnalyzer, Landmark, GestureMetrics
 
+# Hand points moved to simulate gesturing: wrist and index finger tip
+MOVING_POINTS = [GestureAnalyzer.WRIST, GestureAnalyzer.INDEX_TIP]
+
+# Synthetic clock: frame timestamps 0.1s apart, increasing across scenarios
+FRAME_INTERVAL = 0.1
+_frame_clock = itertools.count()
+
+
+def _hand(default_xy, wrist_xy, index_tip_xy):
+    """Build a (21, 4) hand array of x, y, z, visibility rows."""
+    hand = np.tile([default_xy[0], default_xy[1], 0.0, 1.0], (21, 1))
+    hand[GestureAnalyzer.WRIST, :2] = wrist_xy
+    hand[GestureAnalyzer.INDEX_TIP, :2] = index_tip_xy
+    return hand
+
+
+# Default left / right hands (MediaPipe Hands format, 21 landmarks each)
+_DEFAULT_HANDS = (
+    np.tile([0.3, 0.7, 0.0, 1.0], (21, 1)),
+    np.tile([0.7, 0.7, 0.0, 1.0], (21, 1)),
+)
+
+# Per-scenario (left_hand, right_hand) arrays, built once at import
+_HAND_TEMPLATES = {
+    # Hands at sides, no gestures
+    "hands_down": (
+        _hand((0.3, 0.7), (0.3, 0.8), (0.3, 0.85)),    # Left wrist / index tip low
+        _hand((0.7, 0.7), (0.7, 0.8), (0.7, 0.85)),    # Right wrist / index tip low
+    ),
+    # Left hand touching face
+    "face_touch_left": (
+        _hand((0.3, 0.7), (0.4, 0.4), (0.48, 0.32)),   # Left index tip near nose
+        _hand((0.7, 0.7), (0.7, 0.8), (0.7, 0.85)),    # Right hand low
+    ),
+    # Right hand touching face
+    "face_touch_right": (
+        _hand((0.3, 0.7), (0.3, 0.8), (0.3, 0.85)),    # Left hand low
+        _hand((0.7, 0.7), (0.6, 0.4), (0.52, 0.32)),   # Right index tip near nose
+    ),
+    # Left hand elevated and moving (gesturing)
+    "gesturing_left": (
+        _hand((0.3, 0.7), (0.2, 0.3), (0.15, 0.25)),   # Left hand above shoulders
+        _hand((0.7, 0.7), (0.7, 0.8), (0.7, 0.85)),    # Right hand low
+    ),
+    # Both hands elevated (dynamic speaker)
+    "gesturing_both": (
+        _hand((0.3, 0.7), (0.2, 0.3), (0.15, 0.25)),   # Left hand above shoulders
+        _hand((0.7, 0.7), (0.8, 0.3), (0.85, 0.25)),   # Right hand above shoulders
+    ),
+    # No hands visible
+    "no_hands": (None, None),
+}
+
 
 def create_test_landmarks(scenario: str):
-    """Create synthetic hand and face landmarks for different scenarios."""
+    """
+    Create synthetic hand and face landmarks for different scenarios.
     
-    # Create 21 hand landmarks (MediaPipe Hands format)
-    left_hand = [Landmark(0.3, 0.7, 0, 1.0) for _ in range(21)]  # Default left hand
-    right_hand = [Landmark(0.7, 0.7, 0, 1.0) for _ in range(21)]  # Default right hand
+    Returns (left_hand, right_hand, nose, shoulder_y) where each hand is a
+    fresh (21, 4) array (or None if not visible).
+    """
+    left_hand, right_hand = _HAND_TEMPLATES.get(scenario, _DEFAULT_HANDS)
     nose = Landmark(0.5, 0.3, 0, 1.0)  # Nose landmark
     shoulder_y = 0.5  # Shoulder Y-coordinate
     
-    if scenario == "hands_down":
-        # Hands at sides, no gestures
-        left_hand[0] = Landmark(0.3, 0.8, 0, 1.0)   # Left wrist low
-        left_hand[8] = Landmark(0.3, 0.85, 0, 1.0)  # Left index tip
-        right_hand[0] = Landmark(0.7, 0.8, 0, 1.0)  # Right wrist low
-        right_hand[8] = Landmark(0.7, 0.85, 0, 1.0) # Right index tip
-        
-    elif scenario == "face_touch_left":
-        # Left hand touching face
-        left_hand[0] = Landmark(0.4, 0.4, 0, 1.0)   # Left wrist near face
-        left_hand[8] = Landmark(0.48, 0.32, 0, 1.0) # Left index tip near nose
-        right_hand[0] = Landmark(0.7, 0.8, 0, 1.0)  # Right wrist low
-        right_hand[8] = Landmark(0.7, 0.85, 0, 1.0) # Right index tip low
-        
-    elif scenario == "face_touch_right":
-        # Right hand touching face
-        left_hand[0] = Landmark(0.3, 0.8, 0, 1.0)   # Left wrist low
-        left_hand[8] = Landmark(0.3, 0.85, 0, 1.0)  # Left index tip low
-        right_hand[0] = Landmark(0.6, 0.4, 0, 1.0)  # Right wrist near face
-        right_hand[8] = Landmark(0.52, 0.32, 0, 1.0) # Right index tip near nose
-        
-    elif scenario == "gesturing_left":
-        # Left hand elevated and moving (gesturing)
-        left_hand[0] = Landmark(0.2, 0.3, 0, 1.0)   # Left wrist above shoulders
-        left_hand[8] = Landmark(0.15, 0.25, 0, 1.0) # Left index tip elevated
-        right_hand[0] = Landmark(0.7, 0.8, 0, 1.0)  # Right wrist low
-        right_hand[8] = Landmark(0.7, 0.85, 0, 1.0) # Right index tip low
-        
-    elif scenario == "gesturing_both":
-        # Both hands elevated (dynamic speaker)
-        left_hand[0] = Landmark(0.2, 0.3, 0, 1.0)   # Left wrist above shoulders
-        left_hand[8] = Landmark(0.15, 0.25, 0, 1.0) # Left index tip elevated
-        right_hand[0] = Landmark(0.8, 0.3, 0, 1.0)  # Right wrist above shoulders
-        right_hand[8] = Landmark(0.85, 0.25, 0, 1.0) # Right index tip elevated
-        
-    elif scenario == "no_hands":
-        # No hands visible
-        left_hand = None
-        right_hand = None
+    return (
+        left_hand.copy() if left_hand is not None else None,
+        right_hand.copy() if right_hand is not None else None,
+        nose,
+        shoulder_y
+    )
+
+
+def build_frames(scenario: str, n_frames: int = 10):
+    """
+    Build n_frames of a scenario as stacked arrays for GestureAnalyzer.analyze_batch.
+    
+    Gesturing hands drift sideways, with a step that grows by 0.01 each
+    frame. Returns (left_hands, right_hands, nose_points, shoulder_ys,
+    timestamps); hands are (T, 21, 4) arrays, or None if not visible.
+    """
+    left_hand, right_hand, nose, shoulder_y = create_test_landmarks(scenario)
+    
+    # Cumulative x offset per frame: 0, 0.01, 0.03, 0.06, ...
+    drift = np.cumsum(0.01 * np.arange(n_frames))[:, None]
+    
+    left_hands = right_hands = None
+    if left_hand is not None:
+        left_hands = np.repeat(left_hand[None], n_frames, axis=0)
+        if scenario.startswith("gesturing"):
+            left_hands[:, MOVING_POINTS, 0] += drift
+    if right_hand is not None:
+        right_hands = np.repeat(right_hand[None], n_frames, axis=0)
+        if scenario == "gesturing_both":
+            right_hands[:, MOVING_POINTS, 0] -= drift  # Move in opposite direction
     
-    return left_hand, right_hand, nose, shoulder_y
+    nose_points = np.tile([nose.x, nose.y, nose.z, nose.visibility], (n_frames, 1))
+    shoulder_ys = np.full(n_frames, shoulder_y)
+    timestamps = np.array(list(itertools.islice(_frame_clock, n_frames))) * FRAME_INTERVAL
+    
+    return left_hands, right_hands, nose_points, shoulder_ys, timestamps
 
 
 def test_scenario(analyzer: GestureAnalyzer, scenario: str, expected_results: dict):
@@ -65,44 +116,22 @@ def test_scenario(analyzer: GestureAnalyzer, scenario: str, expected_results: di
     print(f"Testing: {scenario.upper().replace('_', ' ')}")
     print(f"{'='*60}")
     
-    left_hand, right_hand, nose, shoulder_y = create_test_landmarks(scenario)
+    # Run 10 frames in one batch to simulate movement and build history
+    results = analyzer.analyze_batch(*build_frames(scenario, n_frames=10))
     
-    # Run analysis multiple times to simulate movement and build history
-    results = None
-    for i in range(10):  # Build up movement history
-        # Simulate slight movement for gesture detection
-        if scenario.startswith("gesturing") and left_hand:
-            # Add slight movement to simulate gesturing
-            movement = 0.01 * i  # Gradual movement
-            left_hand[0].x += movement
-            left_hand[8].x += movement
-            
-        if scenario == "gesturing_both" and right_hand:
-            movement = 0.01 * i
-            right_hand[0].x -= movement  # Move in opposite direction
-            right_hand[8].x -= movement
-        
-        results = analyzer.analyze(
-            left_hand_landmarks=left_hand,
-            right_hand_landmarks=right_hand,
-            nose_landmark=nose,
-            shoulder_y=shoulder_y,
-            timestamp=time.time()
-        )
-        
-        time.sleep(0.1)  # Small delay to simulate real-time
-    
-    # Print results
-    print(f"\n📊 Results:")
-    print(f"  Left hand visible: {results.left_hand_visible}")
-    print(f"  Right hand visible: {results.right_hand_visible}")
-    print(f"  Face touch detected: {results.face_touch_detected}")
-    print(f"  Face touch count: {results.face_touch_count}")
-    print(f"  Active gestures: {results.active_gesture_count}")
-    print(f"  Gesture frequency: {results.gesture_frequency:.2f}/min")
-    print(f"  Activity level: {results.hand_activity_level}")
-    print(f"  Left hand above shoulders: {results.left_hand_above_shoulders}")
-    print(f"  Right hand above shoulders: {results.right_hand_above_shoulders}")
+    # Print results (one write for the whole block)
+    print("\n".join([
+        f"\n📊 Results:",
+        f"  Left hand visible: {results.left_hand_visible}",
+        f"  Right hand visible: {results.right_hand_visible}",
+        f"  Face touch detected: {results.face_touch_detected}",
+        f"  Face touch count: {results.face_touch_count}",
+        f"  Active gestures: {results.active_gesture_count}",
+        f"  Gesture frequency: {results.gesture_frequency:.2f}/min",
+        f"  Activity level: {results.hand_activity_level}",
+        f"  Left hand above shoulders: {results.left_hand_above_shoulders}",
+        f"  Right hand above shoulders: {results.right_hand_above_shoulders}"
+    ]))
     
     # Check expectations
     passed = True
@@ -118,6 +147,41 @@ def test_scenario(analyzer: GestureAnalyzer, scenario: str, expected_results: di
     return passed
 
 
+def test_batch_matches_sequential():
+    """analyze_batch must match per-frame analyze() calls for every scenario."""
+    print(f"\n{'='*60}")
+    print("Testing: BATCH VS SEQUENTIAL")
+    print(f"{'='*60}")
+    
+    passed = True
+    for scenario in _HAND_TEMPLATES:
+        left_hands, right_hands, nose_points, shoulder_ys, timestamps = build_frames(scenario)
+        sequential = GestureAnalyzer()
+        batched = GestureAnalyzer()
+        
+        for i, timestamp in enumerate(timestamps.tolist()):
+            expected = sequential.analyze(
+                left_hand_landmarks=left_hands[i] if left_hands is not None else None,
+                right_hand_landmarks=right_hands[i] if right_hands is not None else None,
+                nose_landmark=Landmark(*nose_points[i].tolist()),
+                shoulder_y=float(shoulder_ys[i]),
+                timestamp=timestamp
+            )
+        actual = batched.analyze_batch(left_hands, right_hands, nose_points, shoulder_ys, timestamps)
+        
+        if (actual != expected or
+                list(batched.left_hand_history) != list(sequential.left_hand_history) or
+                list(batched.right_hand_history) != list(sequential.right_hand_history) or
+                batched.total_gestures != sequential.total_gestures):
+            print(f"\n❌ FAIL - {scenario}: batch {actual} != sequential {expected}")
+            passed = False
+    
+    if passed:
+        print(f"\n✅ PASS - Batch results match sequential analysis!")
+    
+    return passed
+
+
 def main():
     """Run all gesture analyzer tests."""
     print("="*60)
@@ -188,6 +252,8 @@ def main():
         passed = test_scenario(analyzer, scenario, expected)
         results.append((scenario, passed))
     
+    results.append(("batch_matches_sequential", test_batch_matches_sequential()))
+    
     # Test session summary
     print(f"\n{'='*60}")
     print("SESSION SUMMARY TEST")
@@ -4,15 +4,52 @@ Test script to verify Google Cloud Audio setup
 Run this before starting the app to ensure everything is configured correctly.
 """
 
+import base64
+import json
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+# In-memory service account credentials from GOOGLE_APPLICATION_CREDENTIALS_JSON;
+# None lets the clients use the default credential lookup
+_credentials = None
+
+@lru_cache(maxsize=1)
+def _tts_client():
+    """Create the Text-to-Speech client once and share it between callers"""
+    from google.cloud import texttospeech
+    return texttospeech.TextToSpeechClient(credentials=_credentials)
+
+@lru_cache(maxsize=1)
+def _stt_client():
+    """Create the Speech-to-Text client once and share it between callers"""
+    from google.cloud import speech
+    return speech.SpeechClient(credentials=_credentials)
 
 def test_credentials():
     """Check if credentials are set and LOAD them"""
+    global _credentials
     print("=" * 60)
     print("TESTING GOOGLE CLOUD CREDENTIALS")
     print("=" * 60)
     
+    # 0. Service account JSON (raw or base64) passed directly in the environment
+    creds_json = os.getenv("GOOGLE_APPLICATION_CREDENTIALS_JSON")
+    if creds_json:
+        try:
+            from google.oauth2 import service_account
+            if not creds_json.lstrip().startswith("{"):
+                creds_json = base64.b64decode(creds_json)
+            _credentials = service_account.Credentials.from_service_account_info(
+                json.loads(creds_json)
+            )
+        except Exception as e:
+            print(f"❌ Invalid GOOGLE_APPLICATION_CREDENTIALS_JSON: {e}")
+            return False
+        print("✅ Loaded service account from GOOGLE_APPLICATION_CREDENTIALS_JSON")
+        return True
+    
     # 1. Check if environment variable is already set
     creds_path = os.getenv("GOOGLE_APPLICATION_CREDENTIALS")
     if creds_path:
@@ -41,21 +78,21 @@ def test_credentials():
     print("   Place google_credentials.json in project root")
     return False
 
-def test_tts():
+def test_tts(log=print):
     """Test Text-to-Speech connection"""
-    print("\n" + "=" * 60)
-    print("TESTING TEXT-TO-SPEECH (TTS)")
-    print("=" * 60)
+    log("\n" + "=" * 60)
+    log("TESTING TEXT-TO-SPEECH (TTS)")
+    log("=" * 60)
     
     try:
         from google.cloud import texttospeech
         
         # Explicitly print what authentication method is being used
-        if not os.getenv("GOOGLE_APPLICATION_CREDENTIALS"):
-             print("⚠️  Warning: No credential env var set. Library will look for default credentials.")
+        if _credentials is None and not os.getenv("GOOGLE_APPLICATION_CREDENTIALS"):
+             log("⚠️  Warning: No credential env var set. Library will look for default credentials.")
 
-        client = texttospeech.TextToSpeechClient()
-        print("✅ Google Cloud Text-to-Speech: CONNECTED")
+        client = _tts_client()
+        log("✅ Google Cloud Text-to-Speech: CONNECTED")
         
         # Test synthesis
         synthesis_input = texttospeech.SynthesisInput(text="Test")
@@ -75,61 +112,60 @@ def test_tts():
         )
         
         if response.audio_content:
-            print("✅ TTS synthesis test: SUCCESS")
-            print(f"   Generated {len(response.audio_content)} bytes of audio")
+            log("✅ TTS synthesis test: SUCCESS")
+            log(f"   Generated {len(response.audio_content)} bytes of audio")
             return True
         else:
-            print("❌ TTS synthesis test: FAILED (no audio generated)")
+            log("❌ TTS synthesis test: FAILED (no audio generated)")
             return False
             
     except ImportError:
-        print("❌ google-cloud-texttospeech not installed")
-        print("   Run: pip install google-cloud-texttospeech")
+        log("❌ google-cloud-texttospeech not installed")
+        log("   Run: pip install google-cloud-texttospeech")
         return False
     except Exception as e:
-        print(f"❌ TTS Error: {e}")
+        log(f"❌ TTS Error: {e}")
         return False
 
-def test_stt():
+def test_stt(log=print):
     """Test Speech-to-Text connection"""
-    print("\n" + "=" * 60)
-    print("TESTING SPEECH-TO-TEXT (STT)")
-    print("=" * 60)
+    log("\n" + "=" * 60)
+    log("TESTING SPEECH-TO-TEXT (STT)")
+    log("=" * 60)
     
     try:
-        from google.cloud import speech
-        client = speech.SpeechClient()
-        print("✅ Google Cloud Speech-to-Text: CONNECTED")
+        client = _stt_client()
+        log("✅ Google Cloud Speech-to-Text: CONNECTED")
         
         # Just verify the client initializes
-        print("✅ STT client initialization: SUCCESS")
+        log("✅ STT client initialization: SUCCESS")
         return True
             
     except ImportError:
-        print("❌ google-cloud-speech not installed")
-        print("   Run: pip install google-cloud-speech")
+        log("❌ google-cloud-speech not installed")
+        log("   Run: pip install google-cloud-speech")
         return False
     except Exception as e:
-        print(f"❌ STT Error: {e}")
+        log(f"❌ STT Error: {e}")
         return False
 
-def test_fallbacks():
+def test_fallbacks(log=print):
     """Test fallback audio libraries"""
-    print("\n" + "=" * 60)
-    print("TESTING FALLBACK AUDIO LIBRARIES")
-    print("=" * 60)
+    log("\n" + "=" * 60)
+    log("TESTING FALLBACK AUDIO LIBRARIES")
+    log("=" * 60)
     
     try:
         from gtts import gTTS
-        print("✅ gTTS (fallback TTS): Available")
+        log("✅ gTTS (fallback TTS): Available")
     except ImportError:
-        print("❌ gTTS not installed")
+        log("❌ gTTS not installed")
     
     try:
         import speech_recognition as sr
-        print("✅ SpeechRecognition (fallback STT): Available")
+        log("✅ SpeechRecognition (fallback STT): Available")
     except ImportError:
-        print("❌ SpeechRecognition not installed")
+        log("❌ SpeechRecognition not installed")
 
 def main():
     print("\n🎤 INTERVIEW MIRROR - GOOGLE CLOUD AUDIO TEST\n")
@@ -141,12 +177,14 @@ def main():
         print("\n❌ CRITICAL: No credentials found!")
         sys.exit(1)
     
-    # Test Google Cloud services
-    tts_ok = test_tts()
-    stt_ok = test_stt()
-    
-    # Test fallbacks
-    test_fallbacks()
+    # Run the service and fallback checks concurrently, each logging into its
+    # own buffer, then print the logs in the usual order
+    checks = (test_tts, test_stt, test_fallbacks)
+    logs = [[] for _ in checks]
+    with ThreadPoolExecutor(max_workers=len(checks)) as pool:
+        futures = [pool.submit(check, log.append) for check, log in zip(checks, logs)]
+    tts_ok, stt_ok, _ = (future.result() for future in futures)
+    print("\n".join(line for log in logs for line in log))
     
     # Summary
     print("\n" + "=" * 60)
@@ -3,11 +3,31 @@ Test script for HolisticProcessor
 Tests MediaPipe Holistic integration with webcam or test image
 """
 
+import atexit
 import cv2
 import numpy as np
+from functools import lru_cache
 from engine.holistic_processor import HolisticProcessor
 import time
 
+# Display refresh interval (30 FPS cap) for the webcam window
+DISPLAY_INTERVAL = 1 / 30
+
+# Blank 640x480 BGR frame shared by every test; read-only so no test can dirty it
+TEST_FRAME = np.zeros((480, 640, 3), dtype=np.uint8)
+TEST_FRAME.setflags(write=False)
+
+
+@lru_cache(maxsize=1)
+def _shared_processor() -> HolisticProcessor:
+    """
+    Build the HolisticProcessor shared by the static image and performance
+    tests once, releasing it when the interpreter exits.
+    """
+    processor = HolisticProcessor(enable_frame_skip=False)
+    atexit.register(processor.release)
+    return processor
+
 
 def test_with_webcam():
     """Test HolisticProcessor with live webcam feed."""
@@ -29,8 +49,15 @@ def test_with_webcam():
         print("❌ Error: Could not open webcam")
         return
     
+    # MJPG at 640x480 with a one-frame driver buffer so reads return the newest frame
+    cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*'MJPG'))
+    cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
+    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
+    cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+    
     frame_count = 0
     start_time = time.time()
+    next_show = 0.0  # perf_counter time of the next display refresh
     
     try:
         while True:
@@ -42,31 +69,32 @@ def test_with_webcam():
             # Process frame
             results = processor.process_frame(frame)
             frame_count += 1
+            stats = processor.get_performance_stats()
             
-            # Display results
-            print(f"\n--- Frame {results.frame_number} ---")
-            print(f"Timestamp: {results.timestamp:.3f}s")
-            print(f"Pose landmarks: {'✅ Detected' if results.pose_landmarks else '❌ Not detected'} "
-                  f"({len(results.pose_landmarks) if results.pose_landmarks else 0} points)")
-            print(f"Face landmarks: {'✅ Detected' if results.face_landmarks else '❌ Not detected'} "
-                  f"({len(results.face_landmarks) if results.face_landmarks else 0} points)")
-            print(f"Left hand: {'✅ Detected' if results.left_hand_landmarks else '❌ Not detected'} "
-                  f"({len(results.left_hand_landmarks) if results.left_hand_landmarks else 0} points)")
-            print(f"Right hand: {'✅ Detected' if results.right_hand_landmarks else '❌ Not detected'} "
-                  f"({len(results.right_hand_landmarks) if results.right_hand_landmarks else 0} points)")
+            # Display results (one write per frame)
+            lines = [
+                f"\n--- Frame {results.frame_number} ---",
+                f"Timestamp: {results.timestamp:.3f}s",
+            ]
+            for label, landmarks in (("Pose landmarks", results.pose_landmarks),
+                                     ("Face landmarks", results.face_landmarks),
+                                     ("Left hand", results.left_hand_landmarks),
+                                     ("Right hand", results.right_hand_landmarks)):
+                lines.append(f"{label}: {'✅ Detected' if landmarks else '❌ Not detected'} "
+                             f"({len(landmarks) if landmarks else 0} points)")
             
             # Show performance stats every 30 frames
             if frame_count % 30 == 0:
-                stats = processor.get_performance_stats()
-                print(f"\n📊 Performance Stats:")
-                print(f"   FPS: {stats['fps']}")
-                print(f"   Avg Process Time: {stats['avg_process_time_ms']}ms")
-                print(f"   Frames Processed: {stats['frames_processed']}")
-                print(f"   Frame Skip: {'Enabled' if stats['frame_skip_enabled'] else 'Disabled'}")
-            
-            # Draw on frame for visualization
-            display_frame = frame.copy()
+                lines += [
+                    f"\n📊 Performance Stats:",
+                    f"   FPS: {stats['fps']}",
+                    f"   Avg Process Time: {stats['avg_process_time_ms']}ms",
+                    f"   Frames Processed: {stats['frames_processed']}",
+                    f"   Frame Skip: {'Enabled' if stats['frame_skip_enabled'] else 'Disabled'}",
+                ]
+            print("\n".join(lines))
             
+            # Draw directly on the captured frame; process_frame is done with it
             # Draw pose landmarks if detected
             if results.pose_landmarks:
                 # Draw shoulders (landmarks 11 and 12)
@@ -77,26 +105,27 @@ def test_with_webcam():
                 ls_x, ls_y = int(left_shoulder.x * w), int(left_shoulder.y * h)
                 rs_x, rs_y = int(right_shoulder.x * w), int(right_shoulder.y * h)
                 
-                cv2.circle(display_frame, (ls_x, ls_y), 10, (0, 255, 0), -1)
-                cv2.circle(display_frame, (rs_x, rs_y), 10, (0, 255, 0), -1)
-                cv2.line(display_frame, (ls_x, ls_y), (rs_x, rs_y), (0, 255, 0), 2)
+                cv2.circle(frame, (ls_x, ls_y), 10, (0, 255, 0), -1)
+                cv2.circle(frame, (rs_x, rs_y), 10, (0, 255, 0), -1)
+                cv2.line(frame, (ls_x, ls_y), (rs_x, rs_y), (0, 255, 0), 2)
                 
                 # Draw nose (landmark 0)
                 nose = results.pose_landmarks[0]
                 nose_x, nose_y = int(nose.x * w), int(nose.y * h)
-                cv2.circle(display_frame, (nose_x, nose_y), 8, (255, 0, 0), -1)
+                cv2.circle(frame, (nose_x, nose_y), 8, (255, 0, 0), -1)
             
             # Add status text
-            status_text = f"FPS: {processor.get_performance_stats()['fps']:.1f}"
-            cv2.putText(display_frame, status_text, (10, 30), 
+            status_text = f"FPS: {stats['fps']:.1f}"
+            cv2.putText(frame, status_text, (10, 30), 
                        cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
             
-            # Show frame
-            cv2.imshow('HolisticProcessor Test', display_frame)
-            
-            # Check for quit
-            if cv2.waitKey(1) & 0xFF == ord('q'):
-                break
+            # Show frame and check for quit at display rate only
+            now = time.perf_counter()
+            if now >= next_show:
+                next_show = now + DISPLAY_INTERVAL
+                cv2.imshow('HolisticProcessor Test', frame)
+                if cv2.waitKey(1) & 0xFF == ord('q'):
+                    break
                 
     except KeyboardInterrupt:
         print("\n⚠️ Interrupted by user")
@@ -121,14 +150,11 @@ def test_with_static_image():
     """Test HolisticProcessor with a static test image."""
     print("🖼️ Testing HolisticProcessor with static image...")
     
-    # Create a simple test image (black frame)
-    test_frame = np.zeros((480, 640, 3), dtype=np.uint8)
-    
-    # Initialize processor
-    processor = HolisticProcessor()
+    # Shared processor (models are loaded once per run)
+    processor = _shared_processor()
     
     # Process frame
-    results = processor.process_frame(test_frame)
+    results = processor.process_frame(TEST_FRAME)
     
     print(f"\n--- Results ---")
     print(f"Frame number: {results.frame_number}")
@@ -146,7 +172,6 @@ def test_with_static_image():
         print(f"   z: {nose.z:.4f}")
         print(f"   visibility: {nose.visibility:.4f}")
     
-    processor.release()
     print("\n✅ Static image test completed!")
 
 
@@ -154,17 +179,14 @@ def test_performance():
     """Test processing performance with multiple frames."""
     print("⚡ Testing HolisticProcessor performance...")
     
-    processor = HolisticProcessor(enable_frame_skip=False)
-    
-    # Create test frame
-    test_frame = np.zeros((480, 640, 3), dtype=np.uint8)
+    processor = _shared_processor()
     
     # Process 100 frames
     num_frames = 100
     start_time = time.time()
     
     for i in range(num_frames):
-        results = processor.process_frame(test_frame)
+        results = processor.process_frame(TEST_FRAME)
         if (i + 1) % 20 == 0:
             print(f"Processed {i + 1}/{num_frames} frames...")
     
@@ -179,7 +201,6 @@ def test_performance():
     print(f"   Average FPS: {fps:.2f}")
     print(f"   Avg process time: {stats['avg_process_time_ms']:.2f}ms")
     
-    processor.release()
     print("\n✅ Performance test completed!")
 
 
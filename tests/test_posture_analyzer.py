@@ -4,87 +4,101 @@ Test script for PostureAnalyzer - specifically arms-crossed detection.
 
 import sys
 import math
-from engine.analyzers.posture_analyzer import PostureAnalyzer, Landmark, PostureMetrics
+import numpy as np
+from engine.analyzers.posture_analyzer import PostureAnalyzer, PostureMetrics
+
+
+# Base landmarks (33 points for MediaPipe Pose): rows of x, y, z, visibility
+_BASE_LANDMARKS = np.tile([0.5, 0.5, 0.0, 1.0], (33, 1))
+
+# Per-scenario overrides: rows of (index, x, y, z, visibility)
+_SCENARIOS = {
+    # Normal sitting position - arms at sides
+    "arms_open": np.array([
+        [0,  0.50, 0.30, 0, 1.0],  # Nose
+        [11, 0.35, 0.50, 0, 1.0],  # Left shoulder
+        [12, 0.65, 0.50, 0, 1.0],  # Right shoulder
+        [13, 0.30, 0.65, 0, 1.0],  # Left elbow
+        [14, 0.70, 0.65, 0, 1.0],  # Right elbow
+        [15, 0.25, 0.75, 0, 1.0],  # Left wrist (left side)
+        [16, 0.75, 0.75, 0, 1.0],  # Right wrist (right side)
+        [23, 0.40, 0.85, 0, 1.0],  # Left hip
+        [24, 0.60, 0.85, 0, 1.0],  # Right hip
+    ]),
+    # Arms crossed in front of chest
+    "arms_crossed": np.array([
+        [0,  0.50, 0.30, 0, 1.0],  # Nose
+        [11, 0.35, 0.50, 0, 1.0],  # Left shoulder
+        [12, 0.65, 0.50, 0, 1.0],  # Right shoulder
+        [13, 0.40, 0.60, 0, 1.0],  # Left elbow
+        [14, 0.60, 0.60, 0, 1.0],  # Right elbow
+        [15, 0.60, 0.58, 0, 1.0],  # Left wrist (near RIGHT shoulder)
+        [16, 0.40, 0.58, 0, 1.0],  # Right wrist (near LEFT shoulder)
+        [23, 0.40, 0.85, 0, 1.0],  # Left hip
+        [24, 0.60, 0.85, 0, 1.0],  # Right hip
+    ]),
+    # Hands resting in lap - should NOT trigger crossed
+    "hands_in_lap": np.array([
+        [0,  0.50, 0.30, 0, 1.0],  # Nose
+        [11, 0.35, 0.50, 0, 1.0],  # Left shoulder
+        [12, 0.65, 0.50, 0, 1.0],  # Right shoulder
+        [13, 0.30, 0.65, 0, 1.0],  # Left elbow
+        [14, 0.70, 0.65, 0, 1.0],  # Right elbow
+        [15, 0.45, 0.90, 0, 1.0],  # Left wrist (in lap, below hips)
+        [16, 0.55, 0.90, 0, 1.0],  # Right wrist (in lap, below hips)
+        [23, 0.40, 0.85, 0, 1.0],  # Left hip
+        [24, 0.60, 0.85, 0, 1.0],  # Right hip
+    ]),
+    # One hand up gesturing - should NOT trigger crossed
+    "gesturing": np.array([
+        [0,  0.50, 0.30, 0, 1.0],  # Nose
+        [11, 0.35, 0.50, 0, 1.0],  # Left shoulder
+        [12, 0.65, 0.50, 0, 1.0],  # Right shoulder
+        [13, 0.25, 0.45, 0, 1.0],  # Left elbow
+        [14, 0.70, 0.65, 0, 1.0],  # Right elbow
+        [15, 0.20, 0.35, 0, 1.0],  # Left wrist (up, gesturing)
+        [16, 0.75, 0.75, 0, 1.0],  # Right wrist (at side)
+        [23, 0.40, 0.85, 0, 1.0],  # Left hip
+        [24, 0.60, 0.85, 0, 1.0],  # Right hip
+    ]),
+    # Leaning left - shoulders tilted
+    "leaning_left": np.array([
+        [0,  0.50, 0.30, 0, 1.0],  # Nose
+        [11, 0.35, 0.45, 0, 1.0],  # Left shoulder (higher)
+        [12, 0.65, 0.55, 0, 1.0],  # Right shoulder (lower)
+        [13, 0.30, 0.65, 0, 1.0],  # Left elbow
+        [14, 0.70, 0.65, 0, 1.0],  # Right elbow
+        [15, 0.25, 0.75, 0, 1.0],  # Left wrist
+        [16, 0.75, 0.75, 0, 1.0],  # Right wrist
+        [23, 0.40, 0.85, 0, 1.0],  # Left hip
+        [24, 0.60, 0.85, 0, 1.0],  # Right hip
+    ]),
+    # Slouching - nose closer to shoulders
+    "slouching": np.array([
+        [0,  0.50, 0.45, 0, 1.0],  # Nose (lower than normal)
+        [11, 0.35, 0.50, 0, 1.0],  # Left shoulder
+        [12, 0.65, 0.50, 0, 1.0],  # Right shoulder
+        [13, 0.30, 0.65, 0, 1.0],  # Left elbow
+        [14, 0.70, 0.65, 0, 1.0],  # Right elbow
+        [15, 0.25, 0.75, 0, 1.0],  # Left wrist
+        [16, 0.75, 0.75, 0, 1.0],  # Right wrist
+        [23, 0.40, 0.85, 0, 1.0],  # Left hip
+        [24, 0.60, 0.85, 0, 1.0],  # Right hip
+    ]),
+}
 
 
 def create_test_landmarks(scenario: str):
-    """Create synthetic pose landmarks for different scenarios."""
-    
-    # Base landmarks (33 points for MediaPipe Pose)
-    landmarks = [Landmark(0.5, 0.5, 0, 1.0) for _ in range(33)]
-    
-    if scenario == "arms_open":
-        # Normal sitting position - arms at sides
-        landmarks[0] = Landmark(0.5, 0.3, 0, 1.0)   # Nose
-        landmarks[11] = Landmark(0.35, 0.5, 0, 1.0)  # Left shoulder
-        landmarks[12] = Landmark(0.65, 0.5, 0, 1.0)  # Right shoulder
-        landmarks[13] = Landmark(0.30, 0.65, 0, 1.0) # Left elbow
-        landmarks[14] = Landmark(0.70, 0.65, 0, 1.0) # Right elbow
-        landmarks[15] = Landmark(0.25, 0.75, 0, 1.0) # Left wrist (left side)
-        landmarks[16] = Landmark(0.75, 0.75, 0, 1.0) # Right wrist (right side)
-        landmarks[23] = Landmark(0.40, 0.85, 0, 1.0) # Left hip
-        landmarks[24] = Landmark(0.60, 0.85, 0, 1.0) # Right hip
-        
-    elif scenario == "arms_crossed":
-        # Arms crossed in front of chest
-        landmarks[0] = Landmark(0.5, 0.3, 0, 1.0)   # Nose
-        landmarks[11] = Landmark(0.35, 0.5, 0, 1.0)  # Left shoulder
-        landmarks[12] = Landmark(0.65, 0.5, 0, 1.0)  # Right shoulder
-        landmarks[13] = Landmark(0.40, 0.60, 0, 1.0) # Left elbow
-        landmarks[14] = Landmark(0.60, 0.60, 0, 1.0) # Right elbow
-        landmarks[15] = Landmark(0.60, 0.58, 0, 1.0) # Left wrist (near RIGHT shoulder)
-        landmarks[16] = Landmark(0.40, 0.58, 0, 1.0) # Right wrist (near LEFT shoulder)
-        landmarks[23] = Landmark(0.40, 0.85, 0, 1.0) # Left hip
-        landmarks[24] = Landmark(0.60, 0.85, 0, 1.0) # Right hip
-        
-    elif scenario == "hands_in_lap":
-        # Hands resting in lap - should NOT trigger crossed
-        landmarks[0] = Landmark(0.5, 0.3, 0, 1.0)   # Nose
-        landmarks[11] = Landmark(0.35, 0.5, 0, 1.0)  # Left shoulder
-        landmarks[12] = Landmark(0.65, 0.5, 0, 1.0)  # Right shoulder
-        landmarks[13] = Landmark(0.30, 0.65, 0, 1.0) # Left elbow
-        landmarks[14] = Landmark(0.70, 0.65, 0, 1.0) # Right elbow
-        landmarks[15] = Landmark(0.45, 0.90, 0, 1.0) # Left wrist (in lap, below hips)
-        landmarks[16] = Landmark(0.55, 0.90, 0, 1.0) # Right wrist (in lap, below hips)
-        landmarks[23] = Landmark(0.40, 0.85, 0, 1.0) # Left hip
-        landmarks[24] = Landmark(0.60, 0.85, 0, 1.0) # Right hip
-        
-    elif scenario == "gesturing":
-        # One hand up gesturing - should NOT trigger crossed
-        landmarks[0] = Landmark(0.5, 0.3, 0, 1.0)   # Nose
-        landmarks[11] = Landmark(0.35, 0.5, 0, 1.0)  # Left shoulder
-        landmarks[12] = Landmark(0.65, 0.5, 0, 1.0)  # Right shoulder
-        landmarks[13] = Landmark(0.25, 0.45, 0, 1.0) # Left elbow
-        landmarks[14] = Landmark(0.70, 0.65, 0, 1.0) # Right elbow
-        landmarks[15] = Landmark(0.20, 0.35, 0, 1.0) # Left wrist (up, gesturing)
-        landmarks[16] = Landmark(0.75, 0.75, 0, 1.0) # Right wrist (at side)
-        landmarks[23] = Landmark(0.40, 0.85, 0, 1.0) # Left hip
-        landmarks[24] = Landmark(0.60, 0.85, 0, 1.0) # Right hip
-        
-    elif scenario == "leaning_left":
-        # Leaning left - shoulders tilted
-        landmarks[0] = Landmark(0.5, 0.3, 0, 1.0)   # Nose
-        landmarks[11] = Landmark(0.35, 0.45, 0, 1.0) # Left shoulder (higher)
-        landmarks[12] = Landmark(0.65, 0.55, 0, 1.0) # Right shoulder (lower)
-        landmarks[13] = Landmark(0.30, 0.65, 0, 1.0) # Left elbow
-        landmarks[14] = Landmark(0.70, 0.65, 0, 1.0) # Right elbow
-        landmarks[15] = Landmark(0.25, 0.75, 0, 1.0) # Left wrist
-        landmarks[16] = Landmark(0.75, 0.75, 0, 1.0) # Right wrist
-        landmarks[23] = Landmark(0.40, 0.85, 0, 1.0) # Left hip
-        landmarks[24] = Landmark(0.60, 0.85, 0, 1.0) # Right hip
-        
-    elif scenario == "slouching":
-        # Slouching - nose closer to shoulders
-        landmarks[0] = Landmark(0.5, 0.45, 0, 1.0)   # Nose (lower than normal)
-        landmarks[11] = Landmark(0.35, 0.5, 0, 1.0)  # Left shoulder
-        landmarks[12] = Landmark(0.65, 0.5, 0, 1.0)  # Right shoulder
-        landmarks[13] = Landmark(0.30, 0.65, 0, 1.0) # Left elbow
-        landmarks[14] = Landmark(0.70, 0.65, 0, 1.0) # Right elbow
-        landmarks[15] = Landmark(0.25, 0.75, 0, 1.0) # Left wrist
-        landmarks[16] = Landmark(0.75, 0.75, 0, 1.0) # Right wrist
-        landmarks[23] = Landmark(0.40, 0.85, 0, 1.0) # Left hip
-        landmarks[24] = Landmark(0.60, 0.85, 0, 1.0) # Right hip
-    
+    """
+    Create synthetic pose landmarks for different scenarios.
+    
+    Returns a (33, 4) array of x, y, z, visibility rows, which
+    PostureAnalyzer accepts directly.
+    """
+    landmarks = _BASE_LANDMARKS.copy()
+    overrides = _SCENARIOS.get(scenario)
+    if overrides is not None:
+        landmarks[overrides[:, 0].astype(int)] = overrides[:, 1:]
     return landmarks
 
 
@@ -97,10 +111,10 @@ def test_scenario(analyzer: PostureAnalyzer, scenario: str, expected_crossed: bo
     
     landmarks = create_test_landmarks(scenario)
     
-    # Run analysis multiple times to fill temporal buffer
-    results = None
-    for i in range(15):  # More than arms_crossed_frames (10)
-        results = analyzer.analyze(landmarks, timestamp=float(i))
+    # Fill temporal buffer with 14 identical frames, then analyze the 15th
+    # (more than arms_crossed_frames (10))
+    analyzer.prefill(landmarks, 14)
+    results = analyzer.analyze(landmarks, timestamp=14.0)
     
     # Print results
     print(f"\n📊 Results:")
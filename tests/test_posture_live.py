@@ -5,92 +5,96 @@ Press 'q' to quit.
 
 import cv2
 import mediapipe as mp
+import numpy as np
+import threading
 import time
-from engine.analyzers.posture_analyzer import PostureAnalyzer, Landmark
+from engine.analyzers.posture_analyzer import PostureAnalyzer
+from engine.analyzers.landmarks import as_array
+from engine.frame_capture import LatestFrameSlot, capture_frames
 
 
-def mediapipe_to_landmark(mp_landmark) -> Landmark:
-    """Convert MediaPipe landmark to our Landmark format."""
-    return Landmark(
-        x=mp_landmark.x,
-        y=mp_landmark.y,
-        z=mp_landmark.z,
-        visibility=mp_landmark.visibility if hasattr(mp_landmark, 'visibility') else 1.0
-    )
+# Draw the overlay on a cv2.UMat (OpenCV T-API) when an OpenCL device is available
+USE_OPENCL = cv2.ocl.haveOpenCL()
 
+# Text background panel: the (10, 10)-(450, 300) box, inclusive
+PANEL_TOP, PANEL_LEFT = 10, 10
+PANEL_HEIGHT, PANEL_WIDTH = 291, 441
+_DARK = np.zeros((PANEL_HEIGHT, PANEL_WIDTH, 3), np.uint8)
 
-def draw_metrics(frame, metrics, fps, is_calibrated):
-    """Draw posture metrics on the frame."""
-    h, w = frame.shape[:2]
-    
-    # Semi-transparent overlay for text background
-    overlay = frame.copy()
-    cv2.rectangle(overlay, (10, 10), (450, 300), (0, 0, 0), -1)
-    frame = cv2.addWeighted(overlay, 0.6, frame, 0.4, 0)
+# Fonts and BGR colors shared by every overlay draw call (plain tuples: OpenCV
+# converts them to cv::Scalar at least as fast as NumPy arrays)
+FONT = cv2.FONT_HERSHEY_SIMPLEX
+FONT_BOLD = cv2.FONT_HERSHEY_DUPLEX
+GREEN = (0, 255, 0)
+RED = (0, 0, 255)
+ORANGE = (0, 165, 255)
+YELLOW = (0, 255, 255)
+WHITE = (255, 255, 255)
+
+# Show at most 30 frames per second; processing runs at the capture rate
+DISPLAY_INTERVAL = 1 / 30
+
+# Metric rows start below the title/status lines and are 30px apart
+METRICS_X = 20
+METRICS_TOP = 100
+METRICS_STEP = 30
+
+
+def draw_metrics(frame, metrics, fps, is_calibrated, frame_shape=None):
+    """
+    Draw posture metrics on the frame (in place).
+    
+    frame may be a cv2.UMat, in which case frame_shape must be given.
+    """
+    h, w = (frame_shape or frame.shape)[:2]
+    
+    # Semi-transparent text background: dim only the panel region in place
+    rows = (PANEL_TOP, min(PANEL_TOP + PANEL_HEIGHT, h))
+    cols = (PANEL_LEFT, min(PANEL_LEFT + PANEL_WIDTH, w))
+    if isinstance(frame, cv2.UMat):
+        roi = cv2.UMat(frame, rows, cols)
+    else:
+        roi = frame[rows[0]:rows[1], cols[0]:cols[1]]
+    dark = _DARK[:rows[1] - rows[0], :cols[1] - cols[0]]
+    cv2.addWeighted(roi, 0.4, dark, 0.6, 0, dst=roi)
     
     # Title
-    cv2.putText(frame, "POSTURE ANALYSIS", (20, 40), 
-                cv2.FONT_HERSHEY_DUPLEX, 0.8, (255, 255, 255), 2)
+    cv2.putText(frame, "POSTURE ANALYSIS", (20, 40), FONT_BOLD, 0.8, WHITE, 2)
     
     # Calibration status
     if not is_calibrated:
-        cv2.putText(frame, "CALIBRATING... Sit upright!", (20, 70), 
-                    cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 255), 2)
-    else:
-        cv2.putText(frame, f"FPS: {fps:.1f}", (20, 70), 
-                    cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 1)
-    
-    y_offset = 100
-    
-    # Shoulder angle
-    angle_color = (0, 0, 255) if metrics.is_leaning else (0, 255, 0)
-    cv2.putText(frame, f"Shoulder Angle: {metrics.shoulder_angle:.1f}deg", 
-                (20, y_offset), cv2.FONT_HERSHEY_SIMPLEX, 0.6, angle_color, 2)
-    y_offset += 30
-    
-    # Leaning status
-    lean_text = "LEANING!" if metrics.is_leaning else "Level"
-    lean_color = (0, 0, 255) if metrics.is_leaning else (0, 255, 0)
-    cv2.putText(frame, f"Status: {lean_text}", 
-                (20, y_offset), cv2.FONT_HERSHEY_SIMPLEX, 0.6, lean_color, 2)
-    y_offset += 30
-    
-    # Slouch detection
-    slouch_color = (0, 165, 255) if metrics.is_slouching else (0, 255, 0)
-    slouch_text = f"Slouching: {'YES' if metrics.is_slouching else 'NO'} ({metrics.slouch_score:.2f})"
-    cv2.putText(frame, slouch_text, 
-                (20, y_offset), cv2.FONT_HERSHEY_SIMPLEX, 0.6, slouch_color, 2)
-    y_offset += 30
-    
-    # Arms crossed - BIG INDICATOR
-    if metrics.arms_crossed:
-        cv2.putText(frame, "ARMS CROSSED!", 
-                    (20, y_offset), cv2.FONT_HERSHEY_DUPLEX, 0.8, (0, 0, 255), 3)
-        # Also draw a big warning box
-        cv2.rectangle(frame, (w-250, 10), (w-10, 80), (0, 0, 255), 3)
-        cv2.putText(frame, "ARMS", (w-230, 40), 
-                    cv2.FONT_HERSHEY_DUPLEX, 0.8, (0, 0, 255), 2)
-        cv2.putText(frame, "CROSSED!", (w-230, 65), 
-                    cv2.FONT_HERSHEY_DUPLEX, 0.8, (0, 0, 255), 2)
+        cv2.putText(frame, "CALIBRATING... Sit upright!", (20, 70), FONT, 0.6, YELLOW, 2)
     else:
-        cv2.putText(frame, "Arms: Open", 
-                    (20, y_offset), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 0), 2)
-    y_offset += 30
-    
-    # Stability
-    stability_color = (0, 255, 0) if metrics.shoulder_stability > 0.8 else (0, 165, 255)
-    cv2.putText(frame, f"Stability: {metrics.shoulder_stability:.2f}", 
-                (20, y_offset), cv2.FONT_HERSHEY_SIMPLEX, 0.6, stability_color, 2)
-    y_offset += 30
+        cv2.putText(frame, f"FPS: {fps:.1f}", (20, 70), FONT, 0.6, WHITE, 1)
+    
+    # Metric rows: (text, color, font, scale, thickness)
+    rows = (
+        (f"Shoulder Angle: {metrics.shoulder_angle:.1f}deg",
+         RED if metrics.is_leaning else GREEN, FONT, 0.6, 2),
+        (f"Status: {'LEANING!' if metrics.is_leaning else 'Level'}",
+         RED if metrics.is_leaning else GREEN, FONT, 0.6, 2),
+        (f"Slouching: {'YES' if metrics.is_slouching else 'NO'} ({metrics.slouch_score:.2f})",
+         ORANGE if metrics.is_slouching else GREEN, FONT, 0.6, 2),
+        # Arms crossed - BIG INDICATOR
+        ("ARMS CROSSED!", RED, FONT_BOLD, 0.8, 3) if metrics.arms_crossed else
+        ("Arms: Open", GREEN, FONT, 0.6, 2),
+        (f"Stability: {metrics.shoulder_stability:.2f}",
+         GREEN if metrics.shoulder_stability > 0.8 else ORANGE, FONT, 0.6, 2),
+        (f"Rocking: {metrics.rocking_score:.2f}",
+         RED if metrics.rocking_score > 0.5 else GREEN, FONT, 0.6, 2),
+    )
+    for i, (text, color, font, scale, thickness) in enumerate(rows):
+        cv2.putText(frame, text, (METRICS_X, METRICS_TOP + i * METRICS_STEP),
+                    font, scale, color, thickness)
     
-    # Rocking score
-    rock_color = (0, 0, 255) if metrics.rocking_score > 0.5 else (0, 255, 0)
-    cv2.putText(frame, f"Rocking: {metrics.rocking_score:.2f}", 
-                (20, y_offset), cv2.FONT_HERSHEY_SIMPLEX, 0.6, rock_color, 2)
+    # Also draw a big warning box when arms are crossed
+    if metrics.arms_crossed:
+        cv2.rectangle(frame, (w-250, 10), (w-10, 80), RED, 3)
+        cv2.putText(frame, "ARMS", (w-230, 40), FONT_BOLD, 0.8, RED, 2)
+        cv2.putText(frame, "CROSSED!", (w-230, 65), FONT_BOLD, 0.8, RED, 2)
     
     # Instructions
-    cv2.putText(frame, "Press 'q' to quit", (20, h - 20), 
-                cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
+    cv2.putText(frame, "Press 'q' to quit", (20, h - 20), FONT, 0.5, WHITE, 1)
     
     return frame
 
@@ -128,6 +132,12 @@ def main():
         print("❌ Error: Could not open camera")
         return 1
     
+    # MJPG at 640x480 with a one-frame driver buffer so reads return the newest frame
+    cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*'MJPG'))
+    cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
+    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
+    cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+    
     print("✅ Camera opened successfully")
     print("\nInstructions:")
     print("  1. SIT UPRIGHT for the first few seconds (calibration)")
@@ -141,18 +151,34 @@ def main():
     fps = 0
     frame_count = 0
     start_time = time.time()
+    next_show = 0.0  # perf_counter time of the next display refresh
+    
+    # RGB scratch buffer, allocated by the first conversion and reused after
+    rgb_frame = None
+    
+    # Capture on its own thread so the next read overlaps MediaPipe inference;
+    # the slot keeps only the newest frame
+    frame_slot = LatestFrameSlot()
+    stop_event = threading.Event()
+    capture_thread = threading.Thread(
+        target=capture_frames, args=(cap, frame_slot, stop_event), daemon=True
+    )
+    capture_thread.start()
     
     while True:
-        ret, frame = cap.read()
+        item = frame_slot.take(timeout=0.1)
+        if item is None:
+            continue
+        ret, frame, _ = item
         if not ret:
             print("❌ Error: Could not read frame")
             break
         
-        # Flip frame horizontally for mirror view
-        frame = cv2.flip(frame, 1)
+        # Flip frame horizontally for mirror view (in place)
+        cv2.flip(frame, 1, dst=frame)
         
-        # Convert to RGB for MediaPipe
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        # Convert to RGB for MediaPipe into the reused buffer
+        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=rgb_frame)
         
         # Process with MediaPipe
         results = pose.process(rgb_frame)
@@ -166,11 +192,8 @@ def main():
                 landmark_drawing_spec=mp_drawing_styles.get_default_pose_landmarks_style()
             )
             
-            # Convert to our Landmark format
-            pose_landmarks = [
-                mediapipe_to_landmark(lm) 
-                for lm in results.pose_landmarks.landmark
-            ]
+            # Convert once to a (33, 4) array of x, y, z, visibility
+            pose_landmarks = as_array(results.pose_landmarks.landmark)
             
             # Analyze posture
             metrics = analyzer.analyze(pose_landmarks, time.time())
@@ -178,12 +201,14 @@ def main():
             # Check if calibrated
             is_calibrated = analyzer.baseline_nose_shoulder_dist is not None
             
-            # Draw metrics on frame
-            frame = draw_metrics(frame, metrics, fps, is_calibrated)
+            # Draw metrics on frame (on the GPU when OpenCL is available;
+            # MediaPipe drawing above needs the ndarray)
+            canvas = cv2.UMat(frame) if USE_OPENCL else frame
+            frame = draw_metrics(canvas, metrics, fps, is_calibrated, frame.shape)
         else:
             # No pose detected
             cv2.putText(frame, "No pose detected - step back from camera", 
-                       (50, 50), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 255), 2)
+                       (50, 50), FONT, 0.7, RED, 2)
         
         # Calculate FPS
         frame_count += 1
@@ -191,15 +216,18 @@ def main():
             elapsed = time.time() - start_time
             fps = frame_count / elapsed
         
-        # Show frame
-        cv2.imshow('Posture Analyzer - Live Test', frame)
-        
-        # Check for quit
-        if cv2.waitKey(1) & 0xFF == ord('q'):
-            print("\n✅ Test completed")
-            break
+        # Show frame and check for quit at display rate only
+        now = time.perf_counter()
+        if now >= next_show:
+            next_show = now + DISPLAY_INTERVAL
+            cv2.imshow('Posture Analyzer - Live Test', frame)
+            if cv2.waitKey(1) & 0xFF == ord('q'):
+                print("\n✅ Test completed")
+                break
     
     # Cleanup
+    stop_event.set()
+    capture_thread.join(timeout=1.0)
     cap.release()
     cv2.destroyAllWindows()
     pose.close()
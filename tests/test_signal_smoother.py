@@ -4,11 +4,34 @@ Tests jitter reduction and filter behavior
 """
 
 import numpy as np
-import matplotlib.pyplot as plt
+from functools import lru_cache
 from engine.signal_smoother import SignalSmoother, Landmark, OneEuroFilter
 import time
 
 
+def _new_smoother() -> SignalSmoother:
+    """Build a smoother with the parameters every test uses."""
+    return SignalSmoother(freq=30.0, min_cutoff=1.0, beta=0.0, d_cutoff=1.0)
+
+
+@lru_cache(maxsize=1)
+def _shared_smoother() -> SignalSmoother:
+    """Create the shared smoother on first use, not at import."""
+    return _new_smoother()
+
+
+def _get_smoother() -> SignalSmoother:
+    """
+    Return the shared smoother with all filter states reset.
+    
+    reset() keeps the per-type filter counts, so tests that assert on
+    get_filter_count() use their own _new_smoother() instead.
+    """
+    smoother = _shared_smoother()
+    smoother.reset()
+    return smoother
+
+
 def test_one_euro_filter_basic():
     """Test basic One Euro Filter functionality."""
     print("🧪 Testing One Euro Filter - Basic Functionality")
@@ -34,18 +57,21 @@ def test_one_euro_filter_basic():
     filter_obj.reset()
     print("\n2. Testing with noisy signal:")
     
-    np.random.seed(42)
-    raw_values = []
-    filtered_values = []
+    # Pregenerate timestamps and noise (same stream as a seeded per-frame draw)
+    num_frames = 50
+    t_arr = np.arange(num_frames) / 30.0
+    noise = np.random.RandomState(42).normal(0, 0.1, num_frames)
+    raw_values = np.empty(num_frames, dtype=np.float64)
+    filtered_values = np.empty(num_frames, dtype=np.float64)
     
-    for i in range(50):
-        t = i / 30.0
+    for i in range(num_frames):
+        t = t_arr[i]
         # Signal: sine wave + noise
-        raw = np.sin(2 * np.pi * 0.5 * t) + np.random.normal(0, 0.1)
+        raw = np.sin(2 * np.pi * 0.5 * t) + noise[i]
         filtered = filter_obj(raw, t)
         
-        raw_values.append(raw)
-        filtered_values.append(filtered)
+        raw_values[i] = raw
+        filtered_values[i] = filtered
     
     # Calculate noise reduction
     raw_std = np.std(np.diff(raw_values))
@@ -66,26 +92,27 @@ def test_signal_smoother_landmarks():
     print("=" * 60)
     
     # Create smoother
-    smoother = SignalSmoother(freq=30.0, min_cutoff=1.0, beta=0.0, d_cutoff=1.0)
+    smoother = _get_smoother()
     
     # Create synthetic landmark data with jitter
-    np.random.seed(42)
     num_frames = 30
+    t_arr = np.arange(num_frames) / 30.0
+    noise = np.random.RandomState(42).normal(0, 0.01, num_frames)
     
     print("\n1. Creating synthetic pose landmarks with jitter...")
     
-    raw_nose_x = []
-    smoothed_nose_x = []
+    raw_nose_x = np.empty(num_frames, dtype=np.float64)
+    smoothed_nose_x = np.empty(num_frames, dtype=np.float64)
     
     for frame in range(num_frames):
-        t = frame / 30.0
+        t = t_arr[frame]
         
         # Create pose landmarks (just nose for testing)
         # True position: slowly moving from 0.4 to 0.6
         true_x = 0.4 + 0.2 * (frame / num_frames)
         
         # Add camera jitter
-        noisy_x = true_x + np.random.normal(0, 0.01)
+        noisy_x = true_x + noise[frame]
         
         pose_landmarks = [
             Landmark(x=noisy_x, y=0.5, z=0.0, visibility=1.0)  # Nose
@@ -100,8 +127,8 @@ def test_signal_smoother_landmarks():
             timestamp=t
         )
         
-        raw_nose_x.append(noisy_x)
-        smoothed_nose_x.append(smoothed_pose[0].x)
+        raw_nose_x[frame] = noisy_x
+        smoothed_nose_x[frame] = smoothed_pose[0].x
     
     # Calculate jitter reduction
     raw_jitter = np.std(np.diff(raw_nose_x))
@@ -133,7 +160,8 @@ def test_signal_smoother_multiple_landmarks():
     print("\n\n🧪 Testing SignalSmoother - Multiple Landmark Types")
     print("=" * 60)
     
-    smoother = SignalSmoother(freq=30.0, min_cutoff=1.0, beta=0.0)
+    # Own smoother: the filter count must not depend on earlier tests
+    smoother = _new_smoother()
     
     # Create landmarks for all types
     pose_lms = [Landmark(x=0.5, y=0.5, z=0.0, visibility=1.0) for _ in range(33)]
@@ -174,7 +202,7 @@ def test_signal_smoother_missing_landmarks():
     print("\n\n🧪 Testing SignalSmoother - Missing Landmarks")
     print("=" * 60)
     
-    smoother = SignalSmoother(freq=30.0)
+    smoother = _get_smoother()
     
     # Test with some landmarks missing
     pose_lms = [Landmark(x=0.5, y=0.5, z=0.0, visibility=1.0)]
@@ -207,7 +235,7 @@ def test_performance():
     print("\n\n🧪 Testing SignalSmoother - Performance")
     print("=" * 60)
     
-    smoother = SignalSmoother(freq=30.0)
+    smoother = _get_smoother()
     
     # Create full landmark set
     pose_lms = [Landmark(x=0.5, y=0.5, z=0.0, visibility=1.0) for _ in range(33)]
@@ -248,6 +276,11 @@ def visualize_filtering(raw_values, filtered_values):
     print("\n\n📊 Creating visualization...")
     
     try:
+        # Imported here so the tests don't pay for matplotlib; Agg skips GUI init
+        import matplotlib
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+        
         plt.figure(figsize=(12, 6))
         
         # Plot raw vs filtered
@@ -2,10 +2,27 @@
 Comprehensive test for Task 5 completion - Stress Signal Detection System
 """
 
+import mmap
+import re
 import time
 import numpy as np
 from engine.vision_engine import VisionEngine
-from engine.analyzers.stress_analyzer import StressAnalyzer
+from engine.analyzers.stress_analyzer import StressAnalyzer, LEFT_EYE_INDICES, RIGHT_EYE_INDICES
+
+# Blank camera frame, allocated once and read-only
+TEST_FRAME = np.zeros((480, 640, 3), dtype=np.uint8)
+TEST_FRAME.setflags(write=False)
+
+# Stress UI markers the frontend must contain, matched in one regex pass
+STRESS_UI_ELEMENTS = (
+    'blink-rate',
+    'stress-level',
+    'lip-pursing',
+    'cognitive-load',
+    'analyzeStress',
+    'updateStressUI'
+)
+STRESS_UI_PATTERN = re.compile(b'|'.join(re.escape(e.encode()) for e in STRESS_UI_ELEMENTS))
 
 
 def test_task5_requirements():
@@ -16,102 +33,78 @@ def test_task5_requirements():
     print("✅ Testing Requirement 4.1: Eye Aspect Ratio calculation")
     analyzer = StressAnalyzer()
     
-    # Mock eye landmarks for EAR test
-    class MockLandmark:
-        def __init__(self, x, y):
-            self.x = x
-            self.y = y
-    
-    # Create eye landmarks with known EAR
-    eye_landmarks = [
-        MockLandmark(0.0, 0.5),   # p1 - left corner
-        MockLandmark(0.25, 0.4),  # p2 - top
-        MockLandmark(0.5, 0.4),   # p3 - top  
-        MockLandmark(0.75, 0.5),  # p4 - right corner
-        MockLandmark(0.5, 0.6),   # p5 - bottom
-        MockLandmark(0.25, 0.6)   # p6 - bottom
-    ]
-    
-    ear = analyzer._calculate_ear([(lm.x, lm.y) for lm in eye_landmarks])
+    # Create eye landmarks with known EAR, as (x, y) rows
+    eye_points = np.array([
+        [0.0, 0.5],    # p1 - left corner
+        [0.25, 0.4],   # p2 - top
+        [0.5, 0.4],    # p3 - top  
+        [0.75, 0.5],   # p4 - right corner
+        [0.5, 0.6],    # p5 - bottom
+        [0.25, 0.6]    # p6 - bottom
+    ])
+    
+    ear = analyzer._calculate_ear(eye_points)
     print(f"   EAR calculated: {ear:.3f}")
     assert 0.1 < ear < 0.5, "EAR should be in reasonable range"
     
     # Requirement 4.2: Blink detection when EAR < 0.2
     print("✅ Testing Requirement 4.2: Blink detection at EAR threshold 0.2")
     
-    # Test with EAR above threshold (no blink)
-    high_ear_landmarks = [MockLandmark(0, 0) for _ in range(468)]
+    # Test with EAR above threshold (no blink) - face coordinates built once
+    high_ear_landmarks = np.zeros((468, 2))
     
-    # Set left eye landmarks correctly
-    high_ear_landmarks[33] = MockLandmark(0.3, 0.4)    # p1 - left corner
-    high_ear_landmarks[160] = MockLandmark(0.35, 0.35) # p2 - top
-    high_ear_landmarks[158] = MockLandmark(0.37, 0.35) # p3 - top
-    high_ear_landmarks[133] = MockLandmark(0.4, 0.4)   # p4 - right corner
-    high_ear_landmarks[153] = MockLandmark(0.37, 0.45) # p5 - bottom
-    high_ear_landmarks[144] = MockLandmark(0.35, 0.45) # p6 - bottom
+    # Set left eye landmarks correctly: p1 corner, p2/p3 top, p4 corner, p5/p6 bottom
+    high_ear_landmarks[LEFT_EYE_INDICES] = [
+        [0.3, 0.4], [0.35, 0.35], [0.37, 0.35], [0.4, 0.4], [0.37, 0.45], [0.35, 0.45]
+    ]
     
     # Set right eye landmarks correctly
-    high_ear_landmarks[362] = MockLandmark(0.6, 0.4)   # p1 - right corner
-    high_ear_landmarks[387] = MockLandmark(0.65, 0.35) # p2 - top
-    high_ear_landmarks[385] = MockLandmark(0.67, 0.35) # p3 - top
-    high_ear_landmarks[263] = MockLandmark(0.7, 0.4)   # p4 - left corner
-    high_ear_landmarks[380] = MockLandmark(0.67, 0.45) # p5 - bottom
-    high_ear_landmarks[373] = MockLandmark(0.65, 0.45) # p6 - bottom
-    
-    metrics_open = analyzer.analyze(high_ear_landmarks)
+    high_ear_landmarks[RIGHT_EYE_INDICES] = [
+        [0.6, 0.4], [0.65, 0.35], [0.67, 0.35], [0.7, 0.4], [0.67, 0.45], [0.65, 0.45]
+    ]
+    
+    metrics_open = analyzer.analyze_array(high_ear_landmarks)
     print(f"   Open eyes (EAR {metrics_open.average_ear:.3f}): Blink = {metrics_open.blink_detected}")
     
-    # Test with EAR below threshold (blink) - eyes closed (same Y coordinates)
-    low_ear_landmarks = [MockLandmark(0, 0) for _ in range(468)]
-    
-    # Set left eye landmarks for closed eyes (all Y coordinates same = EAR near 0)
-    low_ear_landmarks[33] = MockLandmark(0.3, 0.4)    # p1 - left corner
-    low_ear_landmarks[160] = MockLandmark(0.35, 0.4)  # p2 - same Y (closed)
-    low_ear_landmarks[158] = MockLandmark(0.37, 0.4)  # p3 - same Y (closed)
-    low_ear_landmarks[133] = MockLandmark(0.4, 0.4)   # p4 - right corner
-    low_ear_landmarks[153] = MockLandmark(0.37, 0.4)  # p5 - same Y (closed)
-    low_ear_landmarks[144] = MockLandmark(0.35, 0.4)  # p6 - same Y (closed)
-    
-    # Set right eye landmarks for closed eyes
-    low_ear_landmarks[362] = MockLandmark(0.6, 0.4)   # p1 - right corner
-    low_ear_landmarks[387] = MockLandmark(0.65, 0.4)  # p2 - same Y (closed)
-    low_ear_landmarks[385] = MockLandmark(0.67, 0.4)  # p3 - same Y (closed)
-    low_ear_landmarks[263] = MockLandmark(0.7, 0.4)   # p4 - left corner
-    low_ear_landmarks[380] = MockLandmark(0.67, 0.4)  # p5 - same Y (closed)
-    low_ear_landmarks[373] = MockLandmark(0.65, 0.4)  # p6 - same Y (closed)
-    
-    metrics_closed = analyzer.analyze(low_ear_landmarks)
+    # Test with EAR below threshold (blink) - eyes closed (same Y coordinates = EAR near 0)
+    low_ear_landmarks = high_ear_landmarks.copy()
+    low_ear_landmarks[LEFT_EYE_INDICES, 1] = 0.4
+    low_ear_landmarks[RIGHT_EYE_INDICES, 1] = 0.4
+    
+    metrics_closed = analyzer.analyze_array(low_ear_landmarks)
     print(f"   Closed eyes (EAR {metrics_closed.average_ear:.3f}): Blink = {metrics_closed.blink_detected}")
     assert metrics_closed.blink_detected, "Should detect blink when EAR < 0.2"
     
     # Requirement 4.3: High cognitive load when blink rate > 30/min
     print("✅ Testing Requirement 4.3: Cognitive load detection at 30 blinks/min")
     
-    # Simulate rapid blinking to exceed threshold
+    # Simulate rapid blinking to exceed threshold on a virtual clock
     analyzer.reset()
+    frame_time = analyzer.session_start_time
     for i in range(35):  # 35 blinks in short time
         if i % 2 == 0:
-            analyzer.analyze(low_ear_landmarks)  # Closed
+            analyzer.analyze_array(low_ear_landmarks, timestamp=frame_time)  # Closed
         else:
-            analyzer.analyze(high_ear_landmarks)  # Open
-        time.sleep(0.01)  # Very fast to get high rate
+            analyzer.analyze_array(high_ear_landmarks, timestamp=frame_time)  # Open
+        frame_time += 0.01  # Very fast to get high rate
     
-    final_metrics = analyzer.analyze(high_ear_landmarks)
+    final_metrics = analyzer.analyze_array(high_ear_landmarks, timestamp=frame_time)
     print(f"   Blink rate: {final_metrics.blink_rate:.1f}/min, Cognitive load: {final_metrics.high_cognitive_load}")
     
     # Requirement 4.4 & 4.5: Lip compression detection
     print("✅ Testing Requirement 4.4 & 4.5: Lip compression detection")
     
     # Create landmarks with compressed lips
-    compressed_landmarks = [MockLandmark(0, 0) for _ in range(468)]
-    compressed_landmarks[13] = MockLandmark(0.5, 0.6)      # Upper lip
-    compressed_landmarks[14] = MockLandmark(0.5, 0.605)    # Lower lip (very close)
+    compressed_landmarks = np.zeros((468, 2))
+    compressed_landmarks[13] = [0.5, 0.6]      # Upper lip
+    compressed_landmarks[14] = [0.5, 0.605]    # Lower lip (very close)
     
-    # Test sustained compression
+    # Test sustained compression on a virtual clock
     analyzer.reset()
+    frame_time = analyzer.session_start_time
     for i in range(35):  # Sustain for >3 seconds
-        metrics = analyzer.analyze(compressed_landmarks, is_speaking=False)
-        time.sleep(0.1)
+        metrics = analyzer.analyze_array(compressed_landmarks, is_speaking=False, timestamp=frame_time)
+        frame_time += 0.1
     
     print(f"   Lip distance: {metrics.lip_distance:.4f}, Pursing: {metrics.lip_pursing}, Duration: {metrics.lip_purse_duration:.1f}s")
     
@@ -124,11 +117,8 @@ def test_vision_engine_integration():
     
     engine = VisionEngine()
     
-    # Test with mock frame
-    test_frame = np.zeros((480, 640, 3), dtype=np.uint8)
-    
     # Test stress analysis integration
-    result = engine.analyze_frame(test_frame, is_speaking=False)
+    result = engine.analyze_frame(TEST_FRAME, is_speaking=False)
     
     print("VisionEngine stress integration:")
     print(f"   Mode: {result.get('mode', 'unknown')}")
@@ -157,22 +147,15 @@ def test_frontend_compatibility():
     """Test that frontend can handle new stress metrics"""
     print("=== Frontend Compatibility Test ===\n")
     
-    # Check if HTML file has stress metrics sections
+    # Check if HTML file has stress metrics sections: one regex pass over the
+    # memory-mapped bytes finds every marker without decoding the file
     try:
-        with open('frontend/simple_test.html', 'r', encoding='utf-8') as f:
-            html_content = f.read()
+        with open('frontend/simple_test.html', 'rb') as f, \
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as html_bytes:
+            found = {match.group().decode() for match in STRESS_UI_PATTERN.finditer(html_bytes)}
         
-        stress_elements = [
-            'blink-rate',
-            'stress-level', 
-            'lip-pursing',
-            'cognitive-load',
-            'analyzeStress',
-            'updateStressUI'
-        ]
-        
-        for element in stress_elements:
-            if element in html_content:
+        for element in STRESS_UI_ELEMENTS:
+            if element in found:
                 print(f"   ✅ {element} found in frontend")
             else:
                 print(f"   ❌ {element} missing from frontend")
@@ -184,6 +167,9 @@ def test_frontend_compatibility():
     except FileNotFoundError:
         print("   ❌ Frontend file not found")
         return False
+    except ValueError:  # mmap refuses empty files
+        print("   ❌ Frontend file is empty")
+        return False
 
 
 def test_performance():
@@ -192,18 +178,13 @@ def test_performance():
     
     analyzer = StressAnalyzer()
     
-    # Create mock landmarks
-    class MockLandmark:
-        def __init__(self, x, y):
-            self.x = x
-            self.y = y
-    
-    landmarks = [MockLandmark(0.5, 0.5) for _ in range(468)]
+    # Face coordinates built once and reused for every frame
+    coords = np.full((468, 2), 0.5, dtype=np.float32)
     
     # Test processing time
     start_time = time.time()
     for i in range(100):  # 100 frames
-        metrics = analyzer.analyze(landmarks)
+        metrics = analyzer.analyze_array(coords)
     
     total_time = time.time() - start_time
     avg_time_ms = (total_time / 100) * 1000
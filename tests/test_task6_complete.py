@@ -2,11 +2,68 @@
 Comprehensive test for Task 6 completion - Anti-Cheating Integrity Checker
 """
 
-import time
+import atexit
 import numpy as np
+from functools import lru_cache
 from engine.vision_engine import VisionEngine
 from engine.analyzers.integrity_checker import IntegrityChecker
 
+# Blank camera frame, allocated once and read-only (analyze_frame never writes to its input)
+TEST_FRAME = np.zeros((480, 640, 3), dtype=np.uint8)
+TEST_FRAME.setflags(write=False)
+
+
+@lru_cache(maxsize=1)
+def _shared_engine() -> VisionEngine:
+    """
+    Build the VisionEngine once per run; loading its MediaPipe models is
+    the slowest step in this file. Released when the interpreter exits.
+    """
+    engine = VisionEngine()
+    atexit.register(engine.release)
+    return engine
+
+
+class MockLandmark:
+    """Stand-in for a MediaPipe landmark object (x, y only)."""
+    __slots__ = ('x', 'y')
+    
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+
+
+# Every face landmark at (0.5, 0.5); copied per frame, never written to
+_DEFAULT_LM = np.full((468, 2), 0.5)
+_DEFAULT_LM.setflags(write=False)
+
+# Eye-corner rows, in the order create_gaze fills them
+GAZE_CORNERS = [133, 33, 362, 263]
+
+
+def make_landmarks(eye_pts):
+    """
+    Build a (468, 2) face landmark array with every point at (0.5, 0.5)
+    except the rows given in eye_pts ({index: (x, y)}).
+    """
+    landmarks = _DEFAULT_LM.copy()
+    landmarks[list(eye_pts)] = list(eye_pts.values())
+    return landmarks
+
+
+def create_gaze(x, y):
+    """Face landmarks with both eyes' corners centered around (x, y)."""
+    landmarks = _DEFAULT_LM.copy()
+    # Left eye inner/outer, right eye inner/outer
+    landmarks[GAZE_CORNERS] = [(x - 0.05, y), (x - 0.1, y), (x + 0.05, y), (x + 0.1, y)]
+    return landmarks
+
+
+def assert_gaze_normalized(gazes):
+    """Check every (gaze_x, gaze_y) row lies in [0, 1], in one comparison per bound."""
+    np.testing.assert_array_less(-1e-6, gazes, err_msg="Gaze should be normalized")
+    np.testing.assert_array_less(gazes, 1.0 + 1e-6, err_msg="Gaze should be normalized")
+
 
 def test_task6_requirements():
     """Test all Task 6 requirements from the specification"""
@@ -14,40 +71,43 @@ def test_task6_requirements():
     
     # Requirement 5.1: Gaze position calculation
     print("✅ Testing Requirement 5.1: Gaze position estimation")
-    checker = IntegrityChecker()
-    
-    # Mock face landmarks
-    class MockLandmark:
-        def __init__(self, x, y):
-            self.x = x
-            self.y = y
-    
-    face_landmarks = [MockLandmark(0.5, 0.5) for _ in range(468)]
-    # Set eye landmarks
-    face_landmarks[133] = MockLandmark(0.45, 0.5)  # Left eye inner
-    face_landmarks[33] = MockLandmark(0.35, 0.5)   # Left eye outer
-    face_landmarks[362] = MockLandmark(0.55, 0.5)  # Right eye inner
-    face_landmarks[263] = MockLandmark(0.65, 0.5)  # Right eye outer
+    # Fake clock: frames advance it by hand instead of sleeping
+    now = [0.0]
+    checker = IntegrityChecker(clock=lambda: now[0])
+    
+    # Mock face landmarks with eye corners set
+    face_landmarks = make_landmarks({
+        133: (0.45, 0.5),  # Left eye inner
+        33: (0.35, 0.5),   # Left eye outer
+        362: (0.55, 0.5),  # Right eye inner
+        263: (0.65, 0.5),  # Right eye outer
+    })
     
     gaze_x, gaze_y = checker._calculate_gaze_position(face_landmarks)
     print(f"   Gaze position calculated: ({gaze_x:.3f}, {gaze_y:.3f})")
     assert 0.0 <= gaze_x <= 1.0 and 0.0 <= gaze_y <= 1.0, "Gaze should be normalized"
     
+    # MediaPipe landmark objects must give the same gaze as the array
+    mock_landmarks = [MockLandmark(x, y) for x, y in face_landmarks.tolist()]
+    assert checker._calculate_gaze_position(mock_landmarks) == (gaze_x, gaze_y), \
+        "Landmark objects and arrays should agree"
+    
     # Requirement 5.2: Repeated pattern detection
     print("✅ Testing Requirement 5.2: Repeated pattern detection at speech onset")
     
     checker.reset()
-    notes_location = [MockLandmark(0.5, 0.5) for _ in range(468)]
     # Set gaze to off-center (looking at notes)
-    notes_location[133] = MockLandmark(0.15, 0.3)
-    notes_location[33] = MockLandmark(0.05, 0.3)
-    notes_location[362] = MockLandmark(0.25, 0.3)
-    notes_location[263] = MockLandmark(0.35, 0.3)
+    notes_location = make_landmarks({
+        133: (0.15, 0.3),
+        33: (0.05, 0.3),
+        362: (0.25, 0.3),
+        263: (0.35, 0.3),
+    })
     
     # Simulate repeated pattern
     for i in range(6):
         metrics = checker.analyze(notes_location, speech_onset=True)
-        time.sleep(0.05)
+        now[0] += 0.05
     
     print(f"   Cheat flags after 6 repeated patterns: {metrics.cheat_flag_count}")
     assert metrics.cheat_flag_count > 0, "Should detect repeated patterns"
@@ -66,6 +126,14 @@ def test_task6_requirements():
     print(f"   Assessment: {report.integrity_assessment}")
     print(f"   Recommendations: {len(report.recommendations)} items")
     
+    # No frames since the last report: the cached one is reused, but each
+    # caller gets its own copy
+    report.recommendations.clear()
+    report.gaze_clusters[0]['visits'] = -1
+    again = checker.get_session_report()
+    assert len(again.recommendations) > 0, "Cached report must not share lists with callers"
+    assert again.gaze_clusters[0]['visits'] > 0, "Cached report must not share clusters with callers"
+    
     print("\n✅ All Task 6 requirements tested successfully!\n")
 
 
@@ -73,13 +141,10 @@ def test_vision_engine_integration():
     """Test VisionEngine integration with IntegrityChecker"""
     print("=== VisionEngine Integration Test ===\n")
     
-    engine = VisionEngine()
-    
-    # Test with mock frame
-    test_frame = np.zeros((480, 640, 3), dtype=np.uint8)
+    engine = _shared_engine()
     
     # Test integrity analysis integration
-    result = engine.analyze_frame(test_frame, is_speaking=False, speech_onset=False)
+    result = engine.analyze_frame(TEST_FRAME, is_speaking=False, speech_onset=False)
     
     print("VisionEngine integrity integration:")
     print(f"   Mode: {result.get('mode', 'unknown')}")
@@ -100,66 +165,62 @@ def test_vision_engine_integration():
         print(f"   Total speech onsets: {integrity_summary.get('total_speech_onsets', 0)}")
         print(f"   Assessment: {integrity_summary.get('integrity_assessment', 'unknown')}")
     
-    engine.release()
     print("\n✅ VisionEngine integration test passed!\n")
 
 
+def _run_scenario(checker, frames, speech_onsets, expected_assessment):
+    """
+    Run a scenario's frames through one analyze_batch call, 50ms apart,
+    print the session report and check its assessment.
+    """
+    timestamps = checker.session_start_time + 0.05 * np.arange(1, len(frames) + 1)
+    metrics = checker.analyze_batch(frames, speech_onsets, timestamps)
+    # Check what the batch recorded, not a fresh gaze computation
+    recorded = checker.recent_gazes()[-len(frames):]
+    assert_gaze_normalized(recorded[:, :2])
+    np.testing.assert_array_equal(recorded[:, 2], timestamps)
+    np.testing.assert_array_equal(recorded[:, 3], speech_onsets)
+    # Generate final report
+    report = checker.get_session_report()
+    
+    lines = [
+        f"After {int(speech_onsets.sum())} speech onsets: {metrics}",
+        "",
+        "📊 Final Report:",
+        f"   Integrity Score: {report.integrity_score:.2f}",
+        f"   Assessment: {report.integrity_assessment.upper()}",
+        f"   Cheat Flags: {report.cheat_flag_count}",
+        f"   Speech Onsets: {report.total_speech_onsets}",
+        f"   Gaze Clusters: {len(report.gaze_clusters)}",
+        "",
+        "📝 Recommendations:",
+    ]
+    lines.extend(f"   • {rec}" for rec in report.recommendations)
+    print("\n".join(lines) + "\n")
+    assert report.integrity_assessment == expected_assessment, \
+        f"Expected {expected_assessment}, got {report.integrity_assessment}"
+    return report
+
+
 def test_cheating_scenario():
     """Test realistic cheating scenario"""
     print("=== Realistic Cheating Scenario Test ===\n")
     
     checker = IntegrityChecker(cheat_flag_threshold=5, min_cluster_frequency=3)
     
-    class MockLandmark:
-        def __init__(self, x, y):
-            self.x = x
-            self.y = y
-    
     # Create two gaze positions: camera (center) and notes (off-center)
-    def create_gaze(x, y):
-        landmarks = [MockLandmark(0.5, 0.5) for _ in range(468)]
-        landmarks[133] = MockLandmark(x - 0.05, y)
-        landmarks[33] = MockLandmark(x - 0.1, y)
-        landmarks[362] = MockLandmark(x + 0.05, y)
-        landmarks[263] = MockLandmark(x + 0.1, y)
-        return landmarks
-    
     camera_gaze = create_gaze(0.5, 0.5)  # Looking at camera
     notes_gaze = create_gaze(0.2, 0.3)   # Looking at notes (left-down)
     
     print("Simulating interview with note-reading behavior...")
     print("Pattern: Look at notes before speaking, then at camera\n")
     
-    speech_count = 0
-    for i in range(20):
-        # Every 4 frames, simulate speech onset
-        if i % 4 == 0:
-            speech_count += 1
-            # Look at notes at speech onset (suspicious)
-            metrics = checker.analyze(notes_gaze, speech_onset=True)
-            print(f"Speech {speech_count}: Looking at notes - Flags: {metrics.cheat_flag_count}, "
-                  f"Score: {metrics.integrity_score:.2f}, Warning: {metrics.integrity_warning}")
-        else:
-            # Look at camera during speech
-            metrics = checker.analyze(camera_gaze, speech_onset=False)
-        
-        time.sleep(0.05)
-    
-    # Generate final report
-    report = checker.get_session_report()
-    
-    print(f"\n📊 Final Report:")
-    print(f"   Integrity Score: {report.integrity_score:.2f}")
-    print(f"   Assessment: {report.integrity_assessment.upper()}")
-    print(f"   Cheat Flags: {report.cheat_flag_count}")
-    print(f"   Speech Onsets: {report.total_speech_onsets}")
-    print(f"   Gaze Clusters: {len(report.gaze_clusters)}")
-    
-    print(f"\n📝 Recommendations:")
-    for rec in report.recommendations:
-        print(f"   • {rec}")
+    # Every 4 frames, simulate speech onset: look at notes (suspicious),
+    # then at the camera while speaking
+    speech_onsets = np.arange(20) % 4 == 0
+    frames = np.where(speech_onsets[:, None, None], notes_gaze, camera_gaze)
     
-    print()
+    _run_scenario(checker, frames, speech_onsets, "highly_suspicious")
 
 
 def test_clean_interview():
@@ -168,41 +229,59 @@ def test_clean_interview():
     
     checker = IntegrityChecker()
     
-    class MockLandmark:
-        def __init__(self, x, y):
-            self.x = x
-            self.y = y
-    
-    def create_gaze(x, y):
-        landmarks = [MockLandmark(0.5, 0.5) for _ in range(468)]
-        landmarks[133] = MockLandmark(x - 0.05, y)
-        landmarks[33] = MockLandmark(x - 0.1, y)
-        landmarks[362] = MockLandmark(x + 0.05, y)
-        landmarks[263] = MockLandmark(x + 0.1, y)
-        return landmarks
-    
     print("Simulating clean interview with natural gaze variation...\n")
     
-    import random
-    for i in range(15):
-        # Natural gaze variation around center
-        gaze_x = 0.5 + random.uniform(-0.08, 0.08)
-        gaze_y = 0.5 + random.uniform(-0.08, 0.08)
-        
-        gaze = create_gaze(gaze_x, gaze_y)
-        metrics = checker.analyze(gaze, speech_onset=(i % 3 == 0))
+    # Natural gaze variation around center, drawn in one seeded call
+    rng = np.random.default_rng(42)
+    gazes = 0.5 + rng.uniform(-0.08, 0.08, size=(15, 2))
+    
+    frames = []
+    for i, (gaze_x, gaze_y) in enumerate(gazes.tolist()):
+        frames.append(create_gaze(gaze_x, gaze_y))
         
         if i % 3 == 0:
-            print(f"Speech {i//3 + 1}: Gaze ({gaze_x:.2f}, {gaze_y:.2f}) - Score: {metrics.integrity_score:.2f}")
-    
-    report = checker.get_session_report()
-    
-    print(f"\n📊 Final Report:")
-    print(f"   Integrity Score: {report.integrity_score:.2f}")
-    print(f"   Assessment: {report.integrity_assessment.upper()}")
-    print(f"   Cheat Flags: {report.cheat_flag_count}")
-    
+            print(f"Speech {i//3 + 1}: Gaze ({gaze_x:.2f}, {gaze_y:.2f})")
     print()
+    
+    speech_onsets = np.arange(15) % 3 == 0
+    _run_scenario(checker, np.stack(frames), speech_onsets, "clean")
+
+
+def test_batch_matches_sequential():
+    """analyze_batch should leave the checker exactly where analyze() would"""
+    print("=== Batch vs Sequential Test ===\n")
+    
+    rng = np.random.default_rng(6)
+    centers = rng.choice([0.2, 0.5, 0.8], size=(40, 2))
+    frames = np.stack([create_gaze(x, y) for x, y in centers + rng.uniform(-0.02, 0.02, centers.shape)])
+    speech_onsets = rng.random(40) < 0.4
+    timestamps = 1000.0 + 0.05 * np.arange(40)
+    
+    sequential = IntegrityChecker(min_cluster_frequency=2)
+    for landmarks, onset, t in zip(frames, speech_onsets, timestamps.tolist()):
+        expected = sequential.analyze(landmarks, speech_onset=bool(onset), timestamp=t)
+    
+    batched = IntegrityChecker(min_cluster_frequency=2)
+    actual = batched.analyze_batch(frames, speech_onsets, timestamps)
+    
+    assert (actual.gaze_x, actual.gaze_y) == (expected.gaze_x, expected.gaze_y)
+    assert actual.gaze_cluster_id == expected.gaze_cluster_id
+    assert actual.cheat_flag_count == expected.cheat_flag_count
+    assert actual.integrity_score == expected.integrity_score
+    assert actual.integrity_warning == expected.integrity_warning
+    assert actual.timestamp == expected.timestamp
+    assert actual.suspicious_segments == expected.suspicious_segments
+    assert batched.gaze_clusters and len(batched.gaze_clusters) == len(sequential.gaze_clusters)
+    assert batched.gaze_clusters == sequential.gaze_clusters
+    assert batched.cluster_frequencies == sequential.cluster_frequencies
+    assert batched.suspicious_segments == sequential.suspicious_segments
+    assert batched.speech_onset_gazes == sequential.speech_onset_gazes
+    assert batched.gaze_history == sequential.gaze_history
+    assert batched.frame_count == sequential.frame_count == 40
+    print(f"✅ {int(speech_onsets.sum())} speech onsets, {len(batched.gaze_clusters)} clusters, "
+          f"{batched.cheat_flag_count} flags - identical state")
+    
+    print("\n✅ Batch vs sequential test passed!\n")
 
 
 if __name__ == "__main__":
@@ -214,22 +293,24 @@ if __name__ == "__main__":
         test_vision_engine_integration()
         test_cheating_scenario()
         test_clean_interview()
+        test_batch_matches_sequential()
         
-        print("=" * 70)
-        print("🎉 TASK 6 IMPLEMENTATION COMPLETE!")
-        print("\nImplemented features:")
-        print("✅ Gaze position estimation using eye landmarks")
-        print("✅ Speech onset gaze tracking")
-        print("✅ Repeated pattern detection with clustering")
-        print("✅ Cheat flag counter and integrity warnings")
-        print("✅ Integrity scoring (0.0-1.0)")
-        print("✅ Suspicious segment tracking")
-        print("✅ Comprehensive session reports")
-        print("✅ VisionEngine integration")
-        print("✅ Gaze cluster analysis")
-        print("✅ Automated recommendations")
-        
-        print("\n🚀 Ready for Task 7: VisionEngine Refactoring!")
+        print("\n".join([
+            "=" * 70,
+            "🎉 TASK 6 IMPLEMENTATION COMPLETE!",
+            "\nImplemented features:",
+            "✅ Gaze position estimation using eye landmarks",
+            "✅ Speech onset gaze tracking",
+            "✅ Repeated pattern detection with clustering",
+            "✅ Cheat flag counter and integrity warnings",
+            "✅ Integrity scoring (0.0-1.0)",
+            "✅ Suspicious segment tracking",
+            "✅ Comprehensive session reports",
+            "✅ VisionEngine integration",
+            "✅ Gaze cluster analysis",
+            "✅ Automated recommendations",
+            "\n🚀 Ready for Task 7: VisionEngine Refactoring!",
+        ]))
             
     except Exception as e:
         print(f"\n💥 Test failed: {e}")